@@ -0,0 +1,154 @@
+"""
+Compares grouped SUM over DOUBLE PRECISION amounts against exact NUMERIC(14, 2)
+amounts and BIGINT cents: query time and the drift of each total from the exact sum
+in cents. Each is timed over the raw rows and over a daily rollup of them, which is
+what get_grouped_expenses reads.
+
+Usage:
+    python benchmarks/bench_amount_aggregation.py --rows 1000 100000 1000000
+    python benchmarks/bench_amount_aggregation.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, Column, Date, Float, Integer, MetaData, Numeric, String, Table
+from sqlalchemy import create_engine, func, insert, select
+
+PAYERS = ["Alice", "Bob", "Carol", "Dave"]
+# One expense a minute, so 1M rows span about two years of daily rollups.
+ROWS_PER_DAY = 1440
+FIRST_DAY = date(2025, 1, 1)
+
+metadata = MetaData()
+
+
+def amounts_table(name: str, amount_type, total_type) -> tuple:
+    """Returns an expenses-like table and its daily rollup, with the given amount types."""
+    rows = Table(
+        f"bench_{name}_amounts",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("payer", String, nullable=False),
+        Column("day", Date, nullable=False),
+        Column("amount", amount_type, nullable=False),
+    )
+    rollup = Table(
+        f"bench_{name}_rollups",
+        metadata,
+        Column("payer", String, primary_key=True),
+        Column("day", Date, primary_key=True),
+        Column("total", total_type, nullable=False),
+    )
+    return rows, rollup
+
+
+# (name, tables, amount of a row given its cents, total in cents given a sum)
+VARIANTS = [
+    ("float", amounts_table("float", Float, Float), lambda c: c / 100, lambda t: t * 100),
+    (
+        "numeric",
+        amounts_table("numeric", Numeric(14, 2), Numeric(18, 2)),
+        lambda c: Decimal(c) / 100,
+        lambda t: t * 100,
+    ),
+    ("cents", amounts_table("cents", BigInteger, BigInteger), lambda c: c, lambda t: t),
+]
+
+
+def seed(engine, rows: int) -> dict:
+    """Seeds every variant with the same amounts and returns the exact totals in cents."""
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    rng = random.Random(0)
+    cents = {payer: 0 for payer in PAYERS}
+    with engine.begin() as conn:
+        batch = []
+        for i in range(rows):
+            payer = rng.choice(PAYERS)
+            amount = rng.randrange(1, 100000)
+            cents[payer] += amount
+            day = FIRST_DAY + timedelta(days=i // ROWS_PER_DAY)
+            batch.append({"id": i, "payer": payer, "day": day, "cents": amount})
+            if len(batch) == 10000 or i == rows - 1:
+                for _, (table, _), to_amount, _ in VARIANTS:
+                    conn.execute(
+                        insert(table),
+                        [
+                            {
+                                "id": r["id"],
+                                "payer": r["payer"],
+                                "day": r["day"],
+                                "amount": to_amount(r["cents"]),
+                            }
+                            for r in batch
+                        ],
+                    )
+                batch = []
+        for _, (table, rollup), _, _ in VARIANTS:
+            conn.execute(
+                insert(rollup).from_select(
+                    ["payer", "day", "total"],
+                    select(table.c.payer, table.c.day, func.sum(table.c.amount)).group_by(
+                        table.c.payer, table.c.day
+                    ),
+                )
+            )
+    return cents
+
+
+def grouped_sum(engine, table, column: str) -> dict:
+    with engine.connect() as conn:
+        stmt = select(table.c.payer, func.sum(table.c[column])).group_by(table.c.payer)
+        return dict(conn.execute(stmt).all())
+
+
+def timed(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def drift(totals: dict, cents: dict, to_cents) -> float:
+    """The largest absolute difference, in cents, between a total and the exact sum."""
+    return float(max(abs(Decimal(str(to_cents(totals[payer]))) - cents[payer]) for payer in cents))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+
+        print(
+            f"{'rows':>10} {'variant':>8} {'rows (ms)':>10} {'rollup (ms)':>12} "
+            f"{'drift (cents)':>14}"
+        )
+        for rows in args.rows:
+            cents = seed(engine, rows)
+            for name, (table, rollup), _, to_cents in VARIANTS:
+                rows_time, totals = timed(lambda: grouped_sum(engine, table, "amount"), args.repeat)
+                rollup_time, _ = timed(lambda: grouped_sum(engine, rollup, "total"), args.repeat)
+                print(
+                    f"{rows:>10} {name:>8} {rows_time * 1000:>10.1f} "
+                    f"{rollup_time * 1000:>12.2f} {drift(totals, cents, to_cents):>14.2E}"
+                )
+        metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
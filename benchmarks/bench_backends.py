@@ -0,0 +1,103 @@
+"""
+Compares the per-call latency of every tool on an embedded SQLite database against
+PostgreSQL, each seeded with the same expenses.
+
+Usage:
+    python benchmarks/bench_backends.py --database-url postgresql://... --calls 500
+    python benchmarks/bench_backends.py --calls 500  # SQLite only
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from expense_log_mcp import database
+from expense_log_mcp.tools import (
+    add_expense,
+    delete_expense,
+    get_expense,
+    get_grouped_expenses,
+    list_expenses,
+)
+from seed import category_id, ledger_id, message_id, seed
+
+
+def calls(expenses: int):
+    """Returns (name, call) pairs, where `call(i)` runs the i-th call of a tool."""
+    ledger = ledger_id(0)
+    return [
+        (
+            "add_expense",
+            lambda i: add_expense(ledger, category_id(i % 5), f"bench-{i}", "Bench", 1.5, "Alice"),
+        ),
+        (
+            "add_expense (duplicate)",
+            lambda i: add_expense(ledger, category_id(0), message_id(0, i % expenses), "", 1, ""),
+        ),
+        ("get_expense", lambda i: get_expense(ledger, message_id(0, i % expenses))),
+        ("list_expenses", lambda i: list_expenses(ledger, page_size=20)),
+        ("get_grouped_expenses", lambda i: get_grouped_expenses(ledger)),
+        (
+            "get_grouped_expenses (range)",
+            lambda i: get_grouped_expenses(
+                ledger, start_date="2025-03-01T12:00:00", end_date="2025-03-31"
+            ),
+        ),
+        ("delete_expense", lambda i: delete_expense(ledger, f"bench-{i}")),
+    ]
+
+
+def measure(call, count: int) -> tuple:
+    """Returns the median and 95th percentile seconds of `count` calls."""
+    durations = []
+    for i in range(count):
+        start = time.perf_counter()
+        call(i)
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return statistics.median(durations), durations[int(len(durations) * 0.95)]
+
+
+def run(url: str, expenses: int, count: int) -> dict:
+    """Seeds the database at `url` and returns the latencies of every tool on it."""
+    engine = create_engine(url)
+    seed(engine, ledgers=1, expenses=expenses)
+    engine.dispose()
+    os.environ["DATABASE_URL"] = url
+    database.engine = None
+    # Grouped results would otherwise come from the cache after the first call.
+    os.environ["GROUPED_EXPENSES_CACHE_SIZE"] = "0"
+    results = {name: measure(call, count) for name, call in calls(expenses)}
+    database.engine.dispose()
+    if database.reader_engine is not None:
+        database.reader_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--expenses", type=int, default=10000)
+    parser.add_argument("--database-url", default=None, help="PostgreSQL to compare with")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {"sqlite": f"sqlite:///{os.path.join(tmp, 'bench.db')}"}
+        if args.database_url:
+            backends["postgresql"] = args.database_url
+        results = {name: run(url, args.expenses, args.calls) for name, url in backends.items()}
+
+    print(f"{'tool':<30} " + " ".join(f"{name + ' p50/p95 (us)':>26}" for name in results))
+    for tool, _ in calls(args.expenses):
+        cells = [
+            f"{p50 * 1e6:.0f} / {p95 * 1e6:.0f}" for p50, p95 in (r[tool] for r in results.values())
+        ]
+        print(f"{tool:<30} " + " ".join(f"{cell:>26}" for cell in cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares looking up N expenses with one get_expense call each against a single
+get_expenses call, and against the latency of one single lookup.
+
+Usage:
+    python benchmarks/bench_batch_lookup.py --ids 10 100 1000 5000
+    python benchmarks/bench_batch_lookup.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from expense_log_mcp import database
+from expense_log_mcp.tools import get_expense, get_expenses
+from seed import ledger_id, message_id, seed
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ids", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--expenses", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        seed(engine, ledgers=1, expenses=args.expenses)
+        engine.dispose()
+        os.environ["DATABASE_URL"] = url
+
+        ledger = ledger_id(0)
+        single = timed(lambda: get_expense(ledger, message_id(0, 0)), args.repeat * 10)
+        print(f"one get_expense call: {single * 1e3:.2f} ms")
+        print(f"{'ids':>6} {'get_expense x N (ms)':>21} {'get_expenses (ms)':>18}")
+        for count in args.ids:
+            # Every 7th ID is missing, to exercise the notFound list.
+            ids = [
+                message_id(0, i * (args.expenses // count)) if i % 7 else f"missing-{i}"
+                for i in range(count)
+            ]
+            one_by_one = timed(lambda: [get_expense(ledger, i) for i in ids], 1)
+            batch = timed(lambda: get_expenses(ledger, ids), args.repeat)
+            print(f"{count:>6} {one_by_one * 1e3:>21.2f} {batch * 1e3:>18.2f}")
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Compares the SQL GROUP BY implementation of get_grouped_expenses against the
+previous ORM path that loaded every expense and summed amounts in Python.
+
+Usage:
+    python benchmarks/bench_get_grouped_expenses.py --rows 1000 100000 1000000
+    python benchmarks/bench_get_grouped_expenses.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import Session
+
+from expense_log_mcp import database
+from expense_log_mcp.models import Base, Expense, ExpenseCategory, Ledger
+from expense_log_mcp.tools import get_grouped_expenses
+
+LEDGER_ID = "bench-ledger"
+PAYERS = ["Alice", "Bob", "Carol", "Dave"]
+CATEGORIES = ["Dining", "Groceries", "Transportation", "Utilities", "Entertainment"]
+
+
+def seed(engine, rows: int) -> None:
+    Base.metadata.create_all(engine)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rng = random.Random(0)
+    with Session(engine) as session, session.begin():
+        session.execute(delete(Expense))
+        session.execute(delete(ExpenseCategory))
+        session.execute(delete(Ledger))
+        session.execute(
+            insert(Ledger), [{"id": LEDGER_ID, "name": "Benchmark", "createdAt": start}]
+        )
+        session.execute(
+            insert(ExpenseCategory),
+            [{"id": f"category-{i}", "name": name} for i, name in enumerate(CATEGORIES)],
+        )
+        batch = []
+        for i in range(rows):
+            batch.append(
+                {
+                    "id": f"expense-{i}",
+                    "ledgerId": LEDGER_ID,
+                    "categoryId": f"category-{rng.randrange(len(CATEGORIES))}",
+                    "messageId": f"message-{i}",
+                    "description": "Benchmark expense",
+                    "amount": rng.randrange(100, 100000) / 100,
+                    "payer": rng.choice(PAYERS),
+                    "createdAt": start + timedelta(minutes=i),
+                }
+            )
+            if len(batch) == 10000:
+                session.execute(insert(Expense), batch)
+                batch = []
+        if batch:
+            session.execute(insert(Expense), batch)
+
+
+def legacy_get_grouped_expenses(ledger_id: str) -> dict:
+    """The previous implementation: hydrate every row, lazy-load each category."""
+    grouped_expenses = defaultdict(
+        lambda: {"expense_categories": defaultdict(float), "total_amount": 0.0}
+    )
+    with database.session_scope() as db:
+        expenses = db.query(Expense).filter(Expense.ledgerId == ledger_id).order_by(Expense.payer)
+        for expense in expenses.all():
+            # Amounts were floats then; they are Decimals now.
+            amount = float(expense.amount)
+            grouped_expenses[expense.payer]["expense_categories"][expense.category.name] += amount
+            grouped_expenses[expense.payer]["total_amount"] += amount
+    return grouped_expenses
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DATABASE_URL"] = url
+        engine = create_engine(url)
+
+        print(f"{'rows':>10} {'legacy (ms)':>12} {'group by (ms)':>14} {'speedup':>8}")
+        for rows in args.rows:
+            seed(engine, rows)
+            database.engine = None
+            legacy = timed(lambda: legacy_get_grouped_expenses(LEDGER_ID), args.repeat)
+            grouped = timed(lambda: get_grouped_expenses(LEDGER_ID), args.repeat)
+            print(
+                f"{rows:>10} {legacy * 1000:>12.1f} {grouped * 1000:>14.1f} "
+                f"{legacy / grouped:>7.1f}x"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
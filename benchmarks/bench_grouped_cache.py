@@ -0,0 +1,73 @@
+"""
+Compares repeated get_grouped_expenses calls with the result cache disabled against
+cache hits, which only look up the ledger version, and against calls that follow a
+write and miss.
+
+Usage:
+    python benchmarks/bench_grouped_cache.py --expenses 10000 100000
+    python benchmarks/bench_grouped_cache.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from expense_log_mcp import database
+from expense_log_mcp.tools import add_expense, delete_expense, get_grouped_expenses
+from expense_log_mcp.tools.get_grouped_expenses import invalidate_grouped_expenses_cache
+from seed import category_id, ledger_id, seed
+
+
+def call() -> None:
+    get_grouped_expenses(ledger_id(0), start_date="2025-01-01", end_date="2025-12-31T23:59:59")
+
+
+def write(i: int) -> None:
+    add_expense(ledger_id(0), category_id(0), f"bench-{i}", "Benchmark", 1.0, "Alice")
+    delete_expense(ledger_id(0), f"bench-{i}")
+
+
+def timed(fn, repeat: int, cache_size: int, writes: bool = False) -> float:
+    """Returns the mean time of a call, excluding the writes made between calls."""
+    os.environ["GROUPED_EXPENSES_CACHE_SIZE"] = str(cache_size)
+    call()
+    total = 0.0
+    for i in range(repeat):
+        if writes:
+            write(i)
+        start = time.perf_counter()
+        fn()
+        total += time.perf_counter() - start
+    return total / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--expenses", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DATABASE_URL"] = url
+        print(f"{'expenses':>9} {'uncached (ms)':>14} {'hit (ms)':>9} {'after write (ms)':>17}")
+        for expenses in args.expenses:
+            engine = create_engine(url)
+            seed(engine, ledgers=1, expenses=expenses)
+            engine.dispose()
+            # Seeding starts the ledger over at version 0, outside the write tools.
+            invalidate_grouped_expenses_cache()
+            uncached = timed(call, args.repeat, 0)
+            hit = timed(call, args.repeat, 1024)
+            miss = timed(call, args.repeat, 1024, writes=True)
+            print(f"{expenses:>9} {uncached * 1e3:>14.2f} {hit * 1e3:>9.2f} {miss * 1e3:>17.2f}")
+        if database.engine is not None:
+            database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compares drawing a trend line with one get_grouped_expenses call per month or week
+against a single call with `bucket`.
+
+Usage:
+    python benchmarks/bench_grouped_series.py --expenses 10000 100000
+    python benchmarks/bench_grouped_series.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine
+
+from expense_log_mcp import database
+from expense_log_mcp.tools import get_grouped_expenses
+from seed import ledger_id, seed
+
+YEAR = 2025
+
+
+def ranges(bucket: str) -> list:
+    """Returns the local (start, end) datetimes of every month or week of the year."""
+    if bucket == "month":
+        starts = [date(YEAR, month, 1) for month in range(1, 13)] + [date(YEAR + 1, 1, 1)]
+    else:
+        first = date(YEAR, 1, 1) - timedelta(days=date(YEAR, 1, 1).weekday())
+        starts = [first + timedelta(weeks=week) for week in range(54)]
+    return [
+        (datetime.combine(start, datetime.min.time()), datetime.combine(end, datetime.min.time()))
+        for start, end in zip(starts, starts[1:])
+    ]
+
+
+def per_bucket_calls(bucket: str) -> None:
+    for start, end in ranges(bucket):
+        get_grouped_expenses(
+            ledger_id(0),
+            start_date=start.isoformat(),
+            end_date=(end - timedelta(microseconds=1)).isoformat(),
+        )
+
+
+def one_bucketed_call(bucket: str) -> None:
+    get_grouped_expenses(
+        ledger_id(0),
+        start_date=f"{YEAR}-01-01",
+        end_date=f"{YEAR}-12-31T23:59:59.999999",
+        bucket=bucket,
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--expenses", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DATABASE_URL"] = url
+        print(f"{'expenses':>9} {'bucket':>6} {'per-bucket calls (ms)':>22} {'one call (ms)':>14}")
+        for expenses in args.expenses:
+            engine = create_engine(url)
+            seed(engine, ledgers=1, expenses=expenses)
+            engine.dispose()
+            for bucket in ("month", "week"):
+                many = timed(lambda: per_bucket_calls(bucket), args.repeat)
+                one = timed(lambda: one_bucketed_call(bucket), args.repeat)
+                print(f"{expenses:>9} {bucket:>6} {many * 1e3:>22.1f} {one * 1e3:>14.1f}")
+        if database.engine is not None:
+            database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
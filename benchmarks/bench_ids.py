@@ -0,0 +1,99 @@
+"""
+Compares the ID strategies: the cost of generating an ID, and the insert throughput and
+primary key index size of a table keyed by each.
+
+Usage:
+    python benchmarks/bench_ids.py --rows 1000000
+    python benchmarks/bench_ids.py --rows 10000000 --database-url postgresql://...
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import Column, MetaData, String, Table, create_engine, insert, text
+
+from expense_log_mcp import ids
+
+BATCH_SIZE = 10000
+
+# Shaped like `expenses`: a string primary key and a unique message ID per row.
+metadata = MetaData()
+id_benchmark = Table(
+    "id_benchmark",
+    metadata,
+    Column("id", String, primary_key=True),
+    Column("message_id", String, nullable=False),
+)
+GENERATORS = {**ids.ID_STRATEGIES, "uuid4 (reference)": lambda: str(uuid.uuid4())}
+
+
+def generation_cost(generate, count: int) -> float:
+    """Returns the mean seconds per generated ID."""
+    generate()
+    start = time.perf_counter()
+    for _ in range(count):
+        generate()
+    return (time.perf_counter() - start) / count
+
+
+def index_size(engine) -> int:
+    """Returns the size in bytes of the primary key index, or 0 if it cannot be measured."""
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            return conn.scalar(text("SELECT pg_relation_size('id_benchmark_pkey')"))
+        try:
+            return conn.scalar(
+                text(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = "
+                    "'sqlite_autoindex_id_benchmark_1'"
+                )
+            )
+        except Exception:
+            # SQLite builds without the dbstat virtual table.
+            return 0
+
+
+def insert_rows(engine, generate, rows: int) -> float:
+    """Inserts `rows` rows with IDs from `generate` and returns rows per second."""
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, rows, BATCH_SIZE):
+            batch = [
+                {"id": generate(), "message_id": f"message-{i}"}
+                for i in range(offset, min(offset + BATCH_SIZE, rows))
+            ]
+            conn.execute(insert(id_benchmark), batch)
+    return rows / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--generate", type=int, default=100000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    print(f"{'strategy':<18} {'generate (us)':>14}")
+    for name, generate in GENERATORS.items():
+        print(f"{name:<18} {generation_cost(generate, args.generate) * 1e6:>14.2f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        print(f"\n{args.rows} rows on {engine.dialect.name}")
+        print(f"{'strategy':<18} {'inserts/s':>10} {'pk index (MiB)':>15}")
+        for name, generate in GENERATORS.items():
+            rate = insert_rows(engine, generate, args.rows)
+            size = index_size(engine) or 0
+            print(f"{name:<18} {rate:>10.0f} {size / 2**20:>15.1f}")
+        metadata.drop_all(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
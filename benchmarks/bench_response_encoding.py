@@ -0,0 +1,93 @@
+"""
+Compares encoding tool responses the previous way, converting every amount and
+timestamp by hand before `json.dumps`, against the shared encoders of
+`expense_log_mcp.responses`.
+
+Usage:
+    python benchmarks/bench_response_encoding.py --rows 50 500 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from expense_log_mcp import responses
+
+START = datetime(2025, 1, 1)
+
+
+def make_expenses(rows: int) -> list:
+    rng = random.Random(0)
+    return [
+        {
+            "id": f"expense-{i}",
+            "messageId": f"message-{i}",
+            "categoryId": f"category-{i % 5}",
+            "categoryName": "Groceries",
+            "description": "Benchmark expense",
+            "amount": Decimal(rng.randrange(100, 100000)) / 100,
+            "payer": rng.choice(["Alice", "Bob", "Carol", "Dave"]),
+            "createdAt": START + timedelta(minutes=i, microseconds=i),
+        }
+        for i in range(rows)
+    ]
+
+
+def encode_previous(expenses: list) -> str:
+    data = [
+        {
+            **expense,
+            "amount": float(expense["amount"]),
+            "createdAt": expense["createdAt"].isoformat(),
+        }
+        for expense in expenses
+    ]
+    return json.dumps(
+        {
+            "success": True,
+            "code": "OK",
+            "message": "Expenses listed successfully.",
+            "data": {"expenses": data, "nextCursor": None},
+        }
+    )
+
+
+def encode_shared(expenses: list) -> str:
+    return responses.success(
+        "Expenses listed successfully.", {"expenses": expenses, "nextCursor": None}
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    encoders = sorted(responses.ENCODERS)
+    print(f"{'rows':>6} {'previous (us)':>14} " + " ".join(f"{e + ' (us)':>14}" for e in encoders))
+    for rows in args.rows:
+        expenses = make_expenses(rows)
+        results = [timed(lambda: encode_previous(expenses), args.repeat)]
+        for encoder in encoders:
+            os.environ["JSON_ENCODER"] = encoder
+            responses.reset_encoder()
+            assert json.loads(encode_shared(expenses)) == json.loads(encode_previous(expenses))
+            results.append(timed(lambda: encode_shared(expenses), args.repeat))
+        print(f"{rows:>6} " + " ".join(f"{result * 1e6:>14.1f}" for result in results))
+    responses.reset_encoder()
+
+
+if __name__ == "__main__":
+    main()
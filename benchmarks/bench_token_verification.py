@@ -0,0 +1,62 @@
+"""
+Measures BearerTokenVerifier.verify_token per request as the number of configured
+tokens grows, for cached hits, uncached hits and unknown tokens.
+
+Usage:
+    python benchmarks/bench_token_verification.py --tokens 1 100 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from expense_log_mcp.auth import BearerTokenVerifier
+
+
+def make_verifier(path: str, tokens: int, cache_ttl: float) -> BearerTokenVerifier:
+    with open(path, "w") as f:
+        json.dump(
+            {"tokens": [{"token": f"token-{i}", "client_id": f"agent-{i}"} for i in range(tokens)]},
+            f,
+        )
+    return BearerTokenVerifier(client_id="bench", tokens_file=path, cache_ttl=cache_ttl)
+
+
+async def per_call(verifier: BearerTokenVerifier, tokens: list, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        await verifier.verify_token(tokens[i % len(tokens)])
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tokens", type=int, nargs="+", default=[1, 100, 10000])
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--clients", type=int, default=100, help="distinct tokens presented")
+    args = parser.parse_args()
+
+    print(f"{'tokens':>8} {'cached (us)':>12} {'uncached (us)':>14} {'unknown (us)':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tokens.json")
+        for tokens in args.tokens:
+            presented = [f"token-{i * tokens // args.clients}" for i in range(args.clients)]
+            unknown = [f"unknown-{i}" for i in range(args.clients)]
+            cached = make_verifier(path, tokens, cache_ttl=60)
+            uncached = make_verifier(path, tokens, cache_ttl=0)
+            results = [
+                asyncio.run(per_call(cached, presented, args.calls)),
+                asyncio.run(per_call(uncached, presented, args.calls)),
+                asyncio.run(per_call(cached, unknown, args.calls)),
+            ]
+            print(
+                f"{tokens:>8} {results[0] * 1e6:>12.2f} {results[1] * 1e6:>14.2f} "
+                f"{results[2] * 1e6:>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Measures the Python-side overhead of the per-call tool queries: the time of each call
+minus the time spent executing SQL, with the cached statements and with every call
+building and compiling its statement from scratch.
+
+Usage:
+    python benchmarks/bench_tool_overhead.py --calls 2000
+    python benchmarks/bench_tool_overhead.py --database-url postgresql://...
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from expense_log_mcp import database
+from expense_log_mcp.tools import (
+    delete_expense,
+    get_expense,
+    get_grouped_expenses,
+    list_expenses,
+)
+from expense_log_mcp.tools.delete_expenses import _delete_statement
+from expense_log_mcp.tools.get_grouped_expenses import _grouped_statement
+from expense_log_mcp.tools.list_expenses import _list_statement
+from seed import CATEGORIES, category_id, ledger_id, message_id, seed
+
+STATEMENT_CACHES = (_delete_statement, _grouped_statement, _list_statement)
+
+
+def calls(expenses: int):
+    """Returns (name, call) pairs, where `call(i)` runs the i-th call of a tool."""
+    ledger = ledger_id(0)
+
+    def categories(i):
+        return [category_id(c) for c in range(i % len(CATEGORIES) + 1)]
+
+    return [
+        ("get_expense", lambda i: get_expense(ledger, message_id(0, i % expenses))),
+        ("delete_expense (missing)", lambda i: delete_expense(ledger, f"missing-{i}")),
+        ("get_grouped_expenses", lambda i: get_grouped_expenses(ledger, categories(i))),
+        (
+            "get_grouped_expenses (range)",
+            lambda i: get_grouped_expenses(
+                ledger, categories(i), start_date="2025-03-01T12:00:00", end_date="2025-03-31"
+            ),
+        ),
+        ("list_expenses", lambda i: list_expenses(ledger, categories(i), page_size=20)),
+    ]
+
+
+def use_engine(url: str, query_cache_size: int):
+    """Points the tools at a new engine and returns a dict accumulating SQL time."""
+    if database.engine is not None:
+        database.engine.dispose()
+    database.engine = create_engine(url, query_cache_size=query_cache_size)
+    database.SessionLocal = sessionmaker(autoflush=False, bind=database.engine)
+    sql = {"seconds": 0.0}
+
+    @event.listens_for(database.engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(database.engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        sql["seconds"] += time.perf_counter() - conn.info.pop("query_start")
+
+    return sql
+
+
+def measure(url: str, call, count: int, cached: bool):
+    """Returns the mean (total, SQL) seconds per call."""
+    sql = use_engine(url, query_cache_size=500 if cached else 0)
+    for i in range(min(count, 50)):
+        call(i)
+    sql["seconds"] = 0.0
+    start = time.perf_counter()
+    for i in range(count):
+        if not cached:
+            for cache in STATEMENT_CACHES:
+                cache.cache_clear()
+        call(i)
+    return (time.perf_counter() - start) / count, sql["seconds"] / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--expenses", type=int, default=5000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        seed(engine, ledgers=1, expenses=args.expenses)
+        engine.dispose()
+
+        print(f"{'tool':<30} {'':>8} {'call (us)':>10} {'sql (us)':>9} {'python (us)':>12}")
+        for name, call in calls(args.expenses):
+            for cached in (False, True):
+                total, sql = measure(url, call, args.calls, cached)
+                label = "cached" if cached else "rebuilt"
+                print(
+                    f"{name:<30} {label:>8} {total * 1e6:>10.1f} {sql * 1e6:>9.1f} "
+                    f"{(total - sql) * 1e6:>12.1f}"
+                )
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures add_expense throughput with concurrent callers, committing each call on its
+own and with the group-commit write pipeline.
+
+Usage:
+    python benchmarks/bench_write_pipeline.py --concurrency 1 8 32
+    python benchmarks/bench_write_pipeline.py --database-url postgresql://...
+"""
+
+import argparse
+import importlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+
+from expense_log_mcp import database
+from expense_log_mcp.tools import add_expense
+from seed import category_id, ledger_id, seed
+
+
+def run(calls: int, concurrency: int, pipelined: bool, run_id: str) -> tuple:
+    """Returns (calls per second, errors) for `calls` add_expense calls."""
+    os.environ["WRITE_PIPELINE_ENABLED"] = str(pipelined).lower()
+    importlib.import_module(add_expense.__module__)._pipeline = None
+
+    def call(i: int) -> bool:
+        result = add_expense(
+            ledger_id(0), category_id(i % 5), f"{run_id}-{i}", "Benchmark", 12.34, "Alice"
+        )
+        return json.loads(result)["code"] == "OK"
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        ok = sum(executor.map(call, range(calls)))
+    return calls / (time.perf_counter() - start), calls - ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        seed(engine, ledgers=1, expenses=0)
+        engine.dispose()
+        os.environ["DATABASE_URL"] = url
+        os.environ.setdefault("DATABASE_POOL_SIZE", str(max(args.concurrency)))
+
+        print(f"{'concurrency':>11} {'per-call (calls/s)':>19} {'pipelined (calls/s)':>20}")
+        for concurrency in args.concurrency:
+            results = [
+                run(args.calls, concurrency, pipelined, f"{concurrency}-{pipelined}")
+                for pipelined in (False, True)
+            ]
+            line = " ".join(
+                f"{rate:>{width}.0f}" + (f" ({errors} errors)" if errors else "")
+                for (rate, errors), width in zip(results, (19, 20))
+            )
+            print(f"{concurrency:>11} {line}")
+        database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
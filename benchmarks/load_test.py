@@ -0,0 +1,324 @@
+"""
+Load-tests every MCP tool, called directly and through the streamable-HTTP server, with
+N concurrent clients, and writes latency percentiles and throughput as JSON. The server
+runs in its own process with each given number of workers.
+
+Usage:
+    python benchmarks/load_test.py --ledgers 10 --expenses 10000 --calls 500 --concurrency 1 8 32
+    python benchmarks/load_test.py --database-url postgresql://... --output results.json
+    python benchmarks/load_test.py --modes http --workers 1 2 4 --concurrency 16
+    python benchmarks/load_test.py --compare baseline.json --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import sys
+import subprocess
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+from sqlalchemy import create_engine
+
+from seed import CATEGORIES, category_id, ledger_id, message_id, seed
+
+BEARER_TOKEN = "load-test-token"
+BATCH_SIZE = 10
+
+
+def scenarios(ledgers: int, expenses: int, prefix: str) -> list:
+    """
+    Returns (tool name, arguments for call i) pairs. Deletes remove what the adds before
+    them created, so a run leaves the seeded data unchanged.
+    """
+
+    def new_message(i):
+        return f"{prefix}-message-{i}"
+
+    def new_batch(i):
+        return [f"{prefix}-batch-{i}-{j}" for j in range(BATCH_SIZE)]
+
+    return [
+        (
+            "add_expense",
+            lambda i: {
+                "ledger_id": ledger_id(i % ledgers),
+                "category_id": category_id(i % len(CATEGORIES)),
+                "message_id": new_message(i),
+                "description": "Load test expense",
+                "amount": 12.34,
+                "payer": "Alice",
+            },
+        ),
+        (
+            "add_expenses",
+            lambda i: {
+                "ledger_id": ledger_id(i % ledgers),
+                "expenses": [
+                    {
+                        "category_id": category_id(j % len(CATEGORIES)),
+                        "message_id": message,
+                        "description": "Load test expense",
+                        "amount": 12.34,
+                        "payer": "Bob",
+                    }
+                    for j, message in enumerate(new_batch(i))
+                ],
+            },
+        ),
+        (
+            "get_expense",
+            lambda i: {
+                "ledger_id": ledger_id(i % ledgers),
+                "message_id": message_id(i % ledgers, i % expenses),
+            },
+        ),
+        ("get_expense_categories", lambda i: {}),
+        (
+            "get_grouped_expenses",
+            lambda i: {
+                "ledger_id": ledger_id(i % ledgers),
+                "start_date": f"2025-{i % 12 + 1:02d}-01T00:00:00",
+                "end_date": "2025-12-31T23:59:59",
+            },
+        ),
+        ("list_expenses", lambda i: {"ledger_id": ledger_id(i % ledgers), "page_size": 50}),
+        (
+            "delete_expense",
+            lambda i: {"ledger_id": ledger_id(i % ledgers), "message_id": new_message(i)},
+        ),
+        (
+            "delete_expenses",
+            lambda i: {"ledger_id": ledger_id(i % ledgers), "message_ids": new_batch(i)},
+        ),
+    ]
+
+
+def percentile(samples: list, q: float) -> float:
+    """Nearest-rank percentile of sorted `samples`."""
+    index = max(0, min(len(samples) - 1, round(q / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def summarize(
+    tool: str, mode: str, workers: int, concurrency: int, latencies: list, errors: int, elapsed
+):
+    latencies = sorted(latencies)
+    return {
+        "tool": tool,
+        "mode": mode,
+        "workers": workers,
+        "concurrency": concurrency,
+        "calls": len(latencies),
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "calls_per_second": len(latencies) / elapsed,
+    }
+
+
+def run_direct(tool: str, make_args, calls: int, concurrency: int) -> dict:
+    import expense_log_mcp.tools as tools
+
+    fn = getattr(tools, tool)
+
+    def call(i):
+        start = time.perf_counter()
+        result = json.loads(fn(**make_args(i)))
+        return time.perf_counter() - start, result["success"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(call, range(calls)))
+    elapsed = time.perf_counter() - start
+    return summarize(
+        tool,
+        "direct",
+        1,
+        concurrency,
+        [latency for latency, _ in results],
+        sum(not ok for _, ok in results),
+        elapsed,
+    )
+
+
+class HttpServer:
+    """Serves `expense_log_mcp.main` with the given number of worker processes."""
+
+    def __init__(self, workers: int):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.command = [
+            sys.executable,
+            "-m",
+            "expense_log_mcp.main",
+            "--port",
+            str(self.port),
+            "--workers",
+            str(workers),
+        ]
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/mcp"
+
+    def __enter__(self):
+        self.process = subprocess.Popen(self.command, stdout=subprocess.DEVNULL)
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/pool-stats"):
+                    return self
+            except OSError:
+                if self.process.poll() is not None:
+                    raise RuntimeError("the server exited during startup")
+                time.sleep(0.1)
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.wait()
+
+
+async def _run_http(
+    url: str, workers: int, tool: str, make_args, calls: int, concurrency: int
+) -> dict:
+    from fastmcp import Client
+
+    latencies, errors = [], 0
+    next_call = iter(range(calls))
+
+    async def client_loop():
+        nonlocal errors
+        async with Client(url, auth=BEARER_TOKEN) as client:
+            for i in next_call:
+                start = time.perf_counter()
+                result = await client.call_tool(tool, make_args(i), raise_on_error=False)
+                latencies.append(time.perf_counter() - start)
+                if result.is_error or not json.loads(result.content[0].text)["success"]:
+                    errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return summarize(tool, "http", workers, concurrency, latencies, errors, elapsed)
+
+
+def run_http(url: str, workers: int, tool: str, make_args, calls: int, concurrency: int) -> dict:
+    return asyncio.run(_run_http(url, workers, tool, make_args, calls, concurrency))
+
+
+def result_key(result: dict) -> tuple:
+    return result["tool"], result["mode"], result.get("workers", 1), result["concurrency"]
+
+
+def print_table(results: list, baseline: dict) -> None:
+    print(
+        f"{'tool':<24} {'mode':<7} {'workers':>7} {'conc':>5} {'p50 ms':>9} {'p95 ms':>9} "
+        f"{'p99 ms':>9} {'calls/s':>9} {'errors':>7}{'  vs baseline' if baseline else ''}"
+    )
+    for r in results:
+        line = (
+            f"{r['tool']:<24} {r['mode']:<7} {r['workers']:>7} {r['concurrency']:>5} "
+            f"{r['p50_ms']:>9.2f} "
+            f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['calls_per_second']:>9.1f} "
+            f"{r['errors']:>7}"
+        )
+        previous = baseline.get(result_key(r))
+        if previous:
+            line += f"  p95 {r['p95_ms'] / previous['p95_ms']:.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--ledgers", type=int, default=10)
+    parser.add_argument("--expenses", type=int, default=10000, help="expenses per ledger")
+    parser.add_argument("--calls", type=int, default=200, help="calls per tool and client count")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument(
+        "--modes", nargs="+", choices=["direct", "http"], default=["direct", "http"]
+    )
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1], help="server worker processes for http"
+    )
+    parser.add_argument("--tools", nargs="+", default=None, help="defaults to every tool")
+    parser.add_argument("--output", default="load_test_results.json")
+    parser.add_argument("--compare", default=None, help="a previous --output to compare with")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            for r in json.load(f)["results"]:
+                baseline[result_key(r)] = r
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'load_test.db')}"
+        os.environ["DATABASE_URL"] = url
+        os.environ["BEARER_TOKEN"] = BEARER_TOKEN
+        engine = create_engine(url)
+        seed(engine, args.ledgers, args.expenses)
+        engine.dispose()
+
+        results = []
+        if "direct" in args.modes:
+            for concurrency in args.concurrency:
+                prefix = f"load-direct-{concurrency}"
+                for tool, make_args in scenarios(args.ledgers, args.expenses, prefix):
+                    if not args.tools or tool in args.tools:
+                        results.append(run_direct(tool, make_args, args.calls, concurrency))
+        if "http" in args.modes:
+            for workers in args.workers:
+                with HttpServer(workers) as server:
+                    for concurrency in args.concurrency:
+                        prefix = f"load-http-{workers}-{concurrency}"
+                        for tool, make_args in scenarios(args.ledgers, args.expenses, prefix):
+                            if not args.tools or tool in args.tools:
+                                results.append(
+                                    run_http(
+                                        server.url,
+                                        workers,
+                                        tool,
+                                        make_args,
+                                        args.calls,
+                                        concurrency,
+                                    )
+                                )
+
+        from expense_log_mcp import database
+
+        if database.engine is not None:
+            database.engine.dispose()
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "database": create_engine(url).dialect.name,
+            "ledgers": args.ledgers,
+            "expenses_per_ledger": args.expenses,
+            "calls": args.calls,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            **{package: version(package) for package in ("fastmcp", "mcp", "sqlalchemy")},
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print_table(results, baseline)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
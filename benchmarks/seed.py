@@ -0,0 +1,94 @@
+"""
+Seeds a database with synthetic ledgers for benchmarks and load tests.
+
+Usage:
+    python benchmarks/seed.py --database-url sqlite:///bench.db --ledgers 10 --expenses 10000
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import Session
+
+from expense_log_mcp.models import Base, Expense, ExpenseCategory, ExpenseDailyRollup, Ledger
+from expense_log_mcp.rollups import rebuild_rollups
+
+PAYERS = ["Alice", "Bob", "Carol", "Dave"]
+CATEGORIES = ["Dining", "Groceries", "Transportation", "Utilities", "Entertainment"]
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+DAYS = 365
+BATCH_SIZE = 10000
+
+
+def ledger_id(ledger: int) -> str:
+    return f"ledger-{ledger}"
+
+
+def message_id(ledger: int, expense: int) -> str:
+    return f"ledger-{ledger}-message-{expense}"
+
+
+def category_id(category: int) -> str:
+    return f"category-{category}"
+
+
+def seed(engine, ledgers: int, expenses: int, seed: int = 0) -> None:
+    """
+    Replaces all data with `ledgers` ledgers of `expenses` expenses each, spread over a
+    year, and rebuilds the daily rollup.
+    """
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    with Session(engine) as session, session.begin():
+        session.execute(delete(ExpenseDailyRollup))
+        session.execute(delete(Expense))
+        session.execute(delete(ExpenseCategory))
+        session.execute(delete(Ledger))
+        session.execute(
+            insert(Ledger),
+            [{"id": ledger_id(i), "name": f"Ledger {i}"} for i in range(ledgers)],
+        )
+        session.execute(
+            insert(ExpenseCategory),
+            [{"id": category_id(i), "name": name} for i, name in enumerate(CATEGORIES)],
+        )
+        batch = []
+        for ledger in range(ledgers):
+            for i in range(expenses):
+                batch.append(
+                    {
+                        "id": f"ledger-{ledger}-expense-{i}",
+                        "ledgerId": ledger_id(ledger),
+                        "categoryId": category_id(rng.randrange(len(CATEGORIES))),
+                        "messageId": message_id(ledger, i),
+                        "description": "Synthetic expense",
+                        "amount": rng.randrange(100, 100000) / 100,
+                        "payer": rng.choice(PAYERS),
+                        "createdAt": START + timedelta(seconds=rng.randrange(DAYS * 86400)),
+                    }
+                )
+                if len(batch) == BATCH_SIZE:
+                    session.execute(insert(Expense), batch)
+                    batch = []
+        if batch:
+            session.execute(insert(Expense), batch)
+        rebuild_rollups(session)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--ledgers", type=int, default=10)
+    parser.add_argument("--expenses", type=int, default=10000, help="expenses per ledger")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    seed(engine, args.ledgers, args.expenses, args.seed)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
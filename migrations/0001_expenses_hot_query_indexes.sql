@@ -0,0 +1,16 @@
+-- Indexes for the ledger/date-range and ledger/payer/date-range filters of
+-- get_grouped_expenses. The INCLUDE columns make the grouped sums index-only.
+--
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so apply
+-- this file with autocommit, e.g. `psql "$DATABASE_URL" -f <file>`.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS expenses_ledger_id_created_at_idx
+    ON expenses (ledger_id, created_at)
+    INCLUDE (payer, category_id, amount);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS expenses_ledger_id_payer_created_at_idx
+    ON expenses (ledger_id, payer, created_at)
+    INCLUDE (category_id, amount);
+
+-- Refresh statistics and the visibility map so index-only scans are chosen.
+VACUUM (ANALYZE) expenses;
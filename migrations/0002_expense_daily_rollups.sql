@@ -0,0 +1,33 @@
+-- Per-day totals used by get_grouped_expenses for whole days of a date range.
+-- With EXPENSE_ROLLUPS_ENABLED=true, the add/delete tools keep the table up to
+-- date in the same transaction as the expense rows they write.
+--
+-- The backfill below groups days at UTC+8, the default of
+-- EXPENSE_ROLLUP_TIMEZONE_OFFSET_HOURS. If you configure another offset, change
+-- the interval accordingly or run `python -m expense_log_mcp.rollups` afterwards.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS expense_daily_rollups (
+    ledger_id TEXT NOT NULL REFERENCES ledgers (id),
+    payer TEXT NOT NULL,
+    category_id TEXT NOT NULL REFERENCES expense_categories (id),
+    local_day DATE NOT NULL,
+    total_amount DOUBLE PRECISION NOT NULL DEFAULT 0,
+    expense_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (ledger_id, payer, category_id, local_day)
+);
+
+-- Block writers while backfilling so no expense is counted twice or missed.
+LOCK TABLE expenses IN SHARE MODE;
+
+DELETE FROM expense_daily_rollups;
+
+INSERT INTO expense_daily_rollups
+    (ledger_id, payer, category_id, local_day, total_amount, expense_count)
+SELECT ledger_id, payer, category_id, (created_at + INTERVAL '8 hours')::date, SUM(amount), COUNT(*)
+FROM expenses
+WHERE ledger_id IS NOT NULL AND category_id IS NOT NULL
+GROUP BY ledger_id, payer, category_id, (created_at + INTERVAL '8 hours')::date;
+
+COMMIT;
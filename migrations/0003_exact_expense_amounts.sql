@@ -0,0 +1,32 @@
+-- Stores amounts as whole cents in BIGINT columns instead of DOUBLE PRECISION, so
+-- sums no longer drift by fractions of a cent. PostgreSQL adds up integers as fast
+-- as doubles, which NUMERIC is not. The columns keep their names; readers outside
+-- this server must divide `amount` and `total_amount` by 100.
+--
+-- Changing the column type rewrites both tables under an ACCESS EXCLUSIVE lock;
+-- run it in a quiet period. Existing amounts are rounded to cents, and the daily
+-- rollup is rebuilt from the rounded amounts afterwards.
+
+BEGIN;
+
+ALTER TABLE expenses
+    ALTER COLUMN amount TYPE BIGINT USING round(amount::numeric * 100)::bigint;
+
+ALTER TABLE expense_daily_rollups
+    ALTER COLUMN total_amount DROP DEFAULT,
+    ALTER COLUMN total_amount TYPE BIGINT USING round(total_amount::numeric * 100)::bigint,
+    ALTER COLUMN total_amount SET DEFAULT 0;
+
+DELETE FROM expense_daily_rollups;
+
+INSERT INTO expense_daily_rollups
+    (ledger_id, payer, category_id, local_day, total_amount, expense_count)
+SELECT ledger_id, payer, category_id, (created_at + INTERVAL '8 hours')::date, SUM(amount), COUNT(*)
+FROM expenses
+WHERE ledger_id IS NOT NULL AND category_id IS NOT NULL
+GROUP BY ledger_id, payer, category_id, (created_at + INTERVAL '8 hours')::date;
+
+COMMIT;
+
+-- The type change rebuilt the covering indexes from 0001; refresh statistics.
+ANALYZE expenses;
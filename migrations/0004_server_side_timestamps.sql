@@ -0,0 +1,16 @@
+-- Timestamps were filled in by the server process with the time the process
+-- started, so every row written by one process shared the same created_at.
+-- They now default to the database's current UTC time, and updated_at is set on
+-- UPDATE by the statement itself.
+
+ALTER TABLE ledgers
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+
+ALTER TABLE expense_categories
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
+
+ALTER TABLE expenses
+    ALTER COLUMN created_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP),
+    ALTER COLUMN updated_at SET DEFAULT TIMEZONE('utc', CURRENT_TIMESTAMP);
@@ -0,0 +1,5 @@
+-- Every write to a ledger's expenses increments its version in the same
+-- transaction, so get_grouped_expenses can reuse cached results until the
+-- ledger changes.
+
+ALTER TABLE ledgers ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
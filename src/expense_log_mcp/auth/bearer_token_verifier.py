@@ -1,19 +1,153 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
 from fastmcp.server.auth import TokenVerifier
 from fastmcp.server.auth.auth import AccessToken
+from expense_log_mcp.cache import TTLCache
+
+DEFAULT_SCOPES = ["read", "write"]
+
+
+def hash_token(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenGrant:
+    """
+    The client, scopes and optional expiry (epoch seconds) granted to a token.
+    """
+
+    __slots__ = ("digest", "client_id", "scopes", "expires_at")
+
+    def __init__(
+        self, digest: bytes, client_id: str, scopes: List[str], expires_at: Optional[int] = None
+    ):
+        self.digest = digest
+        self.client_id = client_id
+        self.scopes = scopes
+        self.expires_at = expires_at
+
+
+def load_tokens_file(path: str, default_client_id: str) -> Dict[bytes, TokenGrant]:
+    """
+    Loads token grants from a JSON file of the form
+    `{"tokens": [{"token": "...", "client_id": "...", "scopes": [...], "expires_at": 0}]}`.
+    A `token_sha256` hex digest can be given instead of `token` to keep secrets out of the file.
+    """
+    with open(path) as f:
+        entries = json.load(f)["tokens"]
+
+    grants = {}
+    for entry in entries:
+        if "token_sha256" in entry:
+            digest = bytes.fromhex(entry["token_sha256"])
+        else:
+            digest = hash_token(entry["token"])
+        grants[digest] = TokenGrant(
+            digest,
+            entry.get("client_id", default_client_id),
+            list(entry.get("scopes", DEFAULT_SCOPES)),
+            entry.get("expires_at"),
+        )
+    return grants
 
 
 class BearerTokenVerifier(TokenVerifier):
-    def __init__(self, client_id: str, token: str, **kwargs):
+    """
+    Verifies bearer tokens against a static token and/or a JSON tokens file.
+
+    Tokens are hashed with SHA-256 and looked up by digest in a dict, so lookups cost the
+    same for one token or thousands. Hashing first is also what keeps the lookup from
+    leaking timing: it compares digests, and how much of a digest a guess matches says
+    nothing about the token. Verified access tokens are cached in a bounded LRU with a
+    TTL, and the tokens file is reloaded when its modification time changes, checked at
+    most every `reload_interval` seconds. A rewrite that fails to load, e.g. one read
+    half-written, keeps the previous tokens and is retried at the next check.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        token: Optional[str] = None,
+        tokens_file: Optional[str] = None,
+        cache_size: int = 1024,
+        cache_ttl: float = 60,
+        reload_interval: float = 5,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.client_id = client_id
         self.token = token
+        self.tokens_file = tokens_file
+        self.cache_ttl = cache_ttl
+        self.reload_interval = reload_interval
+        self._cache = TTLCache(maxsize=cache_size)
+        self._grants: Dict[bytes, TokenGrant] = {}
+        self._file_mtime: Optional[float] = None
+        self._next_reload_check = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Reloads the tokens, e.g. after the tokens file was rewritten, and drops cached
+        access tokens so revoked tokens stop working immediately.
+        """
+        with self._lock:
+            grants = {}
+            if self.token:
+                digest = hash_token(self.token)
+                grants[digest] = TokenGrant(digest, self.client_id, DEFAULT_SCOPES)
+            if self.tokens_file:
+                # Stat before reading, so a rewrite that lands in between is loaded again.
+                mtime = os.stat(self.tokens_file).st_mtime
+                grants.update(load_tokens_file(self.tokens_file, self.client_id))
+                self._file_mtime = mtime
+            self._grants = grants
+            self._next_reload_check = time.monotonic() + self.reload_interval
+            self._cache.clear()
+
+    def _reload_if_changed(self) -> None:
+        if not self.tokens_file or time.monotonic() < self._next_reload_check:
+            return
+        try:
+            changed = os.stat(self.tokens_file).st_mtime != self._file_mtime
+        except OSError:
+            changed = False
+        if changed:
+            try:
+                self.reload()
+                return
+            except Exception:
+                # Keep serving the previous tokens; the file is tried again at the next check.
+                pass
+        self._next_reload_check = time.monotonic() + self.reload_interval
 
     async def verify_token(self, token: str) -> AccessToken | None:
-        if token == self.token:
-            return AccessToken(
-                client_id=self.client_id,
-                expires_at=None,
-                scopes=["read", "write"],
-                token=token,
-            )
-        return None
+        self._reload_if_changed()
+        digest = hash_token(token)
+
+        access_token = self._cache.get(digest)
+        if access_token is not None:
+            if access_token.expires_at is None or access_token.expires_at > time.time():
+                return access_token
+            self._cache.invalidate(digest)
+            return None
+
+        grant = self._grants.get(digest)
+        if grant is None:
+            return None
+        if grant.expires_at is not None and grant.expires_at <= time.time():
+            return None
+
+        access_token = AccessToken(
+            client_id=grant.client_id,
+            expires_at=grant.expires_at,
+            scopes=grant.scopes,
+            token=token,
+        )
+        self._cache.set(digest, access_token, self.cache_ttl)
+        return access_token
@@ -0,0 +1,100 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Kept apart from `metrics`, which imports FastMCP, so tools and the database engines can
+# record into it without loading the server, e.g. in the rollups CLI.
+
+
+class CallStats:
+    """
+    Timings of a single tool call, filled in by the tool wrapper, the query events and
+    the response encoder.
+    """
+
+    __slots__ = ("queries", "db_time", "hydration_time", "encode_time", "run_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.hydration_time = 0.0
+        self.encode_time = 0.0
+        self.run_time = 0.0
+
+    def add(self, other: "CallStats") -> None:
+        """
+        Charges this call with the SQL, hydration and encoding work recorded in `other`,
+        e.g. a write pipeline batch the call waited for.
+        """
+        self.queries += other.queries
+        self.db_time += other.db_time
+        self.hydration_time += other.hydration_time
+        self.encode_time += other.encode_time
+
+
+current_call: ContextVar[Optional[CallStats]] = ContextVar("current_call", default=None)
+
+
+class timed:
+    """
+    Adds the time spent in a `with` block to the given field of the current call's stats,
+    if a tool call is being recorded.
+    """
+
+    __slots__ = ("field", "stats", "started_at")
+
+    def __init__(self, field: str):
+        self.field = field
+
+    def __enter__(self):
+        self.stats = current_call.get()
+        if self.stats is not None:
+            self.started_at = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        if self.stats is not None:
+            elapsed = time.perf_counter() - self.started_at
+            setattr(self.stats, self.field, getattr(self.stats, self.field) + elapsed)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_call.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - context._query_started_at
+
+
+def _do_orm_execute(orm_execute_state):
+    # Statements that return rows are buffered here, so building their rows and ORM
+    # objects is timed apart from the tool code that consumes them. Streamed results are
+    # left alone, as buffering them would hold every row in memory at once; their
+    # hydration counts as time in the tool.
+    if current_call.get() is None or not getattr(
+        orm_execute_state.statement, "exported_columns", None
+    ):
+        return None
+    options = orm_execute_state.execution_options
+    if options.get("yield_per") or options.get("stream_results"):
+        return None
+    result = orm_execute_state.invoke_statement()
+    with timed("hydration_time"):
+        frozen = result.freeze()
+    return frozen()
+
+
+def instrument_engine(engine) -> None:
+    """
+    Times the SQL statements executed on `engine` and counts them per tool call, and
+    times the hydration of session results.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if not event.contains(Session, "do_orm_execute", _do_orm_execute):
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
@@ -1,20 +1,367 @@
+import functools
+import itertools
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import ARRAY, any_, bindparam, create_engine, exc, make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from expense_log_mcp.cache import TTLCache
+from expense_log_mcp.call_stats import instrument_engine
+from expense_log_mcp.sqlite import configure_sqlite_engine, is_sqlite_file, is_sqlite_url
 
 engine = None
 SessionLocal = None
+# Separate pool of readers next to the single writer of an embedded SQLite database.
+reader_engine = None
+ReaderSessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
+read_replicas = None
 
+# Ledgers written by this process recently, whose reads go to the primary.
+_recent_writes = TTLCache(maxsize=10000)
+_round_robin = itertools.count()
 
-def get_db():
-    global engine, SessionLocal
+# Session bound by `async_tool` while a tool body runs on the async engine.
+_bound_session = ContextVar("bound_session", default=None)
+
+# Pool settings read from the environment: (variable, create_engine argument, type).
+POOL_SETTINGS = (
+    ("DATABASE_POOL_SIZE", "pool_size", int),
+    ("DATABASE_MAX_OVERFLOW", "max_overflow", int),
+    ("DATABASE_POOL_TIMEOUT", "pool_timeout", float),
+    ("DATABASE_POOL_RECYCLE", "pool_recycle", int),
+    ("DATABASE_POOL_PRE_PING", "pool_pre_ping", lambda value: value.lower() in ("1", "true")),
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    A `QueuePool` that records how often and how long callers wait for a connection.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            wait_time = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.timeouts += timed_out
+                self.wait_time_total += wait_time
+                self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
+def get_pool_options() -> dict:
+    """
+    Returns the `create_engine` pool arguments configured through environment variables.
+    """
+    options = {}
+    for variable, argument, parse in POOL_SETTINGS:
+        value = os.getenv(variable)
+        if value:
+            options[argument] = parse(value)
+    return options
+
+
+def is_prepared_statements_enabled() -> bool:
+    return os.getenv("DATABASE_PREPARED_STATEMENTS", "true").lower() in ("1", "true", "yes")
+
+
+def get_connect_args(url: str) -> dict:
+    """
+    Returns the driver arguments for server-side prepared statements.
+
+    psycopg (3) prepares a statement once it ran a few times on a connection and the
+    asyncpg dialect keeps a per-connection cache of prepared statements; both are left on
+    unless `DATABASE_PREPARED_STATEMENTS=false`, e.g. behind a transaction-mode PgBouncer.
+    psycopg2 and SQLite have no server-side prepared statements.
+    """
+    if is_prepared_statements_enabled():
+        return {}
+    driver = make_url(url).get_driver_name()
+    if driver == "psycopg":
+        return {"prepare_threshold": None}
+    if driver == "asyncpg":
+        return {"prepared_statement_cache_size": 0}
+    return {}
+
+
+def _create_engine(url: str, writer: bool = False):
+    """
+    Creates an instrumented engine. For a SQLite database file, the `writer` engine
+    keeps a single connection, so writes in this process queue for it instead of
+    contending for SQLite's one write lock.
+    """
+    options = get_pool_options()
+    if writer and is_sqlite_file(url):
+        options.update(pool_size=1, max_overflow=0)
+    new_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        connect_args=get_connect_args(url),
+        **options,
+    )
+    if is_sqlite_url(url):
+        configure_sqlite_engine(new_engine, writer)
+    instrument_engine(new_engine)
+    return new_engine
+
+
+def get_engine():
+    global engine, SessionLocal, reader_engine, ReaderSessionLocal
     if not engine:
-        DATABASE_URL = os.getenv("DATABASE_URL")
-        engine = create_engine(DATABASE_URL)
+        url = os.getenv("DATABASE_URL")
+        engine = _create_engine(url, writer=True)
         SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        if is_sqlite_file(url):
+            # In WAL mode readers never wait for the writer, so they get a pool of their own.
+            reader_engine = _create_engine(url)
+            ReaderSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=reader_engine)
+        else:
+            reader_engine = ReaderSessionLocal = None
+    return engine
+
+
+class ReadReplica:
+    """
+    A read replica's engine and sessions, and until when it is skipped after failing.
+    """
+
+    def __init__(self, url: str):
+        self.engine = _create_engine(url)
+        self.sessionmaker = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.down_until = 0.0
+
+
+def get_read_replicas() -> list:
+    """
+    Returns a replica for every URL in the comma-separated `DATABASE_READ_URL`, each with
+    its own pool, or an empty list when no replicas are configured.
+    """
+    global read_replicas
+    if read_replicas is None:
+        urls = [url.strip() for url in os.getenv("DATABASE_READ_URL", "").split(",")]
+        read_replicas = [ReadReplica(url) for url in urls if url]
+    return read_replicas
+
+
+def note_write(ledger_id: str) -> None:
+    """
+    Sends this process's reads of the ledger to the primary for the next
+    `DATABASE_READ_YOUR_WRITES_SECONDS` seconds, so they see the write despite replica lag.
+    """
+    window = float(os.getenv("DATABASE_READ_YOUR_WRITES_SECONDS", "0"))
+    if window > 0 and ledger_id is not None:
+        _recent_writes.set(ledger_id, True, window)
+
+
+def _replica_order(replicas: list) -> list:
+    """
+    Returns the healthy replicas in the order to try them, by `DATABASE_READ_STRATEGY`:
+    `round_robin` (default) or `least_connections`.
+    """
+    now = time.monotonic()
+    healthy = [replica for replica in replicas if replica.down_until <= now]
+    if os.getenv("DATABASE_READ_STRATEGY", "round_robin") == "least_connections":
+        return sorted(healthy, key=lambda replica: replica.engine.pool.checkedout())
+    start = next(_round_robin) % len(healthy) if healthy else 0
+    return healthy[start:] + healthy[:start]
+
+
+def _open_read_session(ledger_id: Optional[str]):
+    """
+    Returns a session on a replica with its connection already checked out, or `None` to
+    read from the primary: without replicas, within the read-your-writes window of the
+    ledger, or when every replica fails to connect.
+    """
+    replicas = get_read_replicas()
+    if not replicas or (ledger_id is not None and _recent_writes.get(ledger_id)):
+        return None
+    for replica in _replica_order(replicas):
+        db = replica.sessionmaker()
+        try:
+            db.connection()
+            return db
+        except exc.DBAPIError:
+            db.close()
+            replica.down_until = time.monotonic() + float(
+                os.getenv("DATABASE_READ_RETRY_SECONDS", "30")
+            )
+    return None
+
+
+def is_session_bound() -> bool:
+    """
+    Returns whether `session_scope` yields a session bound by `async_tool`.
+    """
+    return _bound_session.get() is not None
+
+
+@contextmanager
+def session_scope(readonly: bool = False, ledger_id: Optional[str] = None):
+    """
+    Provides a session that is rolled back on error and always closed on exit,
+    returning its connection to the pool as soon as the block ends.
 
-    db = SessionLocal()
+    With `readonly`, the session reads from a replica from `DATABASE_READ_URL` if one is
+    configured and reachable, and from the primary otherwise. Pass the `ledger_id` read so
+    recent writes to it are read from the primary (see `note_write`). On an embedded SQLite
+    database, read-only sessions use the reader pool and all others the single writer.
+    """
+    session = _bound_session.get()
+    if session is not None:
+        yield session
+        return
+
+    db = _open_read_session(ledger_id) if readonly else None
+    if db is None:
+        get_engine()
+        db = ReaderSessionLocal() if readonly and ReaderSessionLocal else SessionLocal()
     try:
         yield db
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+
+def dialect_insert(db, model):
+    """
+    Returns an `insert()` for the session's dialect, which supports `ON CONFLICT` clauses.
+    """
+    # Importing a dialect package loads all of its drivers, so it waits for first use.
+    if dialect_name(db) == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert(model)
+
+
+def dialect_name(db) -> str:
+    return db.get_bind().dialect.name
+
+
+def in_values(column, name: str, dialect: str):
+    """
+    Returns `column IN (...)` for a list bound as the `name` parameter at execution time.
+
+    On PostgreSQL this renders `column = ANY(:name)` with one array parameter, so the SQL
+    text is the same whatever the list length; other dialects get an expanding `IN`.
+    """
+    if dialect == "postgresql":
+        return column == any_(bindparam(name, type_=ARRAY(column.type)))
+    return column.in_(bindparam(name, expanding=True))
+
+
+def dispose_engines_after_fork() -> None:
+    """
+    Drops the connections a forked worker inherited from its parent, so each worker
+    process opens its own. The parent's connections are left open for the parent.
+    """
+    if engine is not None:
+        engine.dispose(close=False)
+    if reader_engine is not None:
+        reader_engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+    for replica in read_replicas or ():
+        replica.engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=dispose_engines_after_fork)
+
+
+def get_pool_stats() -> dict:
+    """
+    Returns connection pool statistics for the engine, or an empty dict before first use.
+    On an embedded SQLite database they add up the writer's and the readers' pools.
+    """
+    if not engine:
+        return {}
+    pools = [engine.pool] + ([reader_engine.pool] if reader_engine is not None else [])
+    return {
+        "size": sum(pool.size() for pool in pools),
+        "checked_in": sum(pool.checkedin() for pool in pools),
+        "checked_out": sum(pool.checkedout() for pool in pools),
+        "overflow": sum(pool.overflow() for pool in pools),
+        "checkouts": sum(pool.checkouts for pool in pools),
+        "timeouts": sum(pool.timeouts for pool in pools),
+        "wait_time_total_seconds": sum(pool.wait_time_total for pool in pools),
+        "wait_time_max_seconds": max(pool.wait_time_max for pool in pools),
+    }
+
+
+def is_async_enabled() -> bool:
+    """
+    Returns whether tools should run on the async engine (`DATABASE_ASYNC=true`).
+    """
+    return os.getenv("DATABASE_ASYNC", "false").lower() in ("1", "true", "yes")
+
+
+def get_async_database_url() -> str:
+    """
+    Returns `DATABASE_ASYNC_URL`, or `DATABASE_URL` switched to the asyncpg driver.
+    """
+    url = os.getenv("DATABASE_ASYNC_URL")
+    if url:
+        return url
+    url = make_url(os.getenv("DATABASE_URL")).set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def get_async_sessionmaker():
+    global async_engine, AsyncSessionLocal
+    if not async_engine:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+        url = get_async_database_url()
+        async_engine = create_async_engine(
+            url, connect_args=get_connect_args(url), **get_pool_options()
+        )
+        instrument_engine(async_engine.sync_engine)
+        AsyncSessionLocal = async_sessionmaker(
+            autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine
+        )
+    return AsyncSessionLocal
+
+
+def _call_with_session(session, tool, args, kwargs):
+    token = _bound_session.set(session)
+    try:
+        return tool(*args, **kwargs)
+    finally:
+        _bound_session.reset(token)
+
+
+def async_tool(tool):
+    """
+    Wraps a synchronous tool into an `async def` tool backed by the async engine.
+
+    The tool body runs through `AsyncSession.run_sync`, so its queries are awaited on
+    the event loop by the async driver instead of blocking a worker thread.
+    """
+
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        async with get_async_sessionmaker()() as session:
+            return await session.run_sync(_call_with_session, tool, args, kwargs)
+
+    return wrapper
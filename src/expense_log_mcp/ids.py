@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+
+_cuid: Optional[Callable[[], str]] = None
+_uuid7_lock = threading.Lock()
+_uuid7_last = 0
+
+
+def cuid() -> str:
+    """
+    Returns a new cuid, loading the generator on first use to keep it out of startup.
+    """
+    global _cuid
+    if _cuid is None:
+        from cuid2 import cuid_wrapper
+
+        _cuid = cuid_wrapper()
+    return _cuid()
+
+
+def uuid7() -> str:
+    """
+    Returns a new UUIDv7 (RFC 9562): a 48-bit Unix timestamp in milliseconds, 12 bits of
+    sub-millisecond time and 62 random bits. IDs from this process are strictly
+    increasing, and their canonical strings sort by time, so new rows are appended to the
+    end of a primary key index instead of splitting pages all over it.
+    """
+    global _uuid7_last
+    # The timestamp and sub-millisecond fraction fill the 60 bits above the random ones.
+    nanoseconds = time.time_ns()
+    milliseconds, remainder = divmod(nanoseconds, 1_000_000)
+    timestamp = (milliseconds << 12) | (remainder * 4096 // 1_000_000)
+    with _uuid7_lock:
+        # Within one clock tick, or if the clock stepped back, count up from the last ID.
+        timestamp = max(timestamp, _uuid7_last + 1)
+        _uuid7_last = timestamp
+    random_bits = int.from_bytes(os.urandom(8), "big") >> 2
+    value = (
+        (timestamp >> 12) << 80 | 0x7 << 76 | (timestamp & 0xFFF) << 64 | 0b10 << 62 | random_bits
+    )
+    return str(uuid.UUID(int=value))
+
+
+ID_STRATEGIES: Dict[str, Callable[[], str]] = {"cuid": cuid, "uuid7": uuid7}
+
+_strategy: Optional[Callable[[], str]] = None
+
+
+def get_id_strategy() -> Callable[[], str]:
+    """
+    Returns the ID generator named by `ID_STRATEGY`: `cuid` (default) or the time-ordered
+    `uuid7`. Both produce strings, so existing cuid IDs and new IDs share the same columns.
+    """
+    global _strategy
+    if _strategy is None:
+        name = os.getenv("ID_STRATEGY", "cuid")
+        if name not in ID_STRATEGIES:
+            raise ValueError(
+                f"Unknown ID_STRATEGY {name!r}, expected one of {', '.join(ID_STRATEGIES)}."
+            )
+        _strategy = ID_STRATEGIES[name]
+    return _strategy
+
+
+def reset_id_strategy() -> None:
+    """
+    Drops the chosen ID generator, so the next ID reads `ID_STRATEGY` again.
+    """
+    global _strategy
+    _strategy = None
+
+
+def new_id() -> str:
+    """
+    Returns a new primary key from the configured ID strategy.
+    """
+    return get_id_strategy()()
@@ -0,0 +1,29 @@
+from typing import Iterable, Optional
+from sqlalchemy import bindparam, select, update
+from expense_log_mcp.models import Ledger
+
+SELECT_LEDGER_VERSION = select(Ledger.version).where(Ledger.id == bindparam("ledger_id"))
+
+_ledgers = Ledger.__table__
+BUMP_LEDGER_VERSION = (
+    update(_ledgers)
+    .where(_ledgers.c.id == bindparam("ledger_id"))
+    .values(version=_ledgers.c.version + 1)
+)
+
+
+def get_ledger_version(db, ledger_id: str) -> Optional[int]:
+    """
+    Returns the ledger's version, or `None` if the ledger does not exist.
+    """
+    return db.scalar(SELECT_LEDGER_VERSION, {"ledger_id": ledger_id})
+
+
+def bump_ledger_versions(db, ledger_ids: Iterable[str]) -> None:
+    """
+    Increments the version of each ledger within the session's current transaction.
+    Ledgers are updated in sorted order, so concurrent writes lock them in the same order.
+    """
+    rows = [{"ledger_id": ledger_id} for ledger_id in sorted(set(ledger_ids)) if ledger_id]
+    if rows:
+        db.execute(BUMP_LEDGER_VERSION, rows)
@@ -1,29 +1,166 @@
+import argparse
+import functools
 import os
+from typing import Optional
 from dotenv import load_dotenv
-from fastmcp import FastMCP
+from fastmcp import FastMCP, settings
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
 
 from expense_log_mcp.auth import BearerTokenVerifier
+from expense_log_mcp.database import async_tool, get_pool_stats, is_async_enabled
+from expense_log_mcp.metrics import ToolMetricsMiddleware, render_metrics, timed_tool
+from expense_log_mcp.warmup import is_warm_up_enabled, warm_up
+from expense_log_mcp.write_pipeline import is_write_pipeline_enabled, pipelined_tool
 from expense_log_mcp.tools import (
     add_expense,
+    add_expenses,
     delete_expense,
+    delete_expenses,
     get_expense,
     get_expense_categories,
+    get_expenses,
     get_grouped_expenses,
+    list_expenses,
 )
+from expense_log_mcp.tools.get_grouped_expenses import get_grouped_expenses_cache
 
 load_dotenv()
 
 auth = BearerTokenVerifier(
     client_id="expense-log-agent",
     token=os.getenv("BEARER_TOKEN"),
+    tokens_file=os.getenv("BEARER_TOKENS_FILE"),
+    cache_ttl=float(os.getenv("BEARER_TOKEN_CACHE_TTL", "60")),
 )
-mcp = FastMCP(name="Expense Log MCP", auth=auth)
+mcp = FastMCP(name="Expense Log MCP", auth=auth, middleware=[ToolMetricsMiddleware()])
+
+for tool in (
+    add_expense,
+    add_expenses,
+    delete_expense,
+    delete_expenses,
+    get_expense,
+    get_expense_categories,
+    get_expenses,
+    get_grouped_expenses,
+    list_expenses,
+):
+    if is_async_enabled():
+        tool = async_tool(tool)
+    elif tool is add_expense and is_write_pipeline_enabled():
+        tool = pipelined_tool(tool)
+    mcp.tool(timed_tool(tool))
+
+
+def get_cache_stats() -> dict:
+    """
+    Returns the statistics of each enabled result cache, by name.
+    """
+    cache = get_grouped_expenses_cache()
+    return {"grouped_expenses": cache.stats()} if cache is not None else {}
+
+
+def requires_token(route):
+    """
+    Guards a custom route with the bearer tokens of `/mcp`; FastMCP only applies `auth` to
+    the MCP endpoint itself.
+    """
+
+    @functools.wraps(route)
+    async def wrapper(request: Request):
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or await auth.verify_token(token) is None:
+            return JSONResponse(
+                {"error": "invalid_token", "error_description": "Authentication required"},
+                status_code=401,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return await route(request)
+
+    return wrapper
+
+
+@mcp.custom_route("/pool-stats", methods=["GET"])
+@requires_token
+async def pool_stats(request: Request) -> JSONResponse:
+    return JSONResponse(get_pool_stats())
+
+
+@mcp.custom_route("/cache-stats", methods=["GET"])
+@requires_token
+async def cache_stats(request: Request) -> JSONResponse:
+    return JSONResponse(get_cache_stats())
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+@requires_token
+async def metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(
+        render_metrics(get_pool_stats(), get_cache_stats()), media_type="text/plain; version=0.0.4"
+    )
+
+
+def get_stateless_http() -> Optional[bool]:
+    """
+    Returns whether MCP sessions are kept out of memory: `STATELESS_HTTP` if set, otherwise
+    True with more than one `WORKERS`, otherwise None to leave it to FastMCP's settings.
+
+    With more than one worker, a client's requests can land on any worker, so a session
+    kept in one worker's memory is missing from the others.
+    """
+    value = os.getenv("STATELESS_HTTP")
+    if value:
+        return value.lower() in ("1", "true", "yes")
+    return True if int(os.getenv("WORKERS", "1")) > 1 else None
+
+
+def create_app():
+    """
+    Creates the streamable-HTTP ASGI app, e.g. for each worker process of uvicorn.
+    """
+    if is_warm_up_enabled():
+        warm_up()
+    return mcp.http_app(stateless_http=get_stateless_http())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serves the Expense Log MCP server.")
+    parser.add_argument("--host", default=None, help="address to bind (default: FASTMCP_HOST)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WORKERS", "1")),
+        help="number of worker processes (default: WORKERS or 1)",
+    )
+    args = parser.parse_args()
+
+    if args.workers == 1:
+        if is_warm_up_enabled():
+            warm_up()
+        mcp.run(
+            transport="streamable-http",
+            host=args.host,
+            port=args.port,
+            stateless_http=get_stateless_http(),
+        )
+        return
+
+    import uvicorn
+
+    # Workers are spawned as fresh interpreters that import this module and build their
+    # own app, engine and connection pool through create_app.
+    os.environ["WORKERS"] = str(args.workers)
+    uvicorn.run(
+        "expense_log_mcp.main:create_app",
+        factory=True,
+        host=args.host or settings.host,
+        port=args.port,
+        workers=args.workers,
+        lifespan="on",
+    )
 
-mcp.tool(add_expense)
-mcp.tool(delete_expense)
-mcp.tool(get_expense)
-mcp.tool(get_expense_categories)
-mcp.tool(get_grouped_expenses)
 
 if __name__ == "__main__":
-    mcp.run(transport="streamable-http", port=int(os.getenv("PORT")) | 8000)
+    main()
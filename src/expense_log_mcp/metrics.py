@@ -0,0 +1,258 @@
+import inspect
+import re
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from fastmcp.server.middleware import Middleware
+from expense_log_mcp.call_stats import CallStats, current_call
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Tools put the response code at the start of their JSON payload.
+_CODE_PATTERN = re.compile(r'"code":\s*"(\w+)"')
+
+
+class Counter:
+    def __init__(self, name: str, help: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple, value: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {value:g}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    def __init__(
+        self, name: str, help: str, label_names: Tuple[str, ...], buckets: Iterable[float]
+    ):
+        self.name = name
+        self.help = help
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket, +Inf count, sum]
+        self._values: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, value_sum) in sorted(self._values.items()):
+                cumulative = 0
+                for bucket, count in zip(self.buckets, counts):
+                    cumulative += count
+                    bucket_labels = _labels(self.label_names + ("le",), labels + (f"{bucket:g}",))
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                inf_labels = _labels(self.label_names + ("le",), labels + ("+Inf",))
+                lines.append(f"{self.name}_bucket{inf_labels} {total}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {value_sum:g}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {total}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+def _labels(names: Tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+TOOL_CALLS = Counter(
+    "expense_log_tool_calls_total", "Tool calls by response code.", ("tool", "code")
+)
+TOOL_DURATION = Histogram(
+    "expense_log_tool_duration_seconds",
+    "Time spent handling a tool call, including FastMCP dispatch.",
+    ("tool",),
+    DURATION_BUCKETS,
+)
+TOOL_RUN_DURATION = Histogram(
+    "expense_log_tool_run_duration_seconds",
+    "Time spent in the tool function, including SQL, ORM hydration and JSON encoding.",
+    ("tool",),
+    DURATION_BUCKETS,
+)
+TOOL_DB_DURATION = Histogram(
+    "expense_log_tool_db_duration_seconds",
+    "Time spent executing SQL statements during a tool call.",
+    ("tool",),
+    DURATION_BUCKETS,
+)
+TOOL_HYDRATION_DURATION = Histogram(
+    "expense_log_tool_hydration_duration_seconds",
+    "Time spent turning result rows into Python rows and ORM objects during a tool call.",
+    ("tool",),
+    DURATION_BUCKETS,
+)
+TOOL_ENCODE_DURATION = Histogram(
+    "expense_log_tool_encode_duration_seconds",
+    "Time spent encoding JSON responses during a tool call.",
+    ("tool",),
+    DURATION_BUCKETS,
+)
+TOOL_QUERIES = Histogram(
+    "expense_log_tool_queries",
+    "SQL statements executed per tool call.",
+    ("tool",),
+    QUERY_COUNT_BUCKETS,
+)
+# Pool statistics from get_pool_stats() that only ever grow.
+POOL_METRICS = {
+    "checkouts": ("expense_log_db_pool_checkouts_total", "counter"),
+    "timeouts": ("expense_log_db_pool_timeouts_total", "counter"),
+    "wait_time_total_seconds": ("expense_log_db_pool_wait_seconds_total", "counter"),
+}
+CACHE_METRICS = {
+    "size": ("expense_log_cache_entries", "gauge"),
+    "hits": ("expense_log_cache_hits_total", "counter"),
+    "misses": ("expense_log_cache_misses_total", "counter"),
+    "evictions": ("expense_log_cache_evictions_total", "counter"),
+}
+METRICS = (
+    TOOL_CALLS,
+    TOOL_DURATION,
+    TOOL_RUN_DURATION,
+    TOOL_DB_DURATION,
+    TOOL_HYDRATION_DURATION,
+    TOOL_ENCODE_DURATION,
+    TOOL_QUERIES,
+)
+
+
+# Names of the tools wrapped by `timed_tool`; calls to any other name are recorded as
+# "unknown", so clients cannot add label values at will.
+_tool_names = set()
+
+
+def timed_tool(tool: Callable) -> Callable:
+    """
+    Wraps a tool to record the time spent in its function body, separately from the
+    FastMCP dispatch around it.
+    """
+    _tool_names.add(tool.__name__)
+    if inspect.iscoroutinefunction(tool):
+
+        @wraps(tool)
+        async def async_wrapper(*args, **kwargs):
+            started_at = time.perf_counter()
+            try:
+                return await tool(*args, **kwargs)
+            finally:
+                _add_run_time(started_at)
+
+        return async_wrapper
+
+    @wraps(tool)
+    def wrapper(*args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return tool(*args, **kwargs)
+        finally:
+            _add_run_time(started_at)
+
+    return wrapper
+
+
+def _add_run_time(started_at: float) -> None:
+    stats = current_call.get()
+    if stats is not None:
+        stats.run_time += time.perf_counter() - started_at
+
+
+def _result_code(result) -> str:
+    for content in getattr(result, "content", None) or []:
+        match = _CODE_PATTERN.search(getattr(content, "text", "")[:128])
+        if match:
+            return match.group(1)
+    return "UNKNOWN"
+
+
+class ToolMetricsMiddleware(Middleware):
+    """
+    Records the duration, SQL, hydration and encoding time and query count of every
+    tool call.
+    """
+
+    async def on_call_tool(self, context, call_next):
+        stats = CallStats()
+        token = current_call.set(stats)
+        started_at = time.perf_counter()
+        code = "EXCEPTION"
+        try:
+            result = await call_next(context)
+            code = _result_code(result)
+            return result
+        finally:
+            duration = time.perf_counter() - started_at
+            current_call.reset(token)
+            name = context.message.name
+            record_call(name if name in _tool_names else "unknown", code, duration, stats)
+
+
+def record_call(tool: str, code: str, duration: float, stats: CallStats) -> None:
+    TOOL_CALLS.inc((tool, code))
+    TOOL_DURATION.observe((tool,), duration)
+    TOOL_RUN_DURATION.observe((tool,), stats.run_time)
+    TOOL_DB_DURATION.observe((tool,), stats.db_time)
+    TOOL_HYDRATION_DURATION.observe((tool,), stats.hydration_time)
+    TOOL_ENCODE_DURATION.observe((tool,), stats.encode_time)
+    TOOL_QUERIES.observe((tool,), stats.queries)
+
+
+def render_metrics(pool_stats: Optional[dict] = None, cache_stats: Optional[dict] = None) -> str:
+    """
+    Renders all metrics, the given connection pool statistics as gauges, and the given
+    statistics of each named cache, in the Prometheus text exposition format.
+    """
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    for key, value in sorted((pool_stats or {}).items()):
+        name, kind = POOL_METRICS.get(key, (f"expense_log_db_pool_{key}", "gauge"))
+        lines += [f"# TYPE {name} {kind}", f"{name} {value:g}"]
+    for key, (name, kind) in CACHE_METRICS.items() if cache_stats else ():
+        lines.append(f"# TYPE {name} {kind}")
+        for cache, stats in sorted(cache_stats.items()):
+            lines.append(f'{name}{{cache="{cache}"}} {stats[key]:g}')
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    for metric in METRICS:
+        metric.clear()
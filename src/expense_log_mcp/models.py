@@ -1,33 +1,148 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
     String,
-    Float,
+    Date,
     DateTime,
     ForeignKey,
+    Index,
+    Integer,
+    TypeDecorator,
     UniqueConstraint,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship, declarative_base
-import datetime
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from decimal import ROUND_HALF_UP, Decimal
+from expense_log_mcp.ids import new_id
 
 Base = declarative_base()
 
 
+class utcnow(FunctionElement):
+    """
+    The current UTC time as a naive timestamp, evaluated by the database when a row is
+    written rather than once when this module is imported.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow, "postgresql")
+def _postgresql_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _sqlite_utcnow(element, compiler, **kw):
+    # CURRENT_TIMESTAMP is UTC in SQLite too, but only has whole seconds. %f has
+    # milliseconds; pad them to the microseconds SQLAlchemy binds datetimes with, so the
+    # stored text compares with bound values as the times they stand for.
+    return "(STRFTIME('%Y-%m-%d %H:%M:%f000', 'now'))"
+
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+BUCKET_UNITS = ("day", "week", "month")
+
+
+class local_bucket(FunctionElement):
+    """
+    The first local date of the day, week (starting Monday) or month containing a UTC
+    timestamp or date, with local time `offset_hours` ahead of UTC.
+    """
+
+    type = Date()
+    inherit_cache = True
+    _traverse_internals = FunctionElement._traverse_internals + [
+        ("unit", InternalTraversal.dp_string),
+        ("offset_hours", InternalTraversal.dp_plain_obj),
+    ]
+
+    def __init__(self, unit: str, expr, offset_hours: int = 0):
+        if unit not in BUCKET_UNITS:
+            raise ValueError(f"bucket must be one of {', '.join(BUCKET_UNITS)}.")
+        self.unit = unit
+        self.offset_hours = offset_hours
+        super().__init__(expr)
+
+
+@compiles(local_bucket)
+def _default_local_bucket(element, compiler, **kw):
+    value = f"CAST({compiler.process(element.clauses, **kw)} AS TIMESTAMP)"
+    if element.offset_hours:
+        value = f"{value} + INTERVAL '{element.offset_hours:d} hours'"
+    return f"CAST(DATE_TRUNC('{element.unit}', {value}) AS DATE)"
+
+
+@compiles(local_bucket, "sqlite")
+def _sqlite_local_bucket(element, compiler, **kw):
+    modifiers = [f"'{element.offset_hours:+d} hours'"]
+    if element.unit == "week":
+        modifiers += ["'weekday 0'", "'-6 days'"]
+    elif element.unit == "month":
+        modifiers.append("'start of month'")
+    return f"DATE({compiler.process(element.clauses, **kw)}, {', '.join(modifiers)})"
+
+
+# Amounts are exact decimals with two fractional digits.
+AMOUNT_SCALE = Decimal("0.01")
+# Responses encode amounts as JSON numbers, i.e. doubles, which round-trip 15 significant
+# digits: every amount with two fractional digits below 10 trillion.
+MAX_AMOUNT = Decimal(10) ** 13
+
+
+def to_amount(value) -> Decimal:
+    """
+    Converts an amount to an exact Decimal with two fractional digits, rounding half away
+    from zero. Raises `ValueError` for amounts of 10 trillion or more, positive or negative,
+    which responses could not carry exactly.
+    """
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    value = value.quantize(AMOUNT_SCALE, rounding=ROUND_HALF_UP)
+    if abs(value) >= MAX_AMOUNT:
+        raise ValueError(f"Amount {value} is out of range; it must be below {MAX_AMOUNT:,}.")
+    return value
+
+
+class Cents(TypeDecorator):
+    """
+    An amount stored as a whole number of cents in a BIGINT column, which PostgreSQL sums
+    faster than NUMERIC and as fast as DOUBLE PRECISION, without drifting. Python code
+    reads and writes Decimal amounts, as returned by `to_amount`; sums of the column are
+    converted the same way.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(to_amount(value).scaleb(2))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # PostgreSQL returns SUM(bigint) as NUMERIC, so this may be a Decimal already.
+        return Decimal(value).scaleb(-2)
+
+
 class Ledger(Base):
     __tablename__ = "ledgers"
 
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=new_id)
     name = Column(String, nullable=False)
-    createdAt = Column(
-        DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        name="created_at",
-    )
-    updatedAt = Column(
-        DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        onupdate=datetime.datetime.now(datetime.timezone.utc),
-        name="updated_at",
-    )
+    # Bumped by every write to the ledger's expenses, so cached reads can be checked cheaply.
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+    createdAt = Column(DateTime, server_default=utcnow(), name="created_at")
+    updatedAt = Column(DateTime, server_default=utcnow(), onupdate=utcnow(), name="updated_at")
 
     expenses = relationship("Expense", back_populates="ledger")
 
@@ -35,19 +150,10 @@ class Ledger(Base):
 class ExpenseCategory(Base):
     __tablename__ = "expense_categories"
 
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=new_id)
     name = Column(String, nullable=False)
-    createdAt = Column(
-        DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        name="created_at",
-    )
-    updatedAt = Column(
-        DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        onupdate=datetime.datetime.now(datetime.timezone.utc),
-        name="updated_at",
-    )
+    createdAt = Column(DateTime, server_default=utcnow(), name="created_at")
+    updatedAt = Column(DateTime, server_default=utcnow(), onupdate=utcnow(), name="updated_at")
 
     expenses = relationship("Expense", back_populates="category")
 
@@ -55,26 +161,52 @@ class ExpenseCategory(Base):
 class Expense(Base):
     __tablename__ = "expenses"
 
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=new_id)
     ledgerId = Column(String, ForeignKey("ledgers.id"), name="ledger_id")
     categoryId = Column(String, ForeignKey("expense_categories.id"), name="category_id")
     messageId = Column(String, nullable=False)
     description = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Cents, nullable=False, name="amount")
     payer = Column(String, nullable=False)
-    createdAt = Column(
-        DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        name="created_at",
-    )
-    updatedAt = Column(
-        DateTime,
-        default=datetime.datetime.now(datetime.timezone.utc),
-        onupdate=datetime.datetime.now(datetime.timezone.utc),
-        name="updated_at",
-    )
+    createdAt = Column(DateTime, server_default=utcnow(), name="created_at")
+    updatedAt = Column(DateTime, server_default=utcnow(), onupdate=utcnow(), name="updated_at")
 
     ledger = relationship("Ledger", back_populates="expenses")
     category = relationship("ExpenseCategory", back_populates="expenses")
 
-    __table_args__ = (UniqueConstraint("ledger_id", "messageId", name="_ledger_message_uc"),)
+    __table_args__ = (
+        UniqueConstraint("ledger_id", "messageId", name="_ledger_message_uc"),
+        # Cover the date-range and payer filters of get_grouped_expenses; the INCLUDE
+        # columns let PostgreSQL answer the grouped sums with index-only scans.
+        Index(
+            "expenses_ledger_id_created_at_idx",
+            "ledger_id",
+            "created_at",
+            postgresql_include=["payer", "category_id", "amount"],
+        ),
+        Index(
+            "expenses_ledger_id_payer_created_at_idx",
+            "ledger_id",
+            "payer",
+            "created_at",
+            postgresql_include=["category_id", "amount"],
+        ),
+    )
+
+
+class ExpenseDailyRollup(Base):
+    """
+    Per-day totals of expenses, keyed by the day in the rollup timezone
+    (`EXPENSE_ROLLUP_TIMEZONE_OFFSET_HOURS`) and maintained by the write tools.
+    """
+
+    __tablename__ = "expense_daily_rollups"
+
+    ledgerId = Column(String, ForeignKey("ledgers.id"), primary_key=True, name="ledger_id")
+    payer = Column(String, primary_key=True)
+    categoryId = Column(
+        String, ForeignKey("expense_categories.id"), primary_key=True, name="category_id"
+    )
+    localDay = Column(Date, primary_key=True, name="local_day")
+    totalAmount = Column(Cents, nullable=False, default=0, name="total_amount")
+    expenseCount = Column(Integer, nullable=False, default=0, name="expense_count")
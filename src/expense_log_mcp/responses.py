@@ -0,0 +1,79 @@
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+from expense_log_mcp.call_stats import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        # Exact for amounts, which `to_amount` keeps below 10**13: a double round-trips up to
+        # 15 significant digits.
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, default=_default, separators=(",", ":"))
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+ENCODERS: Dict[str, Callable[[Any], str]] = {"stdlib": _stdlib_dumps}
+if orjson is not None:
+    ENCODERS["orjson"] = _orjson_dumps
+
+_encoder: Optional[Callable[[Any], str]] = None
+
+
+def get_encoder() -> Callable[[Any], str]:
+    """
+    Returns the JSON encoder named by `JSON_ENCODER` (`orjson` or `stdlib`), defaulting to
+    orjson when it is installed. Both encode datetimes as ISO 8601 and decimals as numbers,
+    which are exact to the cent below 10 trillion.
+    """
+    global _encoder
+    if _encoder is None:
+        name = os.getenv("JSON_ENCODER") or ("orjson" if orjson is not None else "stdlib")
+        if name not in ENCODERS:
+            raise ValueError(f"Unknown or unavailable JSON encoder: {name}")
+        _encoder = ENCODERS[name]
+    return _encoder
+
+
+def reset_encoder() -> None:
+    """
+    Drops the chosen encoder, so the next response reads `JSON_ENCODER` again.
+    """
+    global _encoder
+    _encoder = None
+
+
+def dumps(obj: Any) -> str:
+    with timed("encode_time"):
+        return get_encoder()(obj)
+
+
+def success(message: str, data: Any = None, code: str = "OK") -> str:
+    """
+    Encodes a successful tool response. FastMCP passes the string through as the text
+    content of the result, so the envelope is encoded exactly once.
+    """
+    return dumps({"success": True, "code": code, "message": message, "data": data})
+
+
+def failure(code: str, message: str) -> str:
+    """
+    Encodes a failed tool response with the given error code.
+    """
+    return dumps({"success": False, "code": code, "message": message})
@@ -0,0 +1,142 @@
+import os
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable, Optional, Tuple
+from sqlalchemy import delete, select
+from expense_log_mcp.database import dialect_insert, session_scope
+from expense_log_mcp.models import Expense, ExpenseDailyRollup, to_amount
+
+
+def is_rollup_enabled() -> bool:
+    """
+    Returns whether writes maintain the daily rollup and grouped reads use it. Off unless
+    `EXPENSE_ROLLUPS_ENABLED` is set, since the table must be rebuilt before it is trusted.
+    """
+    return os.getenv("EXPENSE_ROLLUPS_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def get_rollup_offset_hours() -> int:
+    """
+    Returns the UTC offset in hours that defines the days of the rollup table.
+    """
+    return int(os.getenv("EXPENSE_ROLLUP_TIMEZONE_OFFSET_HOURS", "8"))
+
+
+def to_utc(value: datetime) -> datetime:
+    """
+    Converts a datetime to the naive UTC form stored in the `created_at` columns.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def local_day(created_at: datetime, offset_hours: int) -> date:
+    return (to_utc(created_at) + timedelta(hours=offset_hours)).date()
+
+
+def local_midnight(day: date, offset_hours: int) -> datetime:
+    return datetime.combine(day, time(), tzinfo=timezone(timedelta(hours=offset_hours)))
+
+
+def full_day_range(
+    start: Optional[datetime], end: Optional[datetime], offset_hours: int
+) -> Optional[Tuple[Optional[date], Optional[date]]]:
+    """
+    Returns the first and last local days lying entirely within `[start, end]`, with
+    `None` for an open bound, or `None` if the range covers no whole day.
+    """
+    first_day = last_day = None
+    if start is not None:
+        start = start.astimezone(timezone(timedelta(hours=offset_hours)))
+        first_day = start.date()
+        if start.timetz().replace(tzinfo=None) != time():
+            first_day += timedelta(days=1)
+    if end is not None:
+        end = end.astimezone(timezone(timedelta(hours=offset_hours)))
+        last_day = (end + timedelta(microseconds=1)).date() - timedelta(days=1)
+    if first_day is not None and last_day is not None and first_day > last_day:
+        return None
+    return first_day, last_day
+
+
+def apply_rollup(db, expenses: Iterable, sign: int = 1) -> None:
+    """
+    Adds (`sign=1`) or removes (`sign=-1`) expenses from the daily rollup within the
+    session's current transaction. Each expense needs `ledgerId`, `payer`, `categoryId`,
+    `createdAt` and `amount`; expenses without a category are not rolled up.
+    """
+    if is_rollup_enabled():
+        _upsert_rollup(db, expenses, sign)
+
+
+def _upsert_rollup(db, expenses: Iterable, sign: int) -> None:
+    offset_hours = get_rollup_offset_hours()
+    deltas = defaultdict(lambda: [Decimal(0), 0])
+    for expense in expenses:
+        if expense.ledgerId is None or expense.categoryId is None:
+            continue
+        key = (
+            expense.ledgerId,
+            expense.payer,
+            expense.categoryId,
+            local_day(expense.createdAt, offset_hours),
+        )
+        deltas[key][0] += sign * to_amount(expense.amount)
+        deltas[key][1] += sign
+
+    if not deltas:
+        return
+
+    # Sorted keys make concurrent upserts lock rows in the same order.
+    rows = [
+        {
+            "ledgerId": ledger_id,
+            "payer": payer,
+            "categoryId": category_id,
+            "localDay": day,
+            "totalAmount": amount,
+            "expenseCount": count,
+        }
+        for (ledger_id, payer, category_id, day), (amount, count) in sorted(deltas.items())
+    ]
+    stmt = dialect_insert(db, ExpenseDailyRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            ExpenseDailyRollup.ledgerId,
+            ExpenseDailyRollup.payer,
+            ExpenseDailyRollup.categoryId,
+            ExpenseDailyRollup.localDay,
+        ],
+        set_={
+            "total_amount": ExpenseDailyRollup.totalAmount + stmt.excluded.total_amount,
+            "expense_count": ExpenseDailyRollup.expenseCount + stmt.excluded.expense_count,
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def rebuild_rollups(db) -> None:
+    """
+    Recomputes the whole rollup table from the expenses table, e.g. after changing
+    `EXPENSE_ROLLUP_TIMEZONE_OFFSET_HOURS`.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.connection().exec_driver_sql("LOCK TABLE expenses IN SHARE MODE")
+    db.execute(delete(ExpenseDailyRollup))
+    expenses = db.execute(
+        select(
+            Expense.ledgerId, Expense.payer, Expense.categoryId, Expense.createdAt, Expense.amount
+        ).execution_options(yield_per=10000)
+    )
+    _upsert_rollup(db, expenses, 1)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    with session_scope() as db:
+        rebuild_rollups(db)
+        db.commit()
@@ -0,0 +1,81 @@
+import os
+from sqlalchemy import event, make_url
+
+# Pragmas set on every SQLite connection: (variable, pragma, default).
+SQLITE_PRAGMAS = (
+    ("SQLITE_JOURNAL_MODE", "journal_mode", "WAL"),
+    ("SQLITE_SYNCHRONOUS", "synchronous", "NORMAL"),
+    ("SQLITE_BUSY_TIMEOUT_MS", "busy_timeout", "5000"),
+    ("SQLITE_CACHE_SIZE", "cache_size", "-65536"),
+    ("SQLITE_MMAP_SIZE", "mmap_size", "268435456"),
+)
+
+
+def is_sqlite_url(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_sqlite_file(url: str) -> bool:
+    """
+    Returns whether `url` is a SQLite database file, which separate connections share,
+    rather than an in-memory database private to each connection.
+    """
+    database = make_url(url).database
+    return is_sqlite_url(url) and database not in (None, "", ":memory:")
+
+
+def get_sqlite_pragmas() -> dict:
+    """
+    Returns the pragmas configured through environment variables: a WAL journal so reads
+    never wait for the writer, `synchronous=NORMAL`, which is durable in WAL mode except
+    for the last commits on power loss, a busy timeout, a 64 MiB page cache (negative sizes
+    are in KiB) and 256 MiB of memory-mapped I/O. Foreign keys are always enforced, as on
+    PostgreSQL.
+    """
+    pragmas = {pragma: os.getenv(variable, default) for variable, pragma, default in SQLITE_PRAGMAS}
+    pragmas["foreign_keys"] = "ON"
+    return pragmas
+
+
+def configure_sqlite_engine(engine, writer: bool) -> None:
+    """
+    Sets the pragmas on each new connection of a SQLite engine and takes over opening its
+    transactions. The writer begins with `BEGIN IMMEDIATE`, taking the write lock up
+    front, so a transaction that read first never fails to upgrade its lock with
+    `database is locked`; other writers wait for up to the busy timeout instead.
+    Readers begin a deferred transaction, so every query of a session reads one snapshot.
+    """
+    pragmas = get_sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        # Stop pysqlite from opening transactions itself, so the "begin" hook below does.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _begin(connection):
+        # Sent on the driver connection, like the implicit BEGIN of other drivers, so it is
+        # not counted as one of the tool's queries.
+        connection.connection.driver_connection.execute("BEGIN IMMEDIATE" if writer else "BEGIN")
+
+
+def init_db(engine) -> None:
+    """
+    Creates any missing tables and indexes, e.g. for a new embedded SQLite database.
+    PostgreSQL schemas are managed with the SQL files in `migrations/` instead.
+    """
+    from expense_log_mcp.models import Base
+
+    Base.metadata.create_all(engine)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    from expense_log_mcp.database import get_engine
+
+    load_dotenv()
+    init_db(get_engine())
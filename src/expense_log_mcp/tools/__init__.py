@@ -1,5 +1,9 @@
 from .add_expense import add_expense  # noqa: F401
+from .add_expenses import add_expenses  # noqa: F401
 from .delete_expense import delete_expense  # noqa: F401
+from .delete_expenses import delete_expenses  # noqa: F401
 from .get_expense import get_expense  # noqa: F401
 from .get_expense_categories import get_expense_categories  # noqa: F401
+from .get_expenses import get_expenses  # noqa: F401
 from .get_grouped_expenses import get_grouped_expenses  # noqa: F401
+from .list_expenses import list_expenses  # noqa: F401
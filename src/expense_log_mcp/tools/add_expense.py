@@ -1,10 +1,123 @@
-import json
-from expense_log_mcp.database import get_db
-from expense_log_mcp.models import Expense
-from typing import Callable
-from cuid2 import cuid_wrapper
+from types import SimpleNamespace
+from sqlalchemy import bindparam, select, tuple_
+from expense_log_mcp.database import dialect_insert, is_session_bound, note_write, session_scope
+from expense_log_mcp.ids import new_id
+from expense_log_mcp.ledger_versions import bump_ledger_versions
+from expense_log_mcp.models import Expense, to_amount
+from expense_log_mcp.responses import failure, success
+from expense_log_mcp.rollups import apply_rollup
+from expense_log_mcp.write_pipeline import (
+    WritePipeline,
+    get_write_pipeline_options,
+    is_write_pipeline_enabled,
+)
+from typing import List, Optional
 
-cuid_generator: Callable[[], str] = cuid_wrapper()
+SELECT_EXPENSE_ID = select(Expense.id).where(
+    Expense.ledgerId == bindparam("ledger_id"), Expense.messageId == bindparam("message_id")
+)
+
+
+def _insert_expense(row: dict) -> str:
+    with session_scope() as db:
+        # A retried message conflicts on (ledger_id, message_id) and inserts nothing,
+        # instead of failing the transaction on the unique constraint.
+        stmt = (
+            dialect_insert(db, Expense)
+            .on_conflict_do_nothing(index_elements=[Expense.ledgerId, Expense.messageId])
+            .returning(Expense.createdAt)
+        )
+        created_at = db.execute(stmt, row).scalar()
+
+        if created_at is None:
+            expense_id = db.scalar(
+                SELECT_EXPENSE_ID, {"ledger_id": row["ledgerId"], "message_id": row["messageId"]}
+            )
+            return success("Expense already exists.", {"expenseId": expense_id}, code="DUPLICATE")
+
+        apply_rollup(db, [SimpleNamespace(**row, createdAt=created_at)])
+        bump_ledger_versions(db, [row["ledgerId"]])
+        db.commit()
+        note_write(row["ledgerId"])
+
+    return success("Expense added successfully.", {"expenseId": row["id"]})
+
+
+def _insert_expenses(rows: List[dict]) -> List[str]:
+    """
+    Inserts the rows of a write pipeline batch in one transaction, answering each row as
+    `add_expense` would. If the batch fails, each row is retried in its own transaction
+    so only the rows at fault get an error.
+    """
+    try:
+        with session_scope() as db:
+            stmt = (
+                dialect_insert(db, Expense)
+                .on_conflict_do_nothing(index_elements=[Expense.ledgerId, Expense.messageId])
+                .returning(Expense.id, Expense.createdAt)
+            )
+            created = dict(db.execute(stmt, rows).all())
+            # A message repeated within the batch is a duplicate of its first occurrence.
+            keys = [(row["ledgerId"], row["messageId"]) for row in rows if row["id"] not in created]
+            existing = {}
+            if keys:
+                existing = {
+                    (ledger_id, message_id): expense_id
+                    for ledger_id, message_id, expense_id in db.execute(
+                        select(Expense.ledgerId, Expense.messageId, Expense.id).where(
+                            tuple_(Expense.ledgerId, Expense.messageId).in_(keys)
+                        )
+                    )
+                }
+            apply_rollup(
+                db,
+                [
+                    SimpleNamespace(**row, createdAt=created[row["id"]])
+                    for row in rows
+                    if row["id"] in created
+                ],
+            )
+            bump_ledger_versions(db, [row["ledgerId"] for row in rows if row["id"] in created])
+            db.commit()
+    except Exception:
+        results = []
+        for row in rows:
+            try:
+                results.append(_insert_expense(row))
+            except Exception as e:
+                results.append(failure("ERROR", str(e)))
+        return results
+
+    for ledger_id in {row["ledgerId"] for row in rows}:
+        note_write(ledger_id)
+    return [
+        (
+            success("Expense added successfully.", {"expenseId": row["id"]})
+            if row["id"] in created
+            else success(
+                "Expense already exists.",
+                {"expenseId": existing.get((row["ledgerId"], row["messageId"]))},
+                code="DUPLICATE",
+            )
+        )
+        for row in rows
+    ]
+
+
+_pipeline: Optional[WritePipeline] = None
+
+
+def get_write_pipeline() -> Optional[WritePipeline]:
+    """
+    Returns the pipeline batching concurrent `add_expense` calls, or `None` unless
+    `WRITE_PIPELINE_ENABLED=true`.
+    """
+    global _pipeline
+    if not is_write_pipeline_enabled():
+        return None
+    if _pipeline is None:
+        _pipeline = WritePipeline(_insert_expenses, **get_write_pipeline_options())
+    return _pipeline
 
 
 def add_expense(
@@ -19,35 +132,24 @@ def add_expense(
     Adds a new expense record.
     """
     try:
-        db = next(get_db())
-
-        expense = Expense(
-            id=cuid_generator(),
-            ledgerId=ledger_id,
-            categoryId=category_id,
-            messageId=message_id,
-            description=description,
-            amount=amount,
-            payer=payer,
-        )
+        try:
+            amount = to_amount(amount)
+        except ValueError as e:
+            return failure("INVALID_ARGUMENT", str(e))
+        row = {
+            "id": new_id(),
+            "ledgerId": ledger_id,
+            "categoryId": category_id,
+            "messageId": message_id,
+            "description": description,
+            "amount": amount,
+            "payer": payer,
+        }
 
-        db.add(expense)
-        db.commit()
-        db.refresh(expense)
-
-        return json.dumps(
-            {
-                "success": True,
-                "code": "OK",
-                "message": "Expense added successfully.",
-                "data": {"expenseId": expense.id},
-            }
-        )
+        # A session bound by the caller has its own transaction, which a batch cannot join.
+        pipeline = get_write_pipeline()
+        if pipeline is not None and not is_session_bound():
+            return pipeline.submit(row).result()
+        return _insert_expense(row)
     except Exception as e:
-        return json.dumps(
-            {
-                "success": False,
-                "code": "ERROR",
-                "message": str(e),
-            }
-        )
+        return failure("ERROR", str(e))
@@ -0,0 +1,115 @@
+import functools
+from types import SimpleNamespace
+from typing import List
+from typing_extensions import TypedDict
+from sqlalchemy import bindparam, select
+from expense_log_mcp.database import (
+    dialect_insert,
+    dialect_name,
+    in_values,
+    note_write,
+    session_scope,
+)
+from expense_log_mcp.ids import new_id
+from expense_log_mcp.ledger_versions import bump_ledger_versions
+from expense_log_mcp.models import Expense, to_amount
+from expense_log_mcp.responses import failure, success
+from expense_log_mcp.rollups import apply_rollup
+
+MAX_EXPENSES = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def _existing_statement(dialect: str):
+    return select(Expense.messageId, Expense.id).where(
+        Expense.ledgerId == bindparam("ledger_id"),
+        in_values(Expense.messageId, "message_ids", dialect),
+    )
+
+
+class ExpenseInput(TypedDict):
+    category_id: str
+    message_id: str
+    description: str
+    amount: float
+    payer: str
+
+
+def add_expenses(ledger_id: str, expenses: List[ExpenseInput]) -> str:
+    """
+    Adds many expense records to a ledger in a single transaction.
+    Expenses whose message ID already exists in the ledger are skipped as duplicates.
+    """
+    try:
+        if len(expenses) > MAX_EXPENSES:
+            return failure(
+                "INVALID_ARGUMENT", f"At most {MAX_EXPENSES} expenses can be added at once."
+            )
+
+        try:
+            rows = [
+                {
+                    "id": new_id(),
+                    "ledgerId": ledger_id,
+                    "categoryId": expense["category_id"],
+                    "messageId": expense["message_id"],
+                    "description": expense["description"],
+                    "amount": to_amount(expense["amount"]),
+                    "payer": expense["payer"],
+                }
+                for expense in expenses
+            ]
+        except ValueError as e:
+            return failure("INVALID_ARGUMENT", str(e))
+
+        with session_scope() as db:
+            created, existing = {}, {}
+            if rows:
+                stmt = (
+                    dialect_insert(db, Expense)
+                    .on_conflict_do_nothing(index_elements=[Expense.ledgerId, Expense.messageId])
+                    .returning(Expense.id, Expense.createdAt)
+                )
+                created = dict(db.execute(stmt, rows).all())
+                duplicate_message_ids = [
+                    row["messageId"] for row in rows if row["id"] not in created
+                ]
+                if duplicate_message_ids:
+                    existing = dict(
+                        db.execute(
+                            _existing_statement(dialect_name(db)),
+                            {"ledger_id": ledger_id, "message_ids": duplicate_message_ids},
+                        ).all()
+                    )
+                apply_rollup(
+                    db,
+                    [
+                        SimpleNamespace(**row, createdAt=created[row["id"]])
+                        for row in rows
+                        if row["id"] in created
+                    ],
+                )
+                if created:
+                    bump_ledger_versions(db, [ledger_id])
+                db.commit()
+                note_write(ledger_id)
+
+        results = [
+            {
+                "messageId": row["messageId"],
+                "expenseId": row["id"] if row["id"] in created else existing.get(row["messageId"]),
+                "status": "CREATED" if row["id"] in created else "DUPLICATE",
+            }
+            for row in rows
+        ]
+
+        return success(
+            "Expenses added successfully.",
+            {
+                "created": len(created),
+                "duplicates": len(rows) - len(created),
+                "expenses": results,
+            },
+        )
+    except Exception as e:
+        return failure("ERROR", str(e))
@@ -1,6 +1,24 @@
-import json
-from expense_log_mcp.database import get_db
+from sqlalchemy import bindparam, delete
+from expense_log_mcp.database import note_write, session_scope
+from expense_log_mcp.ledger_versions import bump_ledger_versions
 from expense_log_mcp.models import Expense
+from expense_log_mcp.responses import failure, success
+from expense_log_mcp.rollups import apply_rollup
+
+DELETE_EXPENSE = (
+    delete(Expense)
+    .where(Expense.ledgerId == bindparam("ledger_id"), Expense.messageId == bindparam("message_id"))
+    .returning(
+        Expense.id,
+        Expense.ledgerId,
+        Expense.categoryId,
+        Expense.description,
+        Expense.amount,
+        Expense.payer,
+        Expense.createdAt,
+    )
+    .execution_options(synchronize_session=False)
+)
 
 
 def delete_expense(ledger_id: str, message_id: str) -> str:
@@ -8,40 +26,27 @@ def delete_expense(ledger_id: str, message_id: str) -> str:
     Deletes an expense record.
     """
     try:
-        db = next(get_db())
-
-        expense = db.query(Expense).filter_by(ledgerId=ledger_id, messageId=message_id).first()
+        with session_scope() as db:
+            expense = db.execute(
+                DELETE_EXPENSE, {"ledger_id": ledger_id, "message_id": message_id}
+            ).first()
 
-        if not expense:
-            return json.dumps(
-                {
-                    "success": False,
-                    "code": "NOT_FOUND",
-                    "message": "Expense not found.",
-                }
-            )
+            if not expense:
+                return failure("NOT_FOUND", "Expense not found.")
 
-        db.delete(expense)
-        db.commit()
+            apply_rollup(db, [expense], -1)
+            bump_ledger_versions(db, [ledger_id])
+            db.commit()
+            note_write(ledger_id)
 
-        return json.dumps(
+        return success(
+            "Expense deleted successfully.",
             {
-                "success": True,
-                "code": "OK",
-                "message": "Expense deleted successfully.",
-                "data": {
-                    "id": expense.id,
-                    "description": expense.description,
-                    "amount": expense.amount,
-                    "createdAt": expense.createdAt.strftime("%a %b %d %Y"),
-                },
-            }
+                "id": expense.id,
+                "description": expense.description,
+                "amount": expense.amount,
+                "createdAt": expense.createdAt.strftime("%a %b %d %Y"),
+            },
         )
     except Exception as e:
-        return json.dumps(
-            {
-                "success": False,
-                "code": "ERROR",
-                "message": str(e),
-            }
-        )
+        return failure("ERROR", str(e))
@@ -0,0 +1,81 @@
+import functools
+from typing import List
+from sqlalchemy import bindparam, delete
+from expense_log_mcp.database import dialect_name, in_values, note_write, session_scope
+from expense_log_mcp.ledger_versions import bump_ledger_versions
+from expense_log_mcp.models import Expense
+from expense_log_mcp.responses import failure, success
+from expense_log_mcp.rollups import apply_rollup
+
+MAX_MESSAGE_IDS = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def _delete_statement(dialect: str):
+    return (
+        delete(Expense)
+        .where(
+            Expense.ledgerId == bindparam("ledger_id"),
+            in_values(Expense.messageId, "message_ids", dialect),
+        )
+        .returning(
+            Expense.id,
+            Expense.ledgerId,
+            Expense.categoryId,
+            Expense.messageId,
+            Expense.description,
+            Expense.amount,
+            Expense.payer,
+            Expense.createdAt,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_expenses(ledger_id: str, message_ids: List[str]) -> str:
+    """
+    Deletes the expense records of many messages in a ledger with a single statement.
+    """
+    try:
+        if len(message_ids) > MAX_MESSAGE_IDS:
+            return failure(
+                "INVALID_ARGUMENT", f"At most {MAX_MESSAGE_IDS} expenses can be deleted at once."
+            )
+
+        expenses = []
+        if message_ids:
+            with session_scope() as db:
+                expenses = db.execute(
+                    _delete_statement(dialect_name(db)),
+                    {"ledger_id": ledger_id, "message_ids": list(message_ids)},
+                ).all()
+                apply_rollup(db, expenses, -1)
+                if expenses:
+                    bump_ledger_versions(db, [ledger_id])
+                db.commit()
+                note_write(ledger_id)
+
+        deleted_message_ids = {expense.messageId for expense in expenses}
+
+        return success(
+            "Expenses deleted successfully.",
+            {
+                "deleted": [
+                    {
+                        "id": expense.id,
+                        "messageId": expense.messageId,
+                        "description": expense.description,
+                        "amount": expense.amount,
+                        "createdAt": expense.createdAt.strftime("%a %b %d %Y"),
+                    }
+                    for expense in expenses
+                ],
+                "notFound": [
+                    message_id
+                    for message_id in dict.fromkeys(message_ids)
+                    if message_id not in deleted_message_ids
+                ],
+            },
+        )
+    except Exception as e:
+        return failure("ERROR", str(e))
@@ -1,6 +1,14 @@
-import json
-from expense_log_mcp.database import get_db
+from sqlalchemy import bindparam, select
+from expense_log_mcp.database import session_scope
 from expense_log_mcp.models import Expense
+from expense_log_mcp.responses import failure, success
+
+# Built once and reused, so each call only binds its parameters to the cached SQL.
+SELECT_EXPENSE = (
+    select(Expense)
+    .where(Expense.ledgerId == bindparam("ledger_id"), Expense.messageId == bindparam("message_id"))
+    .limit(1)
+)
 
 
 def get_expense(ledger_id: str, message_id: str) -> str:
@@ -8,39 +16,24 @@ def get_expense(ledger_id: str, message_id: str) -> str:
     Retrieves the details of a single expense.
     """
     try:
-        db = next(get_db())
+        with session_scope(readonly=True, ledger_id=ledger_id) as db:
+            expense = db.scalars(
+                SELECT_EXPENSE, {"ledger_id": ledger_id, "message_id": message_id}
+            ).first()
 
-        expense = db.query(Expense).filter_by(ledgerId=ledger_id, messageId=message_id).first()
+            if not expense:
+                return failure("NOT_FOUND", "Expense not found.")
 
-        if not expense:
-            return json.dumps(
+            return success(
+                "Expense retrieved successfully.",
                 {
-                    "success": False,
-                    "code": "NOT_FOUND",
-                    "message": "Expense not found.",
-                }
-            )
-
-        return json.dumps(
-            {
-                "success": True,
-                "code": "OK",
-                "message": "Expense retrieved successfully.",
-                "data": {
                     "id": expense.id,
                     "description": expense.description,
                     "amount": expense.amount,
                     "payer": expense.payer,
-                    "createdAt": expense.createdAt.isoformat(),
-                    "updatedAt": expense.updatedAt.isoformat(),
+                    "createdAt": expense.createdAt,
+                    "updatedAt": expense.updatedAt,
                 },
-            }
-        )
+            )
     except Exception as e:
-        return json.dumps(
-            {
-                "success": False,
-                "code": "ERROR",
-                "message": str(e),
-            }
-        )
+        return failure("ERROR", str(e))
@@ -1,6 +1,26 @@
-import json
-from expense_log_mcp.database import get_db
+import os
+from sqlalchemy import func
+from expense_log_mcp.cache import TTLCache
+from expense_log_mcp.database import session_scope
 from expense_log_mcp.models import ExpenseCategory
+from expense_log_mcp.responses import failure, success
+
+CACHE_KEY = "expense_categories"
+
+# Holds (fingerprint, serialized response), where the fingerprint is
+# (max(updated_at), count) of the expense_categories table.
+_cache = TTLCache(maxsize=1)
+
+
+def invalidate_expense_categories_cache() -> None:
+    """
+    Drops the cached expense categories, e.g. after the categories table was changed.
+    """
+    _cache.clear()
+
+
+def is_revalidation_enabled() -> bool:
+    return os.getenv("EXPENSE_CATEGORIES_CACHE_REVALIDATE", "true").lower() in ("1", "true", "yes")
 
 
 def get_expense_categories() -> str:
@@ -8,29 +28,43 @@ def get_expense_categories() -> str:
     Retrieves the list of all expense categories.
     """
     try:
-        db = next(get_db())
-
-        categories = db.query(ExpenseCategory).all()
-
-        return json.dumps(
-            {
-                "success": True,
-                "code": "OK",
-                "message": "Expense categories retrieved successfully.",
-                "data": [
-                    {
-                        "expenseCategoryId": category.id,
-                        "expenseCategoryName": category.name,
-                    }
-                    for category in categories
-                ],
-            }
+        ttl = float(os.getenv("EXPENSE_CATEGORIES_CACHE_TTL", "300"))
+        revalidate = is_revalidation_enabled()
+
+        cached = _cache.get(CACHE_KEY)
+        if cached is not None:
+            return cached[1]
+
+        with session_scope(readonly=True) as db:
+            stale = _cache.get(CACHE_KEY, allow_expired=True)
+            if stale is not None and revalidate:
+                fingerprint = tuple(
+                    db.query(
+                        func.max(ExpenseCategory.updatedAt), func.count(ExpenseCategory.id)
+                    ).one()
+                )
+                if fingerprint == stale[0]:
+                    _cache.set(CACHE_KEY, stale, ttl)
+                    return stale[1]
+
+            categories = db.query(ExpenseCategory).all()
+            fingerprint = (
+                max((c.updatedAt for c in categories if c.updatedAt is not None), default=None),
+                len(categories),
+            )
+
+        response = success(
+            "Expense categories retrieved successfully.",
+            [
+                {
+                    "expenseCategoryId": category.id,
+                    "expenseCategoryName": category.name,
+                }
+                for category in categories
+            ],
         )
+        if ttl > 0:
+            _cache.set(CACHE_KEY, (fingerprint, response), ttl)
+        return response
     except Exception as e:
-        return json.dumps(
-            {
-                "success": False,
-                "code": "ERROR",
-                "message": str(e),
-            }
-        )
+        return failure("ERROR", str(e))
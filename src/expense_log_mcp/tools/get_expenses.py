@@ -0,0 +1,70 @@
+import functools
+from typing import List
+from sqlalchemy import bindparam, select
+from expense_log_mcp.database import dialect_name, in_values, session_scope
+from expense_log_mcp.models import Expense
+from expense_log_mcp.responses import failure, success
+
+MAX_MESSAGE_IDS = 5000
+
+
+@functools.lru_cache(maxsize=None)
+def _select_statement(dialect: str):
+    # Answered from the (ledger_id, messageId) unique index, one probe per message ID.
+    return select(
+        Expense.id,
+        Expense.messageId,
+        Expense.description,
+        Expense.amount,
+        Expense.payer,
+        Expense.createdAt,
+        Expense.updatedAt,
+    ).where(
+        Expense.ledgerId == bindparam("ledger_id"),
+        in_values(Expense.messageId, "message_ids", dialect),
+    )
+
+
+def get_expenses(ledger_id: str, message_ids: List[str]) -> str:
+    """
+    Retrieves the details of the expenses of many messages in a ledger with a single query,
+    along with the message IDs that matched no expense.
+    """
+    try:
+        message_ids = list(dict.fromkeys(message_ids))
+        if len(message_ids) > MAX_MESSAGE_IDS:
+            return failure(
+                "INVALID_ARGUMENT",
+                f"At most {MAX_MESSAGE_IDS} expenses can be retrieved at once.",
+            )
+
+        found = {}
+        if message_ids:
+            with session_scope(readonly=True, ledger_id=ledger_id) as db:
+                rows = db.execute(
+                    _select_statement(dialect_name(db)),
+                    {"ledger_id": ledger_id, "message_ids": message_ids},
+                )
+                found = {row.messageId: row for row in rows}
+
+        return success(
+            "Expenses retrieved successfully.",
+            {
+                "expenses": [
+                    {
+                        "id": row.id,
+                        "messageId": row.messageId,
+                        "description": row.description,
+                        "amount": row.amount,
+                        "payer": row.payer,
+                        "createdAt": row.createdAt,
+                        "updatedAt": row.updatedAt,
+                    }
+                    for row in (found.get(message_id) for message_id in message_ids)
+                    if row is not None
+                ],
+                "notFound": [message_id for message_id in message_ids if message_id not in found],
+            },
+        )
+    except Exception as e:
+        return failure("ERROR", str(e))
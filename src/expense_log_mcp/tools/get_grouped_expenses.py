@@ -1,9 +1,224 @@
-import json
+import functools
+import itertools
+import os
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
-from typing import List, Optional
-from expense_log_mcp.database import get_db
-from expense_log_mcp.models import Expense
+from decimal import Decimal
+from typing import List, Literal, Optional
+from sqlalchemy import bindparam, func, select, union_all
+from expense_log_mcp.cache import TTLCache
+from expense_log_mcp.database import dialect_name, in_values, session_scope
+from expense_log_mcp.ledger_versions import get_ledger_version
+from expense_log_mcp.models import (
+    BUCKET_UNITS,
+    Expense,
+    ExpenseCategory,
+    ExpenseDailyRollup,
+    local_bucket,
+    to_amount,
+)
+from expense_log_mcp.responses import failure, success
+from expense_log_mcp.rollups import (
+    full_day_range,
+    get_rollup_offset_hours,
+    is_rollup_enabled,
+    local_midnight,
+    to_utc,
+)
+
+_cache: Optional[TTLCache] = None
+
+
+def get_grouped_expenses_cache() -> Optional[TTLCache]:
+    """
+    Returns the cache of grouped expense responses, holding up to
+    `GROUPED_EXPENSES_CACHE_SIZE` entries (default: 1024), or `None` if that is 0.
+    """
+    global _cache
+    size = int(os.getenv("GROUPED_EXPENSES_CACHE_SIZE", "1024"))
+    if size <= 0:
+        return None
+    if _cache is None or _cache.maxsize != size:
+        _cache = TTLCache(maxsize=size)
+    return _cache
+
+
+def invalidate_grouped_expenses_cache() -> None:
+    """
+    Drops the cached grouped expenses, e.g. after expenses were changed outside the tools.
+    """
+    if _cache is not None:
+        _cache.clear()
+
+
+def _cache_key(ledger_id, version, category_ids, payer_name, start, end, bucket, tz_hours):
+    """
+    Returns the cache key of a call, normalized so that calls asking for the same
+    expenses share it: categories in any order, and dates given in any timezone.
+    The ledger version changes with every write, so stale entries are never hit.
+    """
+    return (
+        ledger_id,
+        version,
+        tuple(sorted(set(category_ids))) if category_ids else None,
+        payer_name or None,
+        to_utc(start) if start is not None else None,
+        to_utc(end) if end is not None else None,
+        # Without buckets the totals only depend on the UTC range, not the caller's timezone.
+        (bucket, tz_hours) if bucket is not None else None,
+    )
+
+
+def _bucket_columns(bucket, column, local=False):
+    """
+    Returns the bucket column for a `(unit, offset_hours)` bucket, or none without one.
+    Rollup days are already local days, so `local` columns are bucketed without an offset.
+    """
+    if bucket is None:
+        return []
+    unit, offset_hours = bucket
+    return [local_bucket(unit, column, 0 if local else offset_hours).label("bucket")]
+
+
+def _sum_expenses(dialect, filters, bucket, start_key, end_key, end_exclusive=False):
+    has_categories, has_payer = filters
+    buckets = _bucket_columns(bucket, Expense.createdAt)
+    stmt = (
+        select(
+            *buckets,
+            Expense.payer.label("payer"),
+            ExpenseCategory.name.label("category_name"),
+            func.sum(Expense.amount).label("amount"),
+            func.count(Expense.id).label("expense_count"),
+        )
+        .join(ExpenseCategory, Expense.categoryId == ExpenseCategory.id)
+        .where(Expense.ledgerId == bindparam("ledger_id"))
+    )
+    if has_categories:
+        stmt = stmt.where(in_values(Expense.categoryId, "category_ids", dialect))
+    if has_payer:
+        stmt = stmt.where(Expense.payer == bindparam("payer_name"))
+    if start_key is not None:
+        stmt = stmt.where(Expense.createdAt >= bindparam(start_key))
+    if end_key is not None:
+        if end_exclusive:
+            stmt = stmt.where(Expense.createdAt < bindparam(end_key))
+        else:
+            stmt = stmt.where(Expense.createdAt <= bindparam(end_key))
+    return stmt.group_by(*buckets, Expense.payer, ExpenseCategory.name)
+
+
+def _sum_rollups(dialect, filters, bucket, has_first_day, has_last_day):
+    has_categories, has_payer = filters
+    buckets = _bucket_columns(bucket, ExpenseDailyRollup.localDay, local=True)
+    stmt = (
+        select(
+            *buckets,
+            ExpenseDailyRollup.payer.label("payer"),
+            ExpenseCategory.name.label("category_name"),
+            func.sum(ExpenseDailyRollup.totalAmount).label("amount"),
+            func.sum(ExpenseDailyRollup.expenseCount).label("expense_count"),
+        )
+        .join(ExpenseCategory, ExpenseDailyRollup.categoryId == ExpenseCategory.id)
+        .where(ExpenseDailyRollup.ledgerId == bindparam("ledger_id"))
+    )
+    if has_categories:
+        stmt = stmt.where(in_values(ExpenseDailyRollup.categoryId, "category_ids", dialect))
+    if has_payer:
+        stmt = stmt.where(ExpenseDailyRollup.payer == bindparam("payer_name"))
+    if has_first_day:
+        stmt = stmt.where(ExpenseDailyRollup.localDay >= bindparam("first_day"))
+    if has_last_day:
+        stmt = stmt.where(ExpenseDailyRollup.localDay <= bindparam("last_day"))
+    return stmt.group_by(*buckets, ExpenseDailyRollup.payer, ExpenseCategory.name)
+
+
+@functools.lru_cache(maxsize=None)
+def _grouped_statement(
+    dialect, filters, bucket, has_start, has_end, use_rollup, has_head, has_tail
+):
+    """
+    Builds one statement summing whole days from the daily rollup and the partial days
+    at the edges of the range from raw expenses, per time bucket if one is given.
+    Statements are cached per shape, with every value left as a bound parameter.
+    """
+    start_key = "start" if has_start else None
+    end_key = "end" if has_end else None
+    if not use_rollup:
+        parts = [_sum_expenses(dialect, filters, bucket, start_key, end_key)]
+    else:
+        parts = [_sum_rollups(dialect, filters, bucket, has_start, has_end)]
+        if has_head:
+            parts.append(
+                _sum_expenses(dialect, filters, bucket, "start", "head_end", end_exclusive=True)
+            )
+        if has_tail:
+            parts.append(_sum_expenses(dialect, filters, bucket, "tail_start", "end"))
+
+    sums = union_all(*parts).subquery() if len(parts) > 1 else parts[0].subquery()
+    keys = ([sums.c.bucket] if bucket is not None else []) + [sums.c.payer, sums.c.category_name]
+    return (
+        select(*keys, func.sum(sums.c.amount), func.sum(sums.c.expense_count))
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+
+
+def _grouped_query(dialect, ledger_id, category_ids, payer_name, start, end, bucket, tz_hours):
+    """
+    Returns the cached statement for the filters given and the parameters to run it with.
+    """
+    params = {
+        "ledger_id": ledger_id,
+        "category_ids": list(category_ids or ()),
+        "payer_name": payer_name,
+        "start": to_utc(start) if start is not None else None,
+        "end": to_utc(end) if end is not None else None,
+    }
+    offset_hours = get_rollup_offset_hours()
+    # Rollup days only line up with the caller's buckets in the rollup's own timezone.
+    use_rollup = is_rollup_enabled() and (bucket is None or tz_hours == offset_hours)
+    days = full_day_range(start, end, offset_hours) if use_rollup else None
+
+    has_head = has_tail = False
+    if days is not None:
+        first_day, last_day = days
+        params["first_day"], params["last_day"] = first_day, last_day
+        if start is not None and start < local_midnight(first_day, offset_hours):
+            has_head = True
+            params["head_end"] = to_utc(local_midnight(first_day, offset_hours))
+        if end is not None:
+            tail_start = local_midnight(last_day + timedelta(days=1), offset_hours)
+            if tail_start <= end:
+                has_tail = True
+                params["tail_start"] = to_utc(tail_start)
+
+    stmt = _grouped_statement(
+        dialect,
+        (bool(category_ids), bool(payer_name)),
+        (bucket, tz_hours) if bucket is not None else None,
+        start is not None,
+        end is not None,
+        days is not None,
+        has_head,
+        has_tail,
+    )
+    return stmt, params
+
+
+def _group_rows(rows) -> dict:
+    grouped_expenses = {}
+
+    # Sums stay exact decimals; they only become JSON numbers when the response is encoded.
+    for payer, category_name, amount, expense_count in rows:
+        if not expense_count:
+            continue
+        amount = to_amount(amount)
+        group = grouped_expenses.setdefault(
+            payer, {"expense_categories": {}, "total_amount": Decimal(0)}
+        )
+        group["expense_categories"][category_name] = amount
+        group["total_amount"] = to_amount(group["total_amount"] + amount)
+    return grouped_expenses
 
 
 def get_grouped_expenses(
@@ -13,6 +228,7 @@ def get_grouped_expenses(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     timezone_offset_hours: int = 8,
+    bucket: Optional[Literal["day", "week", "month"]] = None,
 ) -> str:
     """
     Retrieves and groups expenses by payer name and then by category name,
@@ -21,53 +237,61 @@ def get_grouped_expenses(
     The `start_date` and `end_date` should be ISO 8601 strings, always in UTC.
     The timezone for these dates can be adjusted using the `timezone_offset_hours`
     parameter, which is an integer representing the UTC offset in hours.
+    With `bucket` set to "day", "week" (starting Monday) or "month", the groups are
+    returned as a series with one entry per local day, week or month that has expenses.
     """
     try:
-        db = next(get_db())
-        query = db.query(Expense).filter(Expense.ledgerId == ledger_id)
-
-        if category_ids:
-            query = query.filter(Expense.categoryId.in_(category_ids))
-        if payer_name:
-            query = query.filter(Expense.payer == payer_name)
-        if start_date:
-            query = query.filter(
-                Expense.createdAt
-                >= datetime.fromisoformat(start_date).replace(
-                    tzinfo=timezone(timedelta(hours=timezone_offset_hours))
-                )
-            )
-        if end_date:
-            query = query.filter(
-                Expense.createdAt
-                <= datetime.fromisoformat(end_date).replace(
-                    tzinfo=timezone(timedelta(hours=timezone_offset_hours))
+        if bucket is not None and bucket not in BUCKET_UNITS:
+            return failure("INVALID_ARGUMENT", f"bucket must be one of {', '.join(BUCKET_UNITS)}.")
+
+        tz = timezone(timedelta(hours=timezone_offset_hours))
+        start = datetime.fromisoformat(start_date).replace(tzinfo=tz) if start_date else None
+        end = datetime.fromisoformat(end_date).replace(tzinfo=tz) if end_date else None
+
+        cache = get_grouped_expenses_cache()
+        with session_scope(readonly=True, ledger_id=ledger_id) as db:
+            # One primary key lookup decides whether the cached response is still current.
+            version = get_ledger_version(db, ledger_id) if cache is not None else None
+            if version is not None:
+                key = _cache_key(
+                    ledger_id,
+                    version,
+                    category_ids,
+                    payer_name,
+                    start,
+                    end,
+                    bucket,
+                    timezone_offset_hours,
                 )
-            )
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
 
-        expenses = query.order_by(Expense.payer).all()
-        grouped_expenses = defaultdict(
-            lambda: {"expense_categories": defaultdict(float), "total_amount": 0.0}
-        )
+            stmt, params = _grouped_query(
+                dialect_name(db),
+                ledger_id,
+                category_ids,
+                payer_name,
+                start,
+                end,
+                bucket,
+                timezone_offset_hours,
+            )
+            rows = db.execute(stmt, params).all()
 
-        for expense in expenses:
-            amount = expense.amount
-            grouped_expenses[expense.payer]["expense_categories"][expense.category.name] += amount
-            grouped_expenses[expense.payer]["total_amount"] += amount
-
-        return json.dumps(
-            {
-                "success": True,
-                "code": "OK",
-                "message": "Grouped expenses retrieved successfully.",
-                "data": grouped_expenses,
-            }
-        )
+        if bucket is None:
+            response = success("Grouped expenses retrieved successfully.", _group_rows(rows))
+        else:
+            series = [
+                {"start": bucket_start, "groups": groups}
+                for bucket_start, bucket_rows in itertools.groupby(rows, key=lambda row: row[0])
+                if (groups := _group_rows(row[1:] for row in bucket_rows))
+            ]
+            response = success(
+                "Grouped expenses retrieved successfully.", {"bucket": bucket, "series": series}
+            )
+        if version is not None:
+            cache.set(key, response)
+        return response
     except Exception as e:
-        return json.dumps(
-            {
-                "success": False,
-                "code": "ERROR",
-                "message": str(e),
-            }
-        )
+        return failure("ERROR", str(e))
@@ -0,0 +1,153 @@
+import base64
+import functools
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import bindparam, select, tuple_
+from expense_log_mcp.database import dialect_name, in_values, session_scope
+from expense_log_mcp.models import Expense, ExpenseCategory
+from expense_log_mcp.responses import failure, success
+from expense_log_mcp.rollups import to_utc
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(created_at: datetime, expense_id: str) -> str:
+    """
+    Encodes the (created_at, id) key of the last expense on a page as an opaque cursor.
+    """
+    key = json.dumps([created_at.isoformat(), expense_id])
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    """
+    Decodes a cursor from `encode_cursor`, raising ValueError if it is malformed.
+    """
+    try:
+        created_at, expense_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), str(expense_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor.") from e
+
+
+@functools.lru_cache(maxsize=None)
+def _list_statement(dialect, has_categories, has_payer, has_start, has_end, has_after):
+    """
+    Builds the page query for one combination of filters, with every value left as a
+    bound parameter so the statement is built and compiled once per shape.
+    """
+    stmt = (
+        select(
+            Expense.id,
+            Expense.messageId,
+            Expense.categoryId,
+            ExpenseCategory.name,
+            Expense.description,
+            Expense.amount,
+            Expense.payer,
+            Expense.createdAt,
+        )
+        .outerjoin(ExpenseCategory, Expense.categoryId == ExpenseCategory.id)
+        .where(Expense.ledgerId == bindparam("ledger_id"))
+    )
+    if has_categories:
+        stmt = stmt.where(in_values(Expense.categoryId, "category_ids", dialect))
+    if has_payer:
+        stmt = stmt.where(Expense.payer == bindparam("payer_name"))
+    if has_start:
+        stmt = stmt.where(Expense.createdAt >= bindparam("start"))
+    if has_end:
+        stmt = stmt.where(Expense.createdAt <= bindparam("end"))
+    if has_after:
+        after = tuple_(
+            bindparam("after_created_at", type_=Expense.createdAt.type),
+            bindparam("after_id", type_=Expense.id.type),
+        )
+        stmt = stmt.where(tuple_(Expense.createdAt, Expense.id) > after)
+    return stmt.order_by(Expense.createdAt, Expense.id).limit(bindparam("limit"))
+
+
+def list_expenses(
+    ledger_id: str,
+    category_ids: Optional[List[str]] = None,
+    payer_name: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    timezone_offset_hours: int = 8,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> str:
+    """
+    Lists the expenses of a ledger oldest first, one page at a time,
+    with optional filters for category IDs, payer name, and a date range.
+    The `start_date` and `end_date` should be ISO 8601 strings, always in UTC.
+    The timezone for these dates can be adjusted using the `timezone_offset_hours`
+    parameter, which is an integer representing the UTC offset in hours.
+    Pass the `nextCursor` of a page as `cursor` to fetch the following page.
+    """
+    try:
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            return failure("INVALID_ARGUMENT", f"page_size must be between 1 and {MAX_PAGE_SIZE}.")
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return failure("INVALID_ARGUMENT", str(e))
+
+        tz = timezone(timedelta(hours=timezone_offset_hours))
+        start = datetime.fromisoformat(start_date).replace(tzinfo=tz) if start_date else None
+        end = datetime.fromisoformat(end_date).replace(tzinfo=tz) if end_date else None
+
+        params = {
+            "ledger_id": ledger_id,
+            "category_ids": list(category_ids or ()),
+            "payer_name": payer_name,
+            "start": to_utc(start) if start is not None else None,
+            "end": to_utc(end) if end is not None else None,
+            "after_created_at": after[0] if after is not None else None,
+            "after_id": after[1] if after is not None else None,
+            # One extra row tells whether another page follows.
+            "limit": page_size + 1,
+        }
+
+        expenses = []
+        last = next_cursor = None
+        with session_scope(readonly=True, ledger_id=ledger_id) as db:
+            stmt = _list_statement(
+                dialect_name(db),
+                bool(category_ids),
+                bool(payer_name),
+                start is not None,
+                end is not None,
+                after is not None,
+            )
+            # Rows are streamed with yield_per, so only one page is ever held in memory.
+            rows = db.execute(stmt, params, execution_options={"yield_per": page_size + 1})
+            for row in rows:
+                if len(expenses) == page_size:
+                    next_cursor = encode_cursor(last.createdAt, last.id)
+                    break
+                last = row
+                expenses.append(
+                    {
+                        "id": row.id,
+                        "messageId": row.messageId,
+                        "categoryId": row.categoryId,
+                        "categoryName": row.name,
+                        "description": row.description,
+                        "amount": row.amount,
+                        "payer": row.payer,
+                        "createdAt": row.createdAt,
+                    }
+                )
+
+        return success(
+            "Expenses listed successfully.",
+            {
+                "expenses": expenses,
+                "nextCursor": next_cursor,
+            },
+        )
+    except Exception as e:
+        return failure("ERROR", str(e))
@@ -0,0 +1,48 @@
+import os
+from expense_log_mcp import database
+
+# A ledger that never exists, so warming up reads nothing and writes nothing.
+WARM_UP_LEDGER_ID = "__warm_up__"
+
+
+def is_warm_up_enabled() -> bool:
+    return os.getenv("WARM_UP", "false").lower() in ("1", "true", "yes")
+
+
+def warm_up(connections: int = None) -> None:
+    """
+    Pays the first-request costs before serving: opens `connections` pool connections
+    (default: `DATABASE_POOL_SIZE` or 5) to the primary, or to the readers of an embedded
+    SQLite database, and to each read replica, configures the ORM mappers, and runs the
+    read tools once so their SQL is compiled and cached.
+    """
+    from sqlalchemy.orm import configure_mappers
+    from expense_log_mcp.tools import (
+        get_expense,
+        get_expense_categories,
+        get_expenses,
+        get_grouped_expenses,
+        list_expenses,
+    )
+
+    if connections is None:
+        connections = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+    writer = database.get_engine()
+    engines = [writer] + [engine for engine in (database.reader_engine,) if engine is not None]
+    engines += [replica.engine for replica in database.get_read_replicas()]
+    for engine in engines:
+        # The single writer of an embedded SQLite database has just one connection.
+        count = 1 if engine is writer and database.reader_engine is not None else connections
+        opened = [engine.connect() for _ in range(count)]
+        for connection in opened:
+            connection.close()
+
+    configure_mappers()
+    get_expense(WARM_UP_LEDGER_ID, WARM_UP_LEDGER_ID)
+    get_expenses(WARM_UP_LEDGER_ID, [WARM_UP_LEDGER_ID])
+    get_expense_categories()
+    get_grouped_expenses(WARM_UP_LEDGER_ID)
+    get_grouped_expenses(
+        WARM_UP_LEDGER_ID, start_date="2000-01-01T00:00:00", end_date="2000-01-31T12:00:00"
+    )
+    list_expenses(WARM_UP_LEDGER_ID)
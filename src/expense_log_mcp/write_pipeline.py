@@ -0,0 +1,138 @@
+import asyncio
+import contextvars
+import functools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+from expense_log_mcp.call_stats import CallStats, current_call
+
+
+def is_write_pipeline_enabled() -> bool:
+    return os.getenv("WRITE_PIPELINE_ENABLED", "false").lower() in ("1", "true", "yes")
+
+
+def get_write_pipeline_options() -> dict:
+    """
+    Returns the batch size and wait configured through `WRITE_PIPELINE_MAX_BATCH_SIZE`
+    (default: 100) and `WRITE_PIPELINE_MAX_WAIT_MS` (default: 5).
+    """
+    return {
+        "max_batch_size": int(os.getenv("WRITE_PIPELINE_MAX_BATCH_SIZE", "100")),
+        "max_wait": float(os.getenv("WRITE_PIPELINE_MAX_WAIT_MS", "5")) / 1000,
+    }
+
+
+class WritePipeline:
+    """
+    Coalesces concurrent writes into batches.
+
+    Items submitted from any thread are queued; a background thread takes the first
+    one, keeps collecting for up to `max_wait` seconds or `max_batch_size` items, and
+    hands the batch to `flush`, which returns one result per item. Each submitter's
+    future resolves with its own result, so many small transactions become one. The SQL
+    a batch runs is recorded in the tool call metrics of every call that waited for it.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 100,
+        max_wait: float = 0.005,
+    ):
+        self.flush = flush
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        # A forked child inherits neither the parent's flusher thread nor its queue.
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queues `item` for the next batch and returns a future of its result.
+        """
+        future = Future()
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="write-pipeline", daemon=True
+                    )
+                    self._thread.start()
+        self._queue.put((item, future, current_call.get()))
+        return future
+
+    def _next_batch(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            batch_stats = CallStats()
+            token = current_call.set(batch_stats)
+            try:
+                results, error = self.flush([item for item, _, _ in batch]), None
+            except Exception as e:
+                results, error = None, e
+            finally:
+                current_call.reset(token)
+            # Charge the batch to its callers before they are woken up to report it.
+            for _, _, stats in batch:
+                if stats is not None:
+                    stats.add(batch_stats)
+            if error is not None:
+                for _, future, _ in batch:
+                    future.set_exception(error)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _reset_executor() -> None:
+    global _executor
+    _executor = None
+
+
+os.register_at_fork(after_in_child=_reset_executor)
+
+
+def pipelined_tool(tool):
+    """
+    Wraps a synchronous tool that writes through a `WritePipeline` into an `async def`
+    tool run on a thread pool, so the event loop keeps accepting the concurrent calls
+    whose writes can join the same batch.
+    """
+
+    @functools.wraps(tool)
+    async def wrapper(*args, **kwargs):
+        global _executor
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_write_pipeline_options()["max_batch_size"],
+                thread_name_prefix="pipelined-tool",
+            )
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, tool, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(_executor, call)
+
+    return wrapper
@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import pytest
+from unittest.mock import patch
+
+from expense_log_mcp.auth import BearerTokenVerifier
+
+
+def write_tokens(path, tokens, mtime=None):
+    path.write_text(json.dumps({"tokens": tokens}))
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def verify(verifier, token):
+    return asyncio.run(verifier.verify_token(token))
+
+
+@pytest.fixture
+def tokens_file(tmp_path):
+    """Fixture to create a tokens file with two agents."""
+    path = tmp_path / "tokens.json"
+    write_tokens(
+        path,
+        [
+            {"token": "token-a", "client_id": "agent-a", "scopes": ["read"]},
+            {
+                "token_sha256": hashlib.sha256(b"token-b").hexdigest(),
+                "client_id": "agent-b",
+            },
+        ],
+        mtime=1000,
+    )
+    return path
+
+
+def test_verify_static_token():
+    """
+    Tests that the static token is accepted with read and write scopes.
+    """
+    verifier = BearerTokenVerifier(client_id="expense-log-agent", token="secret")
+
+    access_token = verify(verifier, "secret")
+
+    assert access_token.client_id == "expense-log-agent"
+    assert access_token.scopes == ["read", "write"]
+    assert verify(verifier, "wrong") is None
+
+
+def test_verify_tokens_file(tokens_file):
+    """
+    Tests that each token in the tokens file maps to its own client and scopes.
+    """
+    verifier = BearerTokenVerifier(client_id="default", token="secret", tokens_file=tokens_file)
+
+    assert verify(verifier, "token-a").client_id == "agent-a"
+    assert verify(verifier, "token-a").scopes == ["read"]
+    assert verify(verifier, "token-b").client_id == "agent-b"
+    assert verify(verifier, "token-b").scopes == ["read", "write"]
+    assert verify(verifier, "secret").client_id == "default"
+    assert verify(verifier, "token-c") is None
+
+
+def test_expired_token_rejected(tmp_path):
+    """
+    Tests that a token past its expiry is rejected, even if it was cached.
+    """
+    path = tmp_path / "tokens.json"
+    write_tokens(path, [{"token": "token-a", "expires_at": int(time.time()) + 60}])
+    verifier = BearerTokenVerifier(client_id="default", tokens_file=path)
+
+    assert verify(verifier, "token-a") is not None
+    later = time.time() + 120
+    with patch("expense_log_mcp.auth.bearer_token_verifier.time.time", return_value=later):
+        assert verify(verifier, "token-a") is None
+
+
+def test_verified_tokens_are_cached():
+    """
+    Tests that repeated verifications of a token return the cached access token.
+    """
+    verifier = BearerTokenVerifier(client_id="expense-log-agent", token="secret")
+
+    assert verify(verifier, "secret") is verify(verifier, "secret")
+
+
+def test_tokens_file_hot_reload(tokens_file):
+    """
+    Tests that a rewritten tokens file is picked up without a restart and revokes
+    removed tokens, including cached ones.
+    """
+    verifier = BearerTokenVerifier(client_id="default", tokens_file=tokens_file, reload_interval=0)
+    assert verify(verifier, "token-a") is not None
+
+    write_tokens(tokens_file, [{"token": "token-c", "client_id": "agent-c"}], mtime=2000)
+
+    assert verify(verifier, "token-a") is None
+    assert verify(verifier, "token-c").client_id == "agent-c"
+
+
+def test_tokens_file_checked_at_reload_interval(tokens_file):
+    """
+    Tests that the tokens file is not checked again before the reload interval passes.
+    """
+    verifier = BearerTokenVerifier(client_id="default", tokens_file=tokens_file)
+
+    write_tokens(tokens_file, [], mtime=2000)
+
+    assert verify(verifier, "token-a") is not None
+    verifier.reload()
+    assert verify(verifier, "token-a") is None
+
+
+def test_half_written_tokens_file_keeps_previous_tokens(tokens_file):
+    """
+    Tests that a tokens file that fails to load keeps the previous tokens in use and is
+    loaded once it is complete, even if its modification time does not change again.
+    """
+    verifier = BearerTokenVerifier(client_id="default", tokens_file=tokens_file, reload_interval=0)
+
+    tokens_file.write_text('{"tokens": [{"token": "tok')
+    os.utime(tokens_file, (2000, 2000))
+
+    assert verify(verifier, "token-a").client_id == "agent-a"
+    assert verify(verifier, "token-c") is None
+
+    write_tokens(tokens_file, [{"token": "token-c", "client_id": "agent-c"}], mtime=2000)
+
+    assert verify(verifier, "token-a") is None
+    assert verify(verifier, "token-c").client_id == "agent-c"
@@ -0,0 +1,82 @@
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from expense_log_mcp import database
+from expense_log_mcp.models import Base, ExpenseCategory, Ledger
+from expense_log_mcp.sqlite import init_db
+from expense_log_mcp.tools.get_expense_categories import invalidate_expense_categories_cache
+from expense_log_mcp.tools.get_grouped_expenses import invalidate_grouped_expenses_cache
+
+
+def database_url(backend: str, tmp_path) -> str:
+    """
+    Returns the URL of a new SQLite file, or of the local PostgreSQL in
+    `TEST_DATABASE_URL`, skipping the test when there is none.
+    """
+    if backend == "sqlite":
+        return f"sqlite:///{tmp_path / 'test.db'}"
+    if not os.getenv("TEST_DATABASE_URL"):
+        pytest.skip("requires a local PostgreSQL in TEST_DATABASE_URL")
+    return os.getenv("TEST_DATABASE_URL")
+
+
+def create_database(url: str):
+    """
+    Creates the schema at `url`, dropping any left over, with the ledger `test-ledger`
+    and the categories `category-0` to `category-2`. Returns an engine for it.
+    """
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    init_db(engine)
+    with Session(engine) as session, session.begin():
+        session.add(Ledger(id="test-ledger", name="Test"))
+        session.add_all(
+            [ExpenseCategory(id=f"category-{i}", name=f"Category {i}") for i in range(3)]
+        )
+    return engine
+
+
+def use_database(monkeypatch, url: str) -> None:
+    """
+    Points the tools at `url` through new engines, with empty result caches.
+    """
+    dispose_engines()
+    monkeypatch.setenv("DATABASE_URL", url)
+    monkeypatch.setattr(database, "engine", None)
+    monkeypatch.setattr(database, "reader_engine", None)
+    invalidate_expense_categories_cache()
+    invalidate_grouped_expenses_cache()
+
+
+def dispose_engines() -> None:
+    """
+    Closes the connections of the writer and reader engines the tools created.
+    """
+    for engine in (database.engine, database.reader_engine):
+        if engine is not None:
+            engine.dispose()
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def expenses_db(request, monkeypatch, tmp_path):
+    """Fixture to point the tools at a new SQLite and local PostgreSQL database in turn."""
+    url = database_url(request.param, tmp_path)
+    engine = create_database(url)
+    use_database(monkeypatch, url)
+    yield engine
+    dispose_engines()
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_db(monkeypatch, tmp_path):
+    """Fixture to point the tools at a new SQLite database."""
+    url = database_url("sqlite", tmp_path)
+    engine = create_database(url)
+    use_database(monkeypatch, url)
+    yield engine
+    dispose_engines()
+    engine.dispose()
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARKS = Path(__file__).resolve().parent.parent / "benchmarks"
+
+
+def test_grouped_expenses_benchmark_runs(tmp_path):
+    """
+    Tests that the get_grouped_expenses benchmark still runs against the current models.
+    """
+    script = BENCHMARKS / "bench_get_grouped_expenses.py"
+    result = subprocess.run(
+        [sys.executable, str(script), "--rows", "50", "--repeat", "1"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines()[-1].split()[0] == "50"
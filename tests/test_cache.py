@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from expense_log_mcp.cache import TTLCache
+
+
+def test_ttl_cache_expires_entries():
+    """
+    Tests that entries expire after their TTL but can still be read as stale.
+    """
+    cache = TTLCache()
+    with patch("expense_log_mcp.cache.time.monotonic", return_value=100.0):
+        cache.set("key", "value", ttl=10)
+    with patch("expense_log_mcp.cache.time.monotonic", return_value=105.0):
+        assert cache.get("key") == "value"
+    with patch("expense_log_mcp.cache.time.monotonic", return_value=111.0):
+        assert cache.get("key") is None
+        assert cache.get("key", allow_expired=True) == "value"
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """
+    Tests that the least recently used entry is evicted when the cache is full.
+    """
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_counts_hits_misses_and_evictions():
+    """
+    Tests that the cache statistics count lookups and evicted entries.
+    """
+    cache = TTLCache(maxsize=1)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.set("b", 2)
+
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 1}
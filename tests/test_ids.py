@@ -0,0 +1,67 @@
+import pytest
+import time
+import uuid
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from expense_log_mcp import ids
+from expense_log_mcp.models import Base, ExpenseCategory, Ledger
+
+
+@pytest.fixture(autouse=True)
+def reset_id_strategy():
+    """Fixture to make every test choose the ID strategy afresh."""
+    ids.reset_id_strategy()
+    yield
+    ids.reset_id_strategy()
+
+
+def test_uuid7_is_time_ordered():
+    """
+    Tests that UUIDv7 IDs carry the current time, the version and variant bits, and
+    sort in the order they were generated.
+    """
+    before = time.time_ns() // 1_000_000
+    generated = [ids.uuid7() for _ in range(10000)]
+    after = time.time_ns() // 1_000_000
+
+    assert generated == sorted(generated)
+    assert len(set(generated)) == len(generated)
+    first = uuid.UUID(generated[0])
+    assert first.version == 7
+    assert first.variant == uuid.RFC_4122
+    assert before <= first.int >> 80 <= after
+
+
+@pytest.mark.parametrize("strategy", sorted(ids.ID_STRATEGIES))
+def test_models_default_to_the_id_strategy(monkeypatch, tmp_path, strategy):
+    """
+    Tests that rows inserted without an ID get one from `ID_STRATEGY`, next to existing IDs.
+    """
+    monkeypatch.setenv("ID_STRATEGY", strategy)
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session, session.begin():
+        session.add_all([Ledger(id="existing-cuid", name="Old"), Ledger(name="New")])
+        session.add(ExpenseCategory(name="Food"))
+
+    with Session(engine) as session:
+        ledger_ids = sorted(ledger.id for ledger in session.query(Ledger))
+        category = session.query(ExpenseCategory).one()
+    engine.dispose()
+
+    assert "existing-cuid" in ledger_ids and len(ledger_ids) == 2
+    if strategy == "uuid7":
+        assert uuid.UUID(category.id).version == 7
+    else:
+        assert len(category.id) == 24
+
+
+def test_unknown_id_strategy_is_rejected(monkeypatch):
+    """
+    Tests that a misspelled `ID_STRATEGY` fails loudly instead of falling back.
+    """
+    monkeypatch.setenv("ID_STRATEGY", "ulid")
+
+    with pytest.raises(ValueError, match="ulid"):
+        ids.new_id()
@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+import sys
+from unittest.mock import patch
+from starlette.testclient import TestClient
+
+from expense_log_mcp.main import auth, create_app, main, mcp
+
+
+def test_all_tools_registered():
+    """
+    Tests that every tool is registered and its input schema can be generated.
+    """
+    tools = asyncio.run(mcp.get_tools())
+
+    assert sorted(tools) == [
+        "add_expense",
+        "add_expenses",
+        "delete_expense",
+        "delete_expenses",
+        "get_expense",
+        "get_expense_categories",
+        "get_expenses",
+        "get_grouped_expenses",
+        "list_expenses",
+    ]
+    assert tools["add_expenses"].parameters["properties"]["expenses"]["type"] == "array"
+
+
+@pytest.mark.parametrize(
+    "workers, setting, stateless_http",
+    [
+        ("1", "", None),
+        ("4", "", True),
+        ("1", "true", True),
+        ("1", "1", True),
+        ("4", "false", False),
+    ],
+)
+def test_create_app_is_stateless_with_many_workers(monkeypatch, workers, setting, stateless_http):
+    """
+    Tests that the app drops in-memory MCP sessions when requests are spread over workers
+    or `STATELESS_HTTP` says so, e.g. for workers started by gunicorn.
+    """
+    monkeypatch.setenv("WORKERS", workers)
+    monkeypatch.setenv("STATELESS_HTTP", setting)
+    with patch.object(mcp, "http_app") as mock_http_app:
+        create_app()
+
+    mock_http_app.assert_called_once_with(stateless_http=stateless_http)
+
+
+def test_main_leaves_host_to_fastmcp_settings(monkeypatch):
+    """
+    Tests that without `--host` the server binds to FastMCP's configured host.
+    """
+    monkeypatch.setattr(sys, "argv", ["expense-log-mcp"])
+    monkeypatch.setenv("WORKERS", "1")
+    monkeypatch.delenv("STATELESS_HTTP", raising=False)
+    with patch.object(mcp, "run") as mock_run:
+        main()
+
+    assert mock_run.call_args.kwargs["host"] is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Fixture to serve the HTTP app with `secret` as the only bearer token."""
+    monkeypatch.setattr(auth, "token", "secret")
+    monkeypatch.setattr(auth, "tokens_file", None)
+    auth.reload()
+    yield TestClient(mcp.http_app())
+    monkeypatch.undo()
+    auth.reload()
+
+
+@pytest.mark.parametrize("path", ["/pool-stats", "/cache-stats", "/metrics"])
+def test_stats_routes_require_a_bearer_token(client, path):
+    """
+    Tests that the stats routes answer only requests carrying a valid bearer token.
+    """
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer secret"}).status_code == 200
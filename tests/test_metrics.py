@@ -0,0 +1,145 @@
+import asyncio
+import json
+import pytest
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from sqlalchemy import select
+
+from expense_log_mcp import database, metrics
+from expense_log_mcp.call_stats import CallStats, current_call
+from expense_log_mcp.main import mcp
+from expense_log_mcp.models import ExpenseCategory
+from expense_log_mcp.tools.get_expense_categories import invalidate_expense_categories_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """Fixture to start every test with empty metrics."""
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+async def call_tool(name, arguments):
+    async with Client(mcp) as client:
+        result = await client.call_tool(name, arguments)
+    return json.loads(result.content[0].text)
+
+
+def test_histogram_renders_cumulative_buckets():
+    """
+    Tests that histograms render cumulative buckets, sum and count per label set.
+    """
+    histogram = metrics.Histogram("test_seconds", "Test.", ("tool",), (0.1, 1.0))
+    histogram.observe(("a",), 0.05)
+    histogram.observe(("a",), 0.5)
+    histogram.observe(("a",), 5)
+
+    assert histogram.render() == [
+        "# HELP test_seconds Test.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{tool="a",le="0.1"} 1',
+        'test_seconds_bucket{tool="a",le="1"} 2',
+        'test_seconds_bucket{tool="a",le="+Inf"} 3',
+        'test_seconds_sum{tool="a"} 5.55',
+        'test_seconds_count{tool="a"} 3',
+    ]
+
+
+def test_tool_calls_are_recorded(sqlite_db):
+    """
+    Tests that a tool call records its response code, durations and query count.
+    """
+    result = asyncio.run(
+        call_tool("get_expense", {"ledger_id": "test-ledger", "message_id": "missing"})
+    )
+    assert result["code"] == "NOT_FOUND"
+
+    output = metrics.render_metrics(database.get_pool_stats())
+
+    assert 'expense_log_tool_calls_total{tool="get_expense",code="NOT_FOUND"} 1' in output
+    assert 'expense_log_tool_queries_bucket{tool="get_expense",le="1"} 1' in output
+    assert 'expense_log_tool_queries_bucket{tool="get_expense",le="0"} 0' in output
+    assert 'expense_log_tool_duration_seconds_count{tool="get_expense"} 1' in output
+    assert 'expense_log_tool_run_duration_seconds_count{tool="get_expense"} 1' in output
+    assert 'expense_log_tool_db_duration_seconds_count{tool="get_expense"} 1' in output
+    assert 'expense_log_tool_hydration_duration_seconds_count{tool="get_expense"} 1' in output
+    assert 'expense_log_tool_encode_duration_seconds_count{tool="get_expense"} 1' in output
+    assert "expense_log_db_pool_checkouts_total 1" in output
+
+
+def metric_value(output: str, sample: str) -> float:
+    return float(next(line for line in output.splitlines() if line.startswith(sample)).split()[-1])
+
+
+def test_hydration_and_encoding_are_timed(sqlite_db):
+    """
+    Tests that building result rows and encoding the response are timed on their own.
+    """
+    invalidate_expense_categories_cache()
+
+    assert asyncio.run(call_tool("get_expense_categories", {}))["code"] == "OK"
+    output = metrics.render_metrics()
+
+    labels = '{tool="get_expense_categories"}'
+    hydration = metric_value(output, f"expense_log_tool_hydration_duration_seconds_sum{labels}")
+    encoding = metric_value(output, f"expense_log_tool_encode_duration_seconds_sum{labels}")
+    run = metric_value(output, f"expense_log_tool_run_duration_seconds_sum{labels}")
+    assert 0 < hydration < run
+    assert 0 < encoding < run
+
+
+@pytest.mark.parametrize("options, buffered", [({}, True), ({"yield_per": 1}, False)])
+def test_streamed_results_are_not_buffered(sqlite_db, options, buffered):
+    """
+    Tests that results streamed with `yield_per` are not buffered to time their hydration.
+    """
+    stats = CallStats()
+    token = current_call.set(stats)
+    try:
+        with database.session_scope() as db:
+            result = db.execute(select(ExpenseCategory), execution_options=options)
+            assert len(result.scalars().all()) == 3
+    finally:
+        current_call.reset(token)
+
+    assert (stats.hydration_time > 0) == buffered
+
+
+def test_unregistered_tool_names_share_one_label(sqlite_db):
+    """
+    Tests that calls to tools that do not exist are recorded under a single label.
+    """
+    for name in ("made_up_1", "made_up_2"):
+        with pytest.raises(ToolError):
+            asyncio.run(call_tool(name, {}))
+
+    output = metrics.render_metrics()
+
+    assert 'expense_log_tool_calls_total{tool="unknown",code="EXCEPTION"} 2' in output
+    assert "made_up" not in output
+
+
+def test_queries_outside_tool_calls_are_not_attributed(sqlite_db):
+    """
+    Tests that queries run outside of a tool call leave the metrics untouched.
+    """
+    with database.session_scope() as db:
+        db.query(ExpenseCategory).all()
+
+    assert "expense_log_tool_queries_count" not in metrics.render_metrics()
+
+
+def test_cache_stats_are_rendered_per_cache():
+    """
+    Tests that the statistics of each cache are rendered with the cache's name as label.
+    """
+    output = metrics.render_metrics(
+        cache_stats={"grouped_expenses": {"size": 3, "hits": 5, "misses": 4, "evictions": 1}}
+    )
+
+    assert 'expense_log_cache_entries{cache="grouped_expenses"} 3' in output
+    assert 'expense_log_cache_hits_total{cache="grouped_expenses"} 5' in output
+    assert 'expense_log_cache_misses_total{cache="grouped_expenses"} 4' in output
+    assert 'expense_log_cache_evictions_total{cache="grouped_expenses"} 1' in output
+    assert "expense_log_cache" not in metrics.render_metrics()
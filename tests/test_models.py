@@ -0,0 +1,104 @@
+import os
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from expense_log_mcp import database
+from expense_log_mcp.models import Base, Expense
+from expense_log_mcp.tools import get_expenses, get_grouped_expenses
+
+from conftest import create_database, dispose_engines, use_database
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="requires a local PostgreSQL in TEST_DATABASE_URL"
+)
+
+
+@pytest.fixture
+def postgres_engine(monkeypatch):
+    """Fixture to create the schema in a local PostgreSQL with a few thousand expenses."""
+    engine = create_database(TEST_DATABASE_URL)
+    with Session(engine) as session, session.begin():
+        session.execute(
+            insert(Expense),
+            [
+                {
+                    "id": f"expense-{i}",
+                    "ledgerId": "test-ledger",
+                    "categoryId": f"category-{i % 3}",
+                    "messageId": f"message-{i}",
+                    "description": "Test expense",
+                    "amount": 10.0,
+                    "payer": f"payer{i % 4}",
+                    "createdAt": datetime(2025, 1, 1) + timedelta(hours=i),
+                }
+                for i in range(5000)
+            ],
+        )
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM ANALYZE expenses")
+
+    use_database(monkeypatch, TEST_DATABASE_URL)
+    # Query raw expenses only; the rollup table answers whole days by primary key.
+    monkeypatch.setenv("EXPENSE_ROLLUPS_ENABLED", "false")
+    yield engine
+    dispose_engines()
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def explain_tool_query(engine, tool=get_grouped_expenses, **kwargs) -> str:
+    """Runs the tool and returns the EXPLAIN output of the last query it sent."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(database.get_engine(), "before_cursor_execute", capture)
+    try:
+        tool(ledger_id="test-ledger", **kwargs)
+    finally:
+        event.remove(database.get_engine(), "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    with engine.connect() as conn:
+        cursor = conn.connection.cursor()
+        cursor.execute("EXPLAIN " + statement, parameters)
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+@pytest.mark.parametrize(
+    "filter_kwargs, expected_index",
+    [
+        (
+            {"start_date": "2025-01-10", "end_date": "2025-01-20"},
+            "expenses_ledger_id_created_at_idx",
+        ),
+        (
+            {"payer_name": "payer1", "start_date": "2025-01-10", "end_date": "2025-01-20"},
+            "expenses_ledger_id_payer_created_at_idx",
+        ),
+    ],
+)
+def test_get_grouped_expenses_uses_indexes(postgres_engine, filter_kwargs, expected_index):
+    """
+    Tests that the grouped query is answered from the composite indexes on expenses.
+    """
+    plan = explain_tool_query(postgres_engine, **filter_kwargs)
+
+    assert expected_index in plan
+    assert "Seq Scan on expenses" not in plan
+
+
+def test_get_expenses_uses_message_index(postgres_engine):
+    """
+    Tests that a batch lookup by message IDs probes the (ledger_id, messageId) unique index.
+    """
+    message_ids = [f"message-{i}" for i in range(0, 5000, 250)]
+    plan = explain_tool_query(postgres_engine, get_expenses, message_ids=message_ids)
+
+    assert "_ledger_message_uc" in plan
+    assert "Seq Scan on expenses" not in plan
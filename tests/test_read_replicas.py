@@ -0,0 +1,114 @@
+import json
+import pytest
+from sqlalchemy.orm import Session
+
+from expense_log_mcp import database
+from expense_log_mcp.models import Expense
+from expense_log_mcp.tools import add_expense, get_expense
+
+from conftest import create_database, dispose_engines
+
+
+def make_database(path, name):
+    """Creates a SQLite database whose one expense is described by the database's name."""
+    url = f"sqlite:///{path / f'{name}.db'}"
+    engine = create_database(url)
+    with Session(engine) as session, session.begin():
+        session.add(
+            Expense(
+                id=f"{name}-expense",
+                ledgerId="test-ledger",
+                categoryId="category-1",
+                messageId="message-1",
+                description=name,
+                amount=1,
+                payer="payer",
+            )
+        )
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def databases(monkeypatch, tmp_path):
+    """Fixture to point the tools at a primary and two read replicas."""
+    urls = {name: make_database(tmp_path, name) for name in ("primary", "replica1", "replica2")}
+    monkeypatch.setenv("DATABASE_URL", urls["primary"])
+    monkeypatch.setenv("DATABASE_READ_URL", f"{urls['replica1']}, {urls['replica2']}")
+    monkeypatch.setattr(database, "engine", None)
+    monkeypatch.setattr(database, "reader_engine", None)
+    monkeypatch.setattr(database, "read_replicas", None)
+    monkeypatch.setattr(database, "_recent_writes", database.TTLCache())
+    yield urls
+    dispose_engines()
+    for replica in database.read_replicas or ():
+        replica.engine.dispose()
+
+
+def read_from(ledger_id="test-ledger"):
+    """Returns the name of the database that answered get_expense."""
+    result = json.loads(get_expense(ledger_id=ledger_id, message_id="message-1"))
+    return result["data"]["description"] if result["success"] else None
+
+
+def test_reads_round_robin_over_replicas(databases):
+    """
+    Tests that read-only tools alternate between the replicas and never use the primary.
+    """
+    answered = [read_from() for _ in range(4)]
+
+    assert sorted(answered) == ["replica1", "replica1", "replica2", "replica2"]
+    assert answered[0] != answered[1]
+    assert database.get_pool_stats().get("checkouts", 0) == 0
+
+
+def test_writes_go_to_primary(databases):
+    """
+    Tests that write tools keep using the primary when replicas are configured.
+    """
+    result = json.loads(add_expense("test-ledger", "category-1", "message-2", "New", 2.5, "payer"))
+
+    assert result["code"] == "OK"
+    assert database.get_pool_stats()["checkouts"] >= 1
+
+
+def test_least_connections_prefers_idle_replica(monkeypatch, databases):
+    """
+    Tests that least-connections routing skips a replica with connections checked out.
+    """
+    monkeypatch.setenv("DATABASE_READ_STRATEGY", "least_connections")
+    busy = database.get_read_replicas()[0].engine.connect()
+    try:
+        assert [read_from() for _ in range(3)] == ["replica2"] * 3
+    finally:
+        busy.close()
+
+
+def test_unreachable_replica_falls_back(monkeypatch, databases, tmp_path):
+    """
+    Tests that a replica that cannot be reached is skipped, falling back to the primary
+    once no replica is left.
+    """
+    missing = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    monkeypatch.setenv("DATABASE_READ_URL", f"{missing},{databases['replica2']}")
+
+    assert [read_from() for _ in range(3)] == ["replica2"] * 3
+
+    database.get_read_replicas()[1].down_until = float("inf")
+    assert read_from() == "primary"
+
+
+def test_read_your_writes_window(monkeypatch, databases):
+    """
+    Tests that reads of a ledger written recently go to the primary during the window.
+    """
+    monkeypatch.setenv("DATABASE_READ_YOUR_WRITES_SECONDS", "60")
+
+    assert read_from() != "primary"
+    add_expense("test-ledger", "category-1", "message-2", "New", 2.5, "payer")
+
+    assert read_from() == "primary"
+    assert read_from("other-ledger") is None
+
+    database._recent_writes.clear()
+    assert read_from() != "primary"
@@ -0,0 +1,95 @@
+import json
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from expense_log_mcp import responses
+
+ENCODERS = sorted(responses.ENCODERS)
+
+
+@pytest.fixture(autouse=True)
+def reset_encoder():
+    """Fixture to make every test choose the encoder afresh."""
+    responses.reset_encoder()
+    yield
+    responses.reset_encoder()
+
+
+@pytest.mark.parametrize("encoder", ENCODERS)
+def test_encoders_handle_decimals_and_datetimes(monkeypatch, encoder):
+    """
+    Tests that every encoder writes decimals as numbers and datetimes as ISO 8601.
+    """
+    monkeypatch.setenv("JSON_ENCODER", encoder)
+
+    result = json.loads(
+        responses.success(
+            "Done.",
+            {
+                "amount": Decimal("12.30"),
+                "createdAt": datetime(2025, 1, 2, 3, 4, 5, 600),
+                "updatedAt": datetime(2025, 1, 2, tzinfo=timezone.utc),
+                "payers": {None: Decimal("1.05")},
+            },
+        )
+    )
+
+    assert result == {
+        "success": True,
+        "code": "OK",
+        "message": "Done.",
+        "data": {
+            "amount": 12.3,
+            "createdAt": "2025-01-02T03:04:05.000600",
+            "updatedAt": "2025-01-02T00:00:00+00:00",
+            "payers": {"null": 1.05},
+        },
+    }
+
+
+@pytest.mark.parametrize("encoder", ENCODERS)
+def test_amounts_below_ten_trillion_are_exact(monkeypatch, encoder):
+    """
+    Tests that amounts up to the documented bound keep every cent in the JSON number.
+    """
+    monkeypatch.setenv("JSON_ENCODER", encoder)
+    amounts = [Decimal("0.01"), Decimal("123456789.10"), Decimal("9999999999999.99")]
+
+    result = json.loads(responses.success("Done.", amounts), parse_float=Decimal)
+
+    assert result["data"] == amounts
+
+
+@pytest.mark.parametrize("encoder", ENCODERS)
+def test_failure_has_no_data(monkeypatch, encoder):
+    """
+    Tests that failed responses carry the error code and message only.
+    """
+    monkeypatch.setenv("JSON_ENCODER", encoder)
+
+    assert json.loads(responses.failure("NOT_FOUND", "Expense not found.")) == {
+        "success": False,
+        "code": "NOT_FOUND",
+        "message": "Expense not found.",
+    }
+
+
+def test_unknown_encoder_rejected(monkeypatch):
+    """
+    Tests that naming an unknown or uninstalled encoder fails instead of falling back.
+    """
+    monkeypatch.setenv("JSON_ENCODER", "simplejson")
+
+    with pytest.raises(ValueError):
+        responses.success("Done.")
+
+
+def test_orjson_preferred_when_installed(monkeypatch):
+    """
+    Tests that orjson is the default encoder when it is installed.
+    """
+    monkeypatch.delenv("JSON_ENCODER", raising=False)
+    expected = "orjson" if responses.orjson is not None else "stdlib"
+
+    assert responses.get_encoder() is responses.ENCODERS[expected]
@@ -0,0 +1,255 @@
+import json
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import Session
+
+from expense_log_mcp.models import Expense, ExpenseDailyRollup, Ledger
+from expense_log_mcp.rollups import full_day_range, local_day, rebuild_rollups
+from expense_log_mcp.tools import add_expense, delete_expense, get_grouped_expenses
+from expense_log_mcp.tools.get_grouped_expenses import invalidate_grouped_expenses_cache
+
+TZ8 = timezone(timedelta(hours=8))
+
+
+@pytest.fixture
+def expenses_db(expenses_db, monkeypatch):
+    """Fixture to add expenses spread over two weeks to each test database."""
+    with Session(expenses_db) as session, session.begin():
+        session.execute(
+            insert(Expense),
+            [
+                {
+                    "id": f"expense-{i}",
+                    "ledgerId": "test-ledger",
+                    "categoryId": f"category-{i % 3}",
+                    "messageId": f"message-{i}",
+                    "description": "Test expense",
+                    "amount": 1.25 * (i % 7 + 1),
+                    "payer": f"payer{i % 2}",
+                    "createdAt": datetime(2025, 1, 1) + timedelta(minutes=97 * i),
+                }
+                for i in range(200)
+            ],
+        )
+        rebuild_rollups(session)
+
+    monkeypatch.setenv("EXPENSE_ROLLUPS_ENABLED", "true")
+    # Compare freshly computed totals; the result cache is tested on its own below.
+    monkeypatch.setenv("GROUPED_EXPENSES_CACHE_SIZE", "0")
+    return expenses_db
+
+
+def grouped(monkeypatch, rollups_enabled, **kwargs):
+    monkeypatch.setenv("EXPENSE_ROLLUPS_ENABLED", str(rollups_enabled).lower())
+    result = json.loads(get_grouped_expenses(ledger_id="test-ledger", **kwargs))
+    assert result["success"], result
+    return result["data"]
+
+
+def rollup_rows(engine):
+    with Session(engine) as session:
+        return {
+            (row.payer, row.categoryId, row.localDay): (row.totalAmount, row.expenseCount)
+            for row in session.scalars(select(ExpenseDailyRollup))
+            if row.expenseCount
+        }
+
+
+def test_local_day_uses_rollup_offset():
+    """
+    Tests that a UTC timestamp is assigned to the day of the rollup timezone.
+    """
+    assert local_day(datetime(2025, 1, 1, 17, 0), 8) == date(2025, 1, 2)
+    assert local_day(datetime(2025, 1, 1, 17, 0, tzinfo=timezone.utc), 0) == date(2025, 1, 1)
+
+
+@pytest.mark.parametrize(
+    "start, end, expected",
+    [
+        (
+            datetime(2025, 1, 1, tzinfo=TZ8),
+            datetime(2025, 1, 3, tzinfo=TZ8),
+            (date(2025, 1, 1), date(2025, 1, 2)),
+        ),
+        (
+            datetime(2025, 1, 1, 9, tzinfo=TZ8),
+            datetime(2025, 1, 3, 23, 59, 59, 999999, tzinfo=TZ8),
+            (date(2025, 1, 2), date(2025, 1, 3)),
+        ),
+        (datetime(2025, 1, 1, 9, tzinfo=TZ8), datetime(2025, 1, 2, 9, tzinfo=TZ8), None),
+        (None, datetime(2025, 1, 3, tzinfo=TZ8), (None, date(2025, 1, 2))),
+        (datetime(2025, 1, 1, tzinfo=timezone.utc), None, (date(2025, 1, 2), None)),
+    ],
+)
+def test_full_day_range(start, end, expected):
+    """
+    Tests that only days lying entirely within the range are answered from the rollup.
+    """
+    assert full_day_range(start, end, 8) == expected
+
+
+@pytest.mark.parametrize(
+    "filter_kwargs",
+    [
+        {},
+        {"start_date": "2025-01-03", "end_date": "2025-01-09"},
+        {"start_date": "2025-01-03T05:30:00", "end_date": "2025-01-09T17:45:00"},
+        {"start_date": "2025-01-03T05:30:00", "end_date": "2025-01-03T18:00:00"},
+        {"start_date": "2025-01-04T12:00:00"},
+        {"end_date": "2025-01-06T23:59:59"},
+        {"start_date": "2025-01-03", "end_date": "2025-01-09", "timezone_offset_hours": -5},
+        {"start_date": "2025-01-02", "payer_name": "payer1", "category_ids": ["category-2"]},
+    ],
+)
+def test_rollup_matches_raw_expenses(monkeypatch, expenses_db, filter_kwargs):
+    """
+    Tests that answering whole days from the rollup gives the same totals as raw expenses.
+    """
+    expected = grouped(monkeypatch, False, **filter_kwargs)
+    actual = grouped(monkeypatch, True, **filter_kwargs)
+
+    assert actual.keys() == expected.keys()
+    for payer, group in expected.items():
+        assert actual[payer]["total_amount"] == pytest.approx(group["total_amount"])
+        assert actual[payer]["expense_categories"] == pytest.approx(group["expense_categories"])
+
+
+def test_write_tools_maintain_rollup(monkeypatch, expenses_db):
+    """
+    Tests that add_expense and delete_expense keep the rollup equal to a full rebuild.
+    """
+    add_expense("test-ledger", "category-1", "new-message", "New expense", 42.5, "payer0")
+    delete_expense("test-ledger", "message-7")
+    delete_expense("test-ledger", "message-8")
+    maintained = rollup_rows(expenses_db)
+
+    with Session(expenses_db) as session, session.begin():
+        rebuild_rollups(session)
+
+    assert maintained == rollup_rows(expenses_db)
+
+
+def test_rollups_are_off_by_default(monkeypatch, expenses_db):
+    """
+    Tests that without `EXPENSE_ROLLUPS_ENABLED` writes leave the rollup alone and grouped
+    totals come from raw expenses only.
+    """
+    monkeypatch.delenv("EXPENSE_ROLLUPS_ENABLED")
+    before = json.loads(get_grouped_expenses(ledger_id="test-ledger"))["data"]
+    rollup = rollup_rows(expenses_db)
+
+    add_expense("test-ledger", "category-1", "new-message", "New expense", 42.5, "payer0")
+
+    after = json.loads(get_grouped_expenses(ledger_id="test-ledger"))["data"]
+    assert rollup_rows(expenses_db) == rollup
+    assert after["payer0"]["total_amount"] == before["payer0"]["total_amount"] + 42.5
+
+
+def test_write_tools_invalidate_cached_results(monkeypatch, expenses_db):
+    """
+    Tests that cached grouped expenses are reused until a write bumps the ledger version.
+    """
+    monkeypatch.setenv("GROUPED_EXPENSES_CACHE_SIZE", "16")
+    invalidate_grouped_expenses_cache()
+
+    def version():
+        with Session(expenses_db) as session:
+            return session.scalar(select(Ledger.version).where(Ledger.id == "test-ledger"))
+
+    before = grouped(monkeypatch, True, payer_name="payer0")
+    assert grouped(monkeypatch, True, payer_name="payer0") == before
+
+    add_expense("test-ledger", "category-1", "new-message", "New expense", 42.5, "payer0")
+    assert version() == 1
+    after_add = grouped(monkeypatch, True, payer_name="payer0")
+    assert after_add["payer0"]["total_amount"] == pytest.approx(
+        before["payer0"]["total_amount"] + 42.5
+    )
+
+    # A duplicate message changes nothing and keeps the cached result current.
+    add_expense("test-ledger", "category-1", "new-message", "New expense", 42.5, "payer0")
+    assert version() == 1
+
+    delete_expense("test-ledger", "new-message")
+    assert version() == 2
+    assert grouped(monkeypatch, True, payer_name="payer0") == before
+
+
+def test_amounts_sum_exactly(monkeypatch, expenses_db):
+    """
+    Tests that amounts are stored as whole cents and summed without float drift.
+    """
+    for i in range(10):
+        add_expense("test-ledger", "category-1", f"cent-{i}", "Cents", 0.1, "payer9")
+
+    for rollups_enabled in (True, False):
+        data = grouped(monkeypatch, rollups_enabled, payer_name="payer9")
+        assert data == {"payer9": {"expense_categories": {"Category 1": 1.0}, "total_amount": 1.0}}
+
+    with Session(expenses_db) as session:
+        total = session.scalar(
+            select(ExpenseDailyRollup.totalAmount).where(ExpenseDailyRollup.payer == "payer9")
+        )
+        stored = session.scalars(
+            text("SELECT amount FROM expenses WHERE payer = 'payer9'")
+        ).all()
+    assert total == Decimal("1.00")
+    assert stored == [10] * 10
+
+
+def next_bucket_start(start: date, bucket: str) -> date:
+    if bucket == "day":
+        return start + timedelta(days=1)
+    if bucket == "week":
+        return start + timedelta(days=7)
+    return (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+@pytest.mark.parametrize("rollups_enabled", [True, False])
+@pytest.mark.parametrize(
+    "bucket, filter_kwargs",
+    [
+        ("day", {}),
+        ("day", {"timezone_offset_hours": -5}),
+        ("week", {"start_date": "2025-01-03T05:30:00", "end_date": "2025-01-12T17:45:00"}),
+        ("month", {"payer_name": "payer1", "category_ids": ["category-2"]}),
+    ],
+)
+def test_bucketed_series_matches_one_call_per_bucket(
+    monkeypatch, expenses_db, rollups_enabled, bucket, filter_kwargs
+):
+    """
+    Tests that one bucketed call returns the same groups as one call per bucket range.
+    """
+    data = grouped(monkeypatch, rollups_enabled, bucket=bucket, **filter_kwargs)
+
+    assert data["bucket"] == bucket
+    starts = [date.fromisoformat(entry["start"]) for entry in data["series"]]
+    assert starts == sorted(starts) and starts
+    if bucket == "week":
+        assert all(start.weekday() == 0 for start in starts)
+
+    for entry, start in zip(data["series"], starts):
+        end = datetime.combine(next_bucket_start(start, bucket), datetime.min.time())
+        kwargs = {
+            **filter_kwargs,
+            "start_date": max(start.isoformat(), filter_kwargs.get("start_date", "")),
+            "end_date": min(
+                (end - timedelta(microseconds=1)).isoformat(),
+                filter_kwargs.get("end_date", "9999"),
+            ),
+        }
+        expected = grouped(monkeypatch, False, **kwargs)
+        assert entry["groups"].keys() == expected.keys()
+        for payer, group in expected.items():
+            assert entry["groups"][payer]["total_amount"] == pytest.approx(group["total_amount"])
+            assert entry["groups"][payer]["expense_categories"] == pytest.approx(
+                group["expense_categories"]
+            )
+
+    total = grouped(monkeypatch, False, **filter_kwargs)
+    assert sum(
+        group["total_amount"] for entry in data["series"] for group in entry["groups"].values()
+    ) == pytest.approx(sum(group["total_amount"] for group in total.values()))
@@ -0,0 +1,238 @@
+import json
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import func, select, text
+
+from expense_log_mcp import database
+from expense_log_mcp.models import Base, Expense, Ledger
+from expense_log_mcp.tools import (
+    add_expense,
+    add_expenses,
+    delete_expense,
+    delete_expenses,
+    get_expense,
+    get_expense_categories,
+    get_grouped_expenses,
+    list_expenses,
+)
+
+from conftest import create_database, database_url, dispose_engines, use_database
+
+# Values that differ between runs rather than between backends.
+VOLATILE_KEYS = {"id", "expenseId", "createdAt", "updatedAt", "start"}
+
+
+def normalize(value):
+    """Drops generated IDs and timestamps, and keeps only the code of failures."""
+    if isinstance(value, dict):
+        if value.get("success") is False:
+            return {"code": value["code"]}
+        return {
+            key: (item is not None if key == "nextCursor" else normalize(item))
+            for key, item in value.items()
+            if key not in VOLATILE_KEYS
+        }
+    if isinstance(value, list):
+        return [normalize(item) for item in value]
+    return value
+
+
+def list_all(**kwargs):
+    """Lists every page, returning the pages' sizes and the expenses by message ID."""
+    sizes, expenses, cursor = [], [], None
+    while True:
+        page = json.loads(list_expenses("test-ledger", page_size=2, cursor=cursor, **kwargs))
+        sizes.append(len(page["data"]["expenses"]))
+        expenses += page["data"]["expenses"]
+        cursor = page["data"]["nextCursor"]
+        if cursor is None:
+            return normalize([sizes, sorted(expenses, key=lambda e: e["messageId"])])
+
+
+def run_scenario():
+    """Calls every tool, including the upsert and date range paths, and returns the results."""
+    now = datetime.utcnow()
+    around_now = {
+        "start_date": (now - timedelta(hours=1)).isoformat(),
+        "end_date": (now + timedelta(hours=1)).isoformat(),
+        "timezone_offset_hours": 0,
+    }
+    last_year = {"start_date": "2000-01-01", "end_date": "2000-12-31T23:59:59"}
+
+    results = [
+        add_expense("test-ledger", "category-0", "message-1", "Lunch", 10.1, "Alice"),
+        add_expense("test-ledger", "category-0", "message-1", "Lunch", 10.1, "Alice"),
+        add_expense("test-ledger", "missing-category", "message-x", "Nowhere", 1, "Alice"),
+        add_expenses(
+            "test-ledger",
+            [
+                {
+                    "category_id": "category-1",
+                    "message_id": "message-2",
+                    "description": "Bus",
+                    "amount": 5.25,
+                    "payer": "Bob",
+                },
+                {
+                    "category_id": "category-2",
+                    "message_id": "message-3",
+                    "description": "Power",
+                    "amount": 7,
+                    "payer": "Alice",
+                },
+                {
+                    "category_id": "category-0",
+                    "message_id": "message-1",
+                    "description": "Lunch",
+                    "amount": 10.1,
+                    "payer": "Alice",
+                },
+            ],
+        ),
+        get_expense("test-ledger", "message-2"),
+        get_expense("test-ledger", "missing"),
+        get_grouped_expenses("test-ledger"),
+        get_grouped_expenses("test-ledger", category_ids=["category-2", "category-0"]),
+        get_grouped_expenses("test-ledger", payer_name="Alice", **around_now),
+        get_grouped_expenses("test-ledger", bucket="day", **around_now),
+        get_grouped_expenses("test-ledger", **last_year),
+    ]
+    # The batch's expenses share a creation time, and pages of two split them.
+    listed = [list_all(), list_all(**around_now)]
+    results += [
+        delete_expense("test-ledger", "message-3"),
+        delete_expense("test-ledger", "message-3"),
+        delete_expenses("test-ledger", ["message-1", "missing"]),
+        get_grouped_expenses("test-ledger"),
+        get_expense_categories(),
+    ]
+    results = [normalize(json.loads(result)) for result in results]
+    return results + listed + [list_all(), list_all(**around_now), list_all(**last_year)]
+
+
+def test_connections_use_wal_and_pragmas(sqlite_db):
+    """
+    Tests that the writer and the readers are configured for the embedded mode.
+    """
+    with database.session_scope() as writer, database.session_scope(readonly=True) as reader:
+        assert writer.get_bind() is database.engine
+        assert reader.get_bind() is database.reader_engine
+        for db in (writer, reader):
+            assert db.scalar(text("PRAGMA journal_mode")) == "wal"
+            assert db.scalar(text("PRAGMA synchronous")) == 1
+            assert db.scalar(text("PRAGMA busy_timeout")) == 5000
+            assert db.scalar(text("PRAGMA foreign_keys")) == 1
+    assert database.engine.pool.size() == 1
+
+
+def test_tools_on_sqlite(sqlite_db):
+    """
+    Tests the outcome of every tool on an embedded SQLite database.
+    """
+    results = run_scenario()
+
+    codes = [result.get("code") for result in results[:16]]
+    assert codes == [
+        "OK",
+        "DUPLICATE",
+        "ERROR",
+        "OK",
+        "OK",
+        "NOT_FOUND",
+        "OK",
+        "OK",
+        "OK",
+        "OK",
+        "OK",
+        "OK",
+        "NOT_FOUND",
+        "OK",
+        "OK",
+        "OK",
+    ]
+    assert results[3]["data"]["created"] == 2
+    assert results[6]["data"]["Alice"]["total_amount"] == 17.1
+    assert results[8]["data"] == {
+        "Alice": {"expense_categories": {"Category 0": 10.1, "Category 2": 7}, "total_amount": 17.1}
+    }
+    assert results[10]["data"] == {}
+    assert results[14]["data"] == {
+        "Bob": {"expense_categories": {"Category 1": 5.25}, "total_amount": 5.25}
+    }
+    sizes, expenses = results[16]
+    assert sizes == [2, 1]
+    assert [expense["messageId"] for expense in expenses] == ["message-1", "message-2", "message-3"]
+    assert results[17] == results[16]
+    sizes, expenses = results[18]
+    assert sizes == [1] and [expense["messageId"] for expense in expenses] == ["message-2"]
+    assert results[19] == results[18]
+    assert results[20] == [[0], []]
+
+
+def test_pages_through_one_batch_of_expenses(sqlite_db):
+    """
+    Tests that expenses added in one batch, which share their creation time, are each
+    listed once when paging through them with pages smaller than the batch.
+    """
+    expenses = [
+        {
+            "category_id": "category-0",
+            "message_id": f"message-{i}",
+            "description": "Lunch",
+            "amount": 1,
+            "payer": "Alice",
+        }
+        for i in range(5)
+    ]
+    assert json.loads(add_expenses("test-ledger", expenses))["data"]["created"] == 5
+
+    sizes, listed = list_all()
+
+    assert sizes == [2, 2, 1]
+    assert [expense["messageId"] for expense in listed] == [f"message-{i}" for i in range(5)]
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_DATABASE_URL"), reason="requires a local PostgreSQL in TEST_DATABASE_URL"
+)
+def test_tools_behave_the_same_on_sqlite_and_postgresql(monkeypatch, tmp_path):
+    """
+    Tests that every tool returns the same results on SQLite as on PostgreSQL.
+    """
+    sqlite_url = database_url("sqlite", tmp_path)
+    create_database(sqlite_url).dispose()
+    use_database(monkeypatch, sqlite_url)
+    on_sqlite = run_scenario()
+
+    engine = create_database(os.getenv("TEST_DATABASE_URL"))
+    use_database(monkeypatch, os.getenv("TEST_DATABASE_URL"))
+    on_postgresql = run_scenario()
+    dispose_engines()
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+    assert on_sqlite == on_postgresql
+
+
+def test_concurrent_writes_do_not_lock(sqlite_db, monkeypatch):
+    """
+    Tests that concurrent writers and readers all succeed instead of failing with
+    `database is locked`.
+    """
+    monkeypatch.setenv("DATABASE_POOL_SIZE", "8")
+
+    def call(i):
+        if i % 4 == 3:
+            return json.loads(get_grouped_expenses("test-ledger"))["code"]
+        result = add_expense("test-ledger", f"category-{i % 3}", f"message-{i}", "Test", 1, "Bob")
+        return json.loads(result)["code"]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        codes = list(executor.map(call, range(200)))
+
+    assert set(codes) == {"OK"}
+    with database.session_scope() as db:
+        assert db.scalar(select(func.count(Expense.id))) == 150
+        assert db.scalar(select(Ledger.version)) == 150
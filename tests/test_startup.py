@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+
+
+def import_times(module: str) -> dict:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime` and returns the
+    cumulative import time in microseconds of every module it loaded.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_server_import_defers_heavy_modules():
+    """
+    Tests that starting the server loads no database driver or id generator, and
+    reports how long the import took.
+    """
+    times = import_times("expense_log_mcp.main")
+
+    print(f"\nexpense_log_mcp.main imported in {times['expense_log_mcp.main'] / 1000:.0f} ms")
+    deferred = [
+        "cuid2",
+        "psycopg2",
+        "asyncpg",
+        "sqlalchemy.dialects.sqlite",
+        "sqlalchemy.ext.asyncio",
+    ]
+    assert [module for module in deferred if module in times] == []
+
+
+def test_tool_import_does_not_load_server():
+    """
+    Tests that importing a single tool does not load the MCP server.
+    """
+    times = import_times("expense_log_mcp.tools.get_expense")
+
+    print(
+        f"\nexpense_log_mcp.tools.get_expense imported in "
+        f"{times['expense_log_mcp.tools.get_expense'] / 1000:.0f} ms"
+    )
+    assert "fastmcp.server.server" not in times
+
+
+def test_engine_does_not_load_server(tmp_path):
+    """
+    Tests that creating the instrumented engine, as the rollups CLI does, does not load
+    the MCP server.
+    """
+    code = (
+        "import sys; from expense_log_mcp import database, rollups; database.get_engine(); "
+        "print(sorted(name for name in sys.modules if name.split('.')[0] == 'fastmcp'))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'test.db'}"},
+    )
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from expense_log_mcp import database
+from expense_log_mcp.models import Expense
+from expense_log_mcp.warmup import is_warm_up_enabled, warm_up
+
+
+def test_warm_up_opens_pool_connections(sqlite_db):
+    """
+    Tests that warming up leaves the requested connections open in the pool and
+    compiles the tool queries without writing anything.
+    """
+    warm_up(connections=3)
+
+    # The SQLite readers' pool and the single writer's connection.
+    stats = database.get_pool_stats()
+    assert stats["checked_in"] == 3 + 1
+    assert stats["checked_out"] == 0
+    assert len(database.reader_engine._compiled_cache) > 0
+    with Session(sqlite_db) as session:
+        assert session.scalar(select(func.count(Expense.id))) == 0
+
+
+@pytest.mark.parametrize(
+    "value, enabled", [("1", True), ("yes", True), ("true", True), ("0", False)]
+)
+def test_warm_up_flag_accepts_truthy_values(monkeypatch, value, enabled):
+    """
+    Tests that `WARM_UP` is parsed like the other boolean settings.
+    """
+    monkeypatch.setenv("WARM_UP", value)
+
+    assert is_warm_up_enabled() is enabled
@@ -0,0 +1,128 @@
+import asyncio
+import inspect
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from expense_log_mcp.call_stats import CallStats, current_call
+from expense_log_mcp.write_pipeline import WritePipeline, pipelined_tool
+
+
+class RecordingFlush:
+    """Flush function that records every batch and answers each item with its double."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        return [item * 2 for item in items]
+
+
+def test_concurrent_submissions_share_a_batch():
+    """
+    Tests that items submitted together are flushed together, each caller getting its own result.
+    """
+    flush = RecordingFlush()
+    pipeline = WritePipeline(flush, max_batch_size=8, max_wait=0.5)
+    barrier = threading.Barrier(8)
+
+    def submit(item):
+        barrier.wait()
+        return pipeline.submit(item).result(timeout=5)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(submit, range(8)))
+
+    assert results == [item * 2 for item in range(8)]
+    assert len(flush.batches) == 1
+    assert sorted(flush.batches[0]) == list(range(8))
+
+
+def test_batches_are_capped_at_max_batch_size():
+    """
+    Tests that a batch is flushed as soon as it holds max_batch_size items.
+    """
+    flush = RecordingFlush()
+    pipeline = WritePipeline(flush, max_batch_size=3, max_wait=0.2)
+
+    futures = [pipeline.submit(item) for item in range(7)]
+
+    assert [future.result(timeout=5) for future in futures] == [item * 2 for item in range(7)]
+    assert all(len(batch) <= 3 for batch in flush.batches)
+
+
+def test_lone_item_is_flushed_after_max_wait():
+    """
+    Tests that an item without company is flushed once max_wait has passed.
+    """
+    flush = RecordingFlush()
+    pipeline = WritePipeline(flush, max_batch_size=100, max_wait=0.01)
+
+    assert pipeline.submit(21).result(timeout=5) == 42
+    assert flush.batches == [[21]]
+
+
+def test_flush_error_fails_the_whole_batch():
+    """
+    Tests that an exception raised by flush is raised to every caller of the batch.
+    """
+
+    def flush(items):
+        raise RuntimeError("flush failed")
+
+    pipeline = WritePipeline(flush, max_batch_size=2, max_wait=0.5)
+    futures = [pipeline.submit(item) for item in range(2)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="flush failed"):
+            future.result(timeout=5)
+
+
+def test_pipelined_tool_lets_concurrent_calls_batch():
+    """
+    Tests that pipelined tools keep their signature and let concurrent calls on one
+    event loop join the same batch.
+    """
+    flush = RecordingFlush()
+    pipeline = WritePipeline(flush, max_batch_size=4, max_wait=0.5)
+
+    def double(value: int) -> int:
+        return pipeline.submit(value).result(timeout=5)
+
+    tool = pipelined_tool(double)
+
+    async def call_all():
+        return await asyncio.gather(*(tool(value) for value in range(4)))
+
+    assert inspect.iscoroutinefunction(tool)
+    assert inspect.signature(tool) == inspect.signature(double)
+    assert asyncio.run(call_all()) == [0, 2, 4, 6]
+    assert len(flush.batches) == 1
+
+
+def test_batch_stats_are_charged_to_every_caller():
+    """
+    Tests that the queries and SQL time of a batch, run on the pipeline's thread, are
+    recorded in the stats of each call that waited for it.
+    """
+
+    def flush(items):
+        current_call.get().queries += 2
+        current_call.get().db_time += 0.5
+        return items
+
+    pipeline = WritePipeline(flush, max_batch_size=2, max_wait=0.5)
+    barrier = threading.Barrier(2)
+
+    def submit(item):
+        stats = CallStats()
+        current_call.set(stats)
+        barrier.wait()
+        pipeline.submit(item).result(timeout=5)
+        return stats
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        calls = list(executor.map(submit, range(2)))
+
+    assert [(stats.queries, stats.db_time) for stats in calls] == [(2, 0.5), (2, 0.5)]
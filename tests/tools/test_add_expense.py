@@ -1,47 +1,134 @@
+import importlib
 import json
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 from unittest.mock import MagicMock, patch
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
+from expense_log_mcp.models import Expense, ExpenseDailyRollup
 from expense_log_mcp.tools.add_expense import add_expense
 
 
+@pytest.fixture(autouse=True)
+def rollups_enabled(monkeypatch):
+    """Fixture to maintain the daily rollup, which several tests below check."""
+    monkeypatch.setenv("EXPENSE_ROLLUPS_ENABLED", "true")
+
+
 def test_add_expense_success():
     """
     Tests that an expense is added successfully.
     """
     mock_db = MagicMock()
-    with patch("expense_log_mcp.tools.add_expense.get_db", return_value=iter([mock_db])):
-        ledger_id = "test_ledger"
-        category_id = "test_category"
-        message_id = "test_message"
-        description = "Test expense"
-        amount = 100.0
-        payer = "test_payer"
+    mock_db.execute.return_value.scalar.return_value = datetime(2025, 9, 7)
+    with (
+        patch("expense_log_mcp.tools.add_expense.session_scope") as mock_session_scope,
+        patch("expense_log_mcp.tools.add_expense.apply_rollup") as mock_apply_rollup,
+        patch("expense_log_mcp.tools.add_expense.bump_ledger_versions") as mock_bump,
+        patch("expense_log_mcp.tools.add_expense.new_id", return_value="new-id"),
+    ):
+        mock_session_scope.return_value.__enter__.return_value = mock_db
 
         result = add_expense(
-            ledger_id=ledger_id,
-            category_id=category_id,
-            message_id=message_id,
-            description=description,
-            amount=amount,
-            payer=payer,
+            ledger_id="test_ledger",
+            category_id="test_category",
+            message_id="test_message",
+            description="Test expense",
+            amount=100.0,
+            payer="test_payer",
         )
 
-        mock_db.add.assert_called_once()
+        mock_db.execute.assert_called_once()
+        assert mock_db.execute.call_args.args[1]["messageId"] == "test_message"
+        rolled_up = mock_apply_rollup.call_args.args[1]
+        assert [(e.id, e.createdAt) for e in rolled_up] == [("new-id", datetime(2025, 9, 7))]
+        mock_bump.assert_called_once_with(mock_db, ["test_ledger"])
         mock_db.commit.assert_called_once()
-        mock_db.refresh.assert_called_once()
 
         result_json = json.loads(result)
         assert result_json["success"]
         assert result_json["code"] == "OK"
         assert result_json["message"] == "Expense added successfully."
-        assert "expenseId" in result_json["data"]
+        assert result_json["data"] == {"expenseId": "new-id"}
+
+
+def test_add_expense_duplicate():
+    """
+    Tests that a retried message returns DUPLICATE with the existing expense ID
+    without touching the rollup.
+    """
+    mock_db = MagicMock()
+    mock_db.execute.return_value.scalar.return_value = None
+    mock_db.scalar.return_value = "existing-id"
+    with (
+        patch("expense_log_mcp.tools.add_expense.session_scope") as mock_session_scope,
+        patch("expense_log_mcp.tools.add_expense.apply_rollup") as mock_apply_rollup,
+        patch("expense_log_mcp.tools.add_expense.bump_ledger_versions") as mock_bump,
+    ):
+        mock_session_scope.return_value.__enter__.return_value = mock_db
+
+        result = add_expense(
+            ledger_id="test_ledger",
+            category_id="test_category",
+            message_id="test_message",
+            description="Test expense",
+            amount=100.0,
+            payer="test_payer",
+        )
+
+        mock_apply_rollup.assert_not_called()
+        mock_bump.assert_not_called()
+        mock_db.commit.assert_not_called()
+
+        result_json = json.loads(result)
+        assert result_json["success"]
+        assert result_json["code"] == "DUPLICATE"
+        assert result_json["data"] == {"expenseId": "existing-id"}
+
+
+@pytest.mark.parametrize("retries", [1, 16])
+def test_add_expense_retry_storm(expenses_db, retries):
+    """
+    Tests that concurrent retries of one message create a single expense, and every
+    other retry gets DUPLICATE with the same expense ID.
+    """
+    barrier = threading.Barrier(8)
+
+    def retry_storm(_):
+        results = []
+        barrier.wait()
+        for _ in range(retries):
+            results.append(
+                json.loads(
+                    add_expense("test-ledger", "category-1", "message-1", "Lunch", 10.5, "payer1")
+                )
+            )
+        return results
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = [r for batch in pool.map(retry_storm, range(8)) for r in batch]
+
+    codes = [r["code"] for r in results]
+    assert codes.count("OK") == 1
+    assert codes.count("DUPLICATE") == len(results) - 1
+    assert len({r["data"]["expenseId"] for r in results}) == 1
+
+    with Session(expenses_db) as session:
+        assert session.scalar(select(func.count(Expense.id))) == 1
+        assert session.scalar(select(ExpenseDailyRollup.expenseCount)) == 1
 
 
 def test_add_expense_db_error():
     """
     Tests that a database error is handled correctly.
     """
-    with patch("expense_log_mcp.tools.add_expense.get_db", side_effect=Exception("DB error")):
+    with patch(
+        "expense_log_mcp.tools.add_expense.session_scope", side_effect=Exception("DB error")
+    ):
         result = add_expense(
             ledger_id="test_ledger",
             category_id="test_category",
@@ -55,3 +142,87 @@ def test_add_expense_db_error():
         assert not result_json["success"]
         assert result_json["code"] == "ERROR"
         assert result_json["message"] == "DB error"
+
+
+@pytest.mark.parametrize("amount", [1e13, -1e15, Decimal("9999999999999.995")])
+def test_add_expense_rejects_amounts_out_of_range(amount):
+    """
+    Tests that amounts a JSON number could not carry exactly are rejected before any
+    database access.
+    """
+    with patch("expense_log_mcp.tools.add_expense.session_scope") as mock_session_scope:
+        result = add_expense(
+            ledger_id="test_ledger",
+            category_id="test_category",
+            message_id="test_message",
+            description="Test expense",
+            amount=amount,
+            payer="test_payer",
+        )
+
+        mock_session_scope.assert_not_called()
+        result_json = json.loads(result)
+        assert not result_json["success"]
+        assert result_json["code"] == "INVALID_ARGUMENT"
+        assert "out of range" in result_json["message"]
+
+
+def test_add_expense_timestamps_are_set_per_row(expenses_db):
+    """
+    Tests that created_at is the database's UTC time of the insert, not a time fixed
+    when the models were imported.
+    """
+    before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=5)
+    add_expense("test-ledger", "category-1", "message-1", "Lunch", 10.5, "payer1")
+    after = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=5)
+
+    with Session(expenses_db) as session:
+        expense = session.scalars(select(Expense)).one()
+    assert before <= expense.createdAt <= after
+    assert expense.updatedAt is not None
+
+
+@pytest.fixture
+def write_pipeline(monkeypatch):
+    """Fixture to batch add_expense calls through a fresh write pipeline."""
+    monkeypatch.setenv("WRITE_PIPELINE_ENABLED", "true")
+    monkeypatch.setenv("WRITE_PIPELINE_MAX_WAIT_MS", "200")
+    monkeypatch.setattr(importlib.import_module(add_expense.__module__), "_pipeline", None)
+    yield
+
+
+def test_add_expense_retry_storm_pipelined(expenses_db, write_pipeline):
+    """
+    Tests that retries of one message batched together still create a single expense.
+    """
+    test_add_expense_retry_storm(expenses_db, retries=4)
+
+
+def test_add_expense_pipelined_batch_keeps_per_item_results(expenses_db, write_pipeline):
+    """
+    Tests that a batch answers each caller with its own ID, duplicate or error, even when
+    one of its rows fails and the batch falls back to one transaction per row.
+    """
+    add_expense("test-ledger", "category-1", "existing", "Lunch", 10.5, "payer1")
+    calls = [("message-%d" % i, "Lunch", 1.25) for i in range(6)]
+    calls += [("existing", "Lunch", 10.5), ("invalid", None, 3.0)]
+    barrier = threading.Barrier(len(calls))
+
+    def call(args):
+        message_id, description, amount = args
+        barrier.wait()
+        return json.loads(
+            add_expense("test-ledger", "category-1", message_id, description, amount, "payer1")
+        )
+
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        results = list(pool.map(call, calls))
+
+    assert [r["code"] for r in results] == ["OK"] * 6 + ["DUPLICATE", "ERROR"]
+    with Session(expenses_db) as session:
+        ids = dict(session.execute(select(Expense.messageId, Expense.id)).all())
+        assert session.scalar(select(func.sum(ExpenseDailyRollup.expenseCount))) == 7
+    assert [r["data"]["expenseId"] for r in results[:7]] == [
+        ids[message_id] for message_id, _, _ in calls[:7]
+    ]
+    assert "invalid" not in ids
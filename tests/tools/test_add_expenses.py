@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from expense_log_mcp.tools.add_expenses import MAX_EXPENSES, add_expenses
+
+EXPENSES = [
+    {
+        "category_id": "test_category",
+        "message_id": f"test_message_{i}",
+        "description": f"Test expense {i}",
+        "amount": 100.0,
+        "payer": "test_payer",
+    }
+    for i in range(3)
+]
+
+
+def test_add_expenses_success():
+    """
+    Tests that expenses are inserted in one statement and reported per item, with the
+    existing expense ID of duplicates.
+    """
+    mock_db = MagicMock()
+    inserted, existing = MagicMock(), MagicMock()
+    inserted.all.return_value = [("id-0", datetime(2025, 9, 7)), ("id-2", datetime(2025, 9, 7))]
+    existing.all.return_value = [("test_message_1", "existing-id-1")]
+    mock_db.execute.side_effect = [inserted, existing]
+
+    with (
+        patch("expense_log_mcp.tools.add_expenses.session_scope") as mock_session_scope,
+        patch("expense_log_mcp.tools.add_expenses.apply_rollup") as mock_apply_rollup,
+        patch("expense_log_mcp.tools.add_expenses.bump_ledger_versions") as mock_bump,
+        patch(
+            "expense_log_mcp.tools.add_expenses.new_id",
+            side_effect=["id-0", "id-1", "id-2"],
+        ),
+    ):
+        mock_session_scope.return_value.__enter__.return_value = mock_db
+
+        result = add_expenses(ledger_id="test_ledger", expenses=EXPENSES)
+
+        assert mock_db.execute.call_count == 2
+        rows = mock_db.execute.call_args_list[0].args[1]
+        assert [row["messageId"] for row in rows] == [
+            "test_message_0",
+            "test_message_1",
+            "test_message_2",
+        ]
+        rolled_up = mock_apply_rollup.call_args.args[1]
+        assert [expense.messageId for expense in rolled_up] == ["test_message_0", "test_message_2"]
+        mock_bump.assert_called_once_with(mock_db, ["test_ledger"])
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+        result_json = json.loads(result)
+        assert result_json["success"]
+        assert result_json["code"] == "OK"
+        assert result_json["data"]["created"] == 2
+        assert result_json["data"]["duplicates"] == 1
+        assert result_json["data"]["expenses"] == [
+            {"messageId": "test_message_0", "expenseId": "id-0", "status": "CREATED"},
+            {"messageId": "test_message_1", "expenseId": "existing-id-1", "status": "DUPLICATE"},
+            {"messageId": "test_message_2", "expenseId": "id-2", "status": "CREATED"},
+        ]
+
+
+def test_add_expenses_too_many():
+    """
+    Tests that batches above the limit are rejected without touching the database.
+    """
+    with patch("expense_log_mcp.tools.add_expenses.session_scope") as mock_session_scope:
+        result = add_expenses(ledger_id="test_ledger", expenses=EXPENSES * (MAX_EXPENSES // 3 + 1))
+
+        mock_session_scope.assert_not_called()
+        result_json = json.loads(result)
+        assert not result_json["success"]
+        assert result_json["code"] == "INVALID_ARGUMENT"
+
+
+def test_add_expenses_rejects_amounts_out_of_range():
+    """
+    Tests that a batch with an amount a JSON number could not carry exactly is rejected
+    as a whole without touching the database.
+    """
+    expenses = EXPENSES + [dict(EXPENSES[0], message_id="huge", amount=1e15)]
+    with patch("expense_log_mcp.tools.add_expenses.session_scope") as mock_session_scope:
+        result = add_expenses(ledger_id="test_ledger", expenses=expenses)
+
+        mock_session_scope.assert_not_called()
+        result_json = json.loads(result)
+        assert not result_json["success"]
+        assert result_json["code"] == "INVALID_ARGUMENT"
+
+
+def test_add_expenses_db_error():
+    """
+    Tests that a database error is handled correctly.
+    """
+    with patch(
+        "expense_log_mcp.tools.add_expenses.session_scope", side_effect=Exception("DB error")
+    ):
+        result = add_expenses(ledger_id="test_ledger", expenses=EXPENSES)
+
+        result_json = json.loads(result)
+        assert not result_json["success"]
+        assert result_json["code"] == "ERROR"
+        assert result_json["message"] == "DB error"
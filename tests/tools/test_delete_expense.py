@@ -2,7 +2,7 @@ import json
 from unittest.mock import MagicMock, patch
 
 from datetime import datetime
-from expense_log_mcp.models import Expense
+from types import SimpleNamespace
 from expense_log_mcp.tools.delete_expense import delete_expense
 
 
@@ -11,20 +11,26 @@ def test_delete_expense_success():
     Tests that an expense is deleted successfully.
     """
     mock_db = MagicMock()
-    mock_expense = Expense(
+    mock_expense = SimpleNamespace(
         id=1,
-        ledgerId="test_ledger",
-        messageId="test_message",
         description="Test expense",
         amount=100.0,
         createdAt=datetime.now(),
     )
-    mock_db.query.return_value.filter_by.return_value.first.return_value = mock_expense
+    mock_db.execute.return_value.first.return_value = mock_expense
 
-    with patch("expense_log_mcp.tools.delete_expense.get_db", return_value=iter([mock_db])):
+    with (
+        patch("expense_log_mcp.tools.delete_expense.session_scope") as mock_session_scope,
+        patch("expense_log_mcp.tools.delete_expense.apply_rollup") as mock_apply_rollup,
+        patch("expense_log_mcp.tools.delete_expense.bump_ledger_versions") as mock_bump,
+    ):
+        mock_session_scope.return_value.__enter__.return_value = mock_db
         result = delete_expense(ledger_id="test_ledger", message_id="test_message")
 
-        mock_db.delete.assert_called_once_with(mock_expense)
+        mock_db.execute.assert_called_once()
+        mock_db.query.assert_not_called()
+        mock_apply_rollup.assert_called_once_with(mock_db, [mock_expense], -1)
+        mock_bump.assert_called_once_with(mock_db, ["test_ledger"])
         mock_db.commit.assert_called_once()
 
         result_json = json.loads(result)
@@ -39,12 +45,18 @@ def test_delete_expense_not_found():
     Tests that the correct message is returned when an expense is not found.
     """
     mock_db = MagicMock()
-    mock_db.query.return_value.filter_by.return_value.first.return_value = None
+    mock_db.execute.return_value.first.return_value = None
 
-    with patch("expense_log_mcp.tools.delete_expense.get_db", return_value=iter([mock_db])):
+    with (
+        patch("expense_log_mcp.tools.delete_expense.session_scope") as mock_session_scope,
+        patch("expense_log_mcp.tools.delete_expense.apply_rollup") as mock_apply_rollup,
+        patch("expense_log_mcp.tools.delete_expense.bump_ledger_versions") as mock_bump,
+    ):
+        mock_session_scope.return_value.__enter__.return_value = mock_db
         result = delete_expense(ledger_id="test_ledger", message_id="test_message")
 
-        mock_db.delete.assert_not_called()
+        mock_apply_rollup.assert_not_called()
+        mock_bump.assert_not_called()
         mock_db.commit.assert_not_called()
 
         result_json = json.loads(result)
@@ -58,7 +70,7 @@ def test_delete_expense_db_error():
     Tests that a database error is handled correctly.
     """
     with patch(
-        "expense_log_mcp.tools.delete_expense.get_db",
+        "expense_log_mcp.tools.delete_expense.session_scope",
         side_effect=Exception("DB error"),
     ):
         result = delete_expense(ledger_id="test_ledger", message_id="test_message")
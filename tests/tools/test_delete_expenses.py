@@ -0,0 +1,87 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from datetime import datetime
+from types import SimpleNamespace
+from expense_log_mcp.tools.delete_expenses import MAX_MESSAGE_IDS, delete_expenses
+
+
+def test_delete_expenses_success():
+    """
+    Tests that expenses are deleted in one statement and missing message IDs are reported.
+    """
+    mock_db = MagicMock()
+    mock_db.execute.return_value.all.return_value = [
+        SimpleNamespace(
+            id="id-1",
+            messageId="test_message_1",
+            description="Test expense",
+            amount=100.0,
+            createdAt=datetime(2025, 9, 7),
+        )
+    ]
+
+    with (
+        patch("expense_log_mcp.tools.delete_expenses.session_scope") as mock_session_scope,
+        patch("expense_log_mcp.tools.delete_expenses.apply_rollup") as mock_apply_rollup,
+        patch("expense_log_mcp.tools.delete_expenses.bump_ledger_versions") as mock_bump,
+    ):
+        mock_session_scope.return_value.__enter__.return_value = mock_db
+        result = delete_expenses(
+            ledger_id="test_ledger", message_ids=["test_message_1", "test_message_2"]
+        )
+
+        mock_db.execute.assert_called_once()
+        mock_apply_rollup.assert_called_once_with(
+            mock_db, mock_db.execute.return_value.all.return_value, -1
+        )
+        mock_bump.assert_called_once_with(mock_db, ["test_ledger"])
+        mock_db.commit.assert_called_once()
+
+        result_json = json.loads(result)
+        assert result_json["success"]
+        assert result_json["code"] == "OK"
+        assert result_json["data"] == {
+            "deleted": [
+                {
+                    "id": "id-1",
+                    "messageId": "test_message_1",
+                    "description": "Test expense",
+                    "amount": 100.0,
+                    "createdAt": "Sun Sep 07 2025",
+                }
+            ],
+            "notFound": ["test_message_2"],
+        }
+
+
+def test_delete_expenses_too_many():
+    """
+    Tests that requests above the limit are rejected without touching the database.
+    """
+    with patch("expense_log_mcp.tools.delete_expenses.session_scope") as mock_session_scope:
+        result = delete_expenses(
+            ledger_id="test_ledger",
+            message_ids=[f"test_message_{i}" for i in range(MAX_MESSAGE_IDS + 1)],
+        )
+
+        mock_session_scope.assert_not_called()
+        result_json = json.loads(result)
+        assert not result_json["success"]
+        assert result_json["code"] == "INVALID_ARGUMENT"
+
+
+def test_delete_expenses_db_error():
+    """
+    Tests that a database error is handled correctly.
+    """
+    with patch(
+        "expense_log_mcp.tools.delete_expenses.session_scope",
+        side_effect=Exception("DB error"),
+    ):
+        result = delete_expenses(ledger_id="test_ledger", message_ids=["test_message"])
+
+        result_json = json.loads(result)
+        assert not result_json["success"]
+        assert result_json["code"] == "ERROR"
+        assert result_json["message"] == "DB error"
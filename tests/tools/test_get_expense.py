@@ -20,10 +20,10 @@ def test_get_expense_success():
         updatedAt=datetime.now(),
     )
 
-    with patch("expense_log_mcp.tools.get_expense.get_db") as mock_get_db:
+    with patch("expense_log_mcp.tools.get_expense.session_scope") as mock_session_scope:
         mock_db = MagicMock()
-        mock_db.query.return_value.filter_by.return_value.first.return_value = mock_expense
-        mock_get_db.return_value = iter([mock_db])
+        mock_db.scalars.return_value.first.return_value = mock_expense
+        mock_session_scope.return_value.__enter__.return_value = mock_db
 
         result = get_expense(ledger_id="test-ledger", message_id="test-message")
         result_json = json.loads(result)
@@ -37,10 +37,10 @@ def test_get_expense_not_found():
     """
     Tests that get_expense returns a NOT_FOUND error when the expense does not exist.
     """
-    with patch("expense_log_mcp.tools.get_expense.get_db") as mock_get_db:
+    with patch("expense_log_mcp.tools.get_expense.session_scope") as mock_session_scope:
         mock_db = MagicMock()
-        mock_db.query.return_value.filter_by.return_value.first.return_value = None
-        mock_get_db.return_value = iter([mock_db])
+        mock_db.scalars.return_value.first.return_value = None
+        mock_session_scope.return_value.__enter__.return_value = mock_db
 
         result = get_expense(ledger_id="test-ledger", message_id="test-message")
         result_json = json.loads(result)
@@ -53,8 +53,8 @@ def test_get_expense_error():
     """
     Tests that get_expense returns an ERROR on exception.
     """
-    with patch("expense_log_mcp.tools.get_expense.get_db") as mock_get_db:
-        mock_get_db.side_effect = Exception("DB error")
+    with patch("expense_log_mcp.tools.get_expense.session_scope") as mock_session_scope:
+        mock_session_scope.side_effect = Exception("DB error")
 
         result = get_expense(ledger_id="test-ledger", message_id="test-message")
         result_json = json.loads(result)
@@ -1,8 +1,35 @@
 import json
+import pytest
+import time
 from unittest.mock import MagicMock, patch
 
+from datetime import datetime
 from expense_log_mcp.models import ExpenseCategory
-from expense_log_mcp.tools.get_expense_categories import get_expense_categories
+from expense_log_mcp.tools.get_expense_categories import (
+    get_expense_categories,
+    invalidate_expense_categories_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Fixture to start every test with an empty categories cache."""
+    invalidate_expense_categories_cache()
+    yield
+    invalidate_expense_categories_cache()
+
+
+@pytest.fixture
+def mock_db_session():
+    """Fixture to mock the database session with two categories."""
+    with patch("expense_log_mcp.tools.get_expense_categories.session_scope") as mock_session_scope:
+        mock_db = MagicMock()
+        mock_db.query.return_value.all.return_value = [
+            ExpenseCategory(id=1, name="Food", updatedAt=datetime(2025, 1, 1)),
+            ExpenseCategory(id=2, name="Transport", updatedAt=datetime(2025, 1, 2)),
+        ]
+        mock_session_scope.return_value.__enter__.return_value = mock_db
+        yield mock_db
 
 
 def test_get_expense_categories_success():
@@ -18,8 +45,8 @@ def test_get_expense_categories_success():
 
     mock_db.query.return_value.all.return_value = mock_categories
 
-    with patch("expense_log_mcp.tools.get_expense_categories.get_db") as mock_get_db:
-        mock_get_db.return_value = iter([mock_db])
+    with patch("expense_log_mcp.tools.get_expense_categories.session_scope") as mock_session_scope:
+        mock_session_scope.return_value.__enter__.return_value = mock_db
 
         result = get_expense_categories()
 
@@ -40,8 +67,8 @@ def test_get_expense_categories_exception():
     Test that get_expense_categories returns a JSON string with an error message
     when an exception occurs.
     """
-    with patch("expense_log_mcp.tools.get_expense_categories.get_db") as mock_get_db:
-        mock_get_db.side_effect = Exception("Something went wrong")
+    with patch("expense_log_mcp.tools.get_expense_categories.session_scope") as mock_session_scope:
+        mock_session_scope.side_effect = Exception("Something went wrong")
 
         result = get_expense_categories()
 
@@ -51,3 +78,84 @@ def test_get_expense_categories_exception():
             "message": "Something went wrong",
         }
         assert json.loads(result) == expected_result
+
+
+def test_get_expense_categories_cached(mock_db_session):
+    """
+    Test that repeated calls within the TTL are served without touching the database.
+    """
+    first = get_expense_categories()
+    second = get_expense_categories()
+
+    assert first == second
+    assert mock_db_session.query.call_count == 1
+
+
+@pytest.mark.parametrize("revalidate", ["true", "1", "yes"])
+def test_get_expense_categories_revalidated(monkeypatch, mock_db_session, revalidate):
+    """
+    Test that an expired entry is kept when max(updated_at) and count are unchanged.
+    """
+    monkeypatch.setenv("EXPENSE_CATEGORIES_CACHE_REVALIDATE", revalidate)
+    first = get_expense_categories()
+    mock_db_session.query.return_value.one.return_value = (datetime(2025, 1, 2), 2)
+    mock_db_session.query.return_value.all.reset_mock()
+
+    with patch("expense_log_mcp.cache.time.monotonic", return_value=time.monotonic() + 3600):
+        second = get_expense_categories()
+
+    assert first == second
+    mock_db_session.query.return_value.one.assert_called_once()
+    mock_db_session.query.return_value.all.assert_not_called()
+
+
+def test_get_expense_categories_not_revalidated(monkeypatch, mock_db_session):
+    """
+    Test that an expired entry is reloaded without checking the table when revalidation
+    is turned off.
+    """
+    monkeypatch.setenv("EXPENSE_CATEGORIES_CACHE_REVALIDATE", "0")
+    get_expense_categories()
+    mock_db_session.query.return_value.all.reset_mock()
+
+    with patch("expense_log_mcp.cache.time.monotonic", return_value=time.monotonic() + 3600):
+        get_expense_categories()
+
+    mock_db_session.query.return_value.one.assert_not_called()
+    mock_db_session.query.return_value.all.assert_called_once()
+
+
+def test_get_expense_categories_reloaded_when_changed(mock_db_session):
+    """
+    Test that an expired entry is reloaded when the categories table changed.
+    """
+    get_expense_categories()
+    mock_db_session.query.return_value.one.return_value = (datetime(2025, 2, 1), 3)
+    mock_db_session.query.return_value.all.return_value = [ExpenseCategory(id=3, name="Rent")]
+
+    with patch("expense_log_mcp.cache.time.monotonic", return_value=time.monotonic() + 3600):
+        result = get_expense_categories()
+
+    assert json.loads(result)["data"] == [{"expenseCategoryId": 3, "expenseCategoryName": "Rent"}]
+
+
+def test_get_expense_categories_cache_disabled(monkeypatch, mock_db_session):
+    """
+    Test that a TTL of zero disables the cache.
+    """
+    monkeypatch.setenv("EXPENSE_CATEGORIES_CACHE_TTL", "0")
+    get_expense_categories()
+    get_expense_categories()
+
+    assert mock_db_session.query.call_count == 2
+
+
+def test_invalidate_expense_categories_cache(mock_db_session):
+    """
+    Test that invalidating the cache forces the next call to query the database.
+    """
+    get_expense_categories()
+    invalidate_expense_categories_cache()
+    get_expense_categories()
+
+    assert mock_db_session.query.call_count == 2
@@ -0,0 +1,102 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from expense_log_mcp.tools.get_expenses import MAX_MESSAGE_IDS, get_expenses
+
+
+def make_row(message_id):
+    return SimpleNamespace(
+        id=f"id-{message_id}",
+        messageId=message_id,
+        description="Test expense",
+        amount=100.0,
+        payer="test_payer",
+        createdAt=datetime(2025, 9, 7),
+        updatedAt=datetime(2025, 9, 7),
+    )
+
+
+def test_get_expenses_success():
+    """
+    Tests that expenses are looked up with one query and returned in the order asked,
+    with the message IDs that matched no expense.
+    """
+    mock_db = MagicMock()
+    mock_db.execute.return_value = [make_row("test_message_3"), make_row("test_message_1")]
+
+    with patch("expense_log_mcp.tools.get_expenses.session_scope") as mock_session_scope:
+        mock_session_scope.return_value.__enter__.return_value = mock_db
+        result = get_expenses(
+            ledger_id="test_ledger",
+            message_ids=["test_message_1", "test_message_2", "test_message_3", "test_message_1"],
+        )
+
+        mock_session_scope.assert_called_once_with(readonly=True, ledger_id="test_ledger")
+        mock_db.execute.assert_called_once()
+        assert mock_db.execute.call_args.args[1] == {
+            "ledger_id": "test_ledger",
+            "message_ids": ["test_message_1", "test_message_2", "test_message_3"],
+        }
+
+        result_json = json.loads(result)
+        assert result_json["success"]
+        assert result_json["code"] == "OK"
+        assert [e["messageId"] for e in result_json["data"]["expenses"]] == [
+            "test_message_1",
+            "test_message_3",
+        ]
+        assert result_json["data"]["expenses"][0] == {
+            "id": "id-test_message_1",
+            "messageId": "test_message_1",
+            "description": "Test expense",
+            "amount": 100.0,
+            "payer": "test_payer",
+            "createdAt": "2025-09-07T00:00:00",
+            "updatedAt": "2025-09-07T00:00:00",
+        }
+        assert result_json["data"]["notFound"] == ["test_message_2"]
+
+
+def test_get_expenses_empty():
+    """
+    Tests that an empty list of message IDs returns no expenses without a query.
+    """
+    with patch("expense_log_mcp.tools.get_expenses.session_scope") as mock_session_scope:
+        result = get_expenses(ledger_id="test_ledger", message_ids=[])
+
+        mock_session_scope.assert_not_called()
+        result_json = json.loads(result)
+        assert result_json["data"] == {"expenses": [], "notFound": []}
+
+
+def test_get_expenses_too_many():
+    """
+    Tests that requests above the limit are rejected without touching the database.
+    """
+    with patch("expense_log_mcp.tools.get_expenses.session_scope") as mock_session_scope:
+        result = get_expenses(
+            ledger_id="test_ledger",
+            message_ids=[f"test_message_{i}" for i in range(MAX_MESSAGE_IDS + 1)],
+        )
+
+        mock_session_scope.assert_not_called()
+        result_json = json.loads(result)
+        assert not result_json["success"]
+        assert result_json["code"] == "INVALID_ARGUMENT"
+
+
+def test_get_expenses_db_error():
+    """
+    Tests that a database error is handled correctly.
+    """
+    with patch(
+        "expense_log_mcp.tools.get_expenses.session_scope",
+        side_effect=Exception("DB error"),
+    ):
+        result = get_expenses(ledger_id="test_ledger", message_ids=["test_message"])
+
+        result_json = json.loads(result)
+        assert not result_json["success"]
+        assert result_json["code"] == "ERROR"
+        assert result_json["message"] == "DB error"
@@ -1,70 +1,42 @@
+import importlib
 import json
 import pytest
+from datetime import date
 from unittest.mock import MagicMock, patch
-from datetime import datetime, timezone
-from expense_log_mcp.models import Expense, ExpenseCategory
 from expense_log_mcp.tools.get_grouped_expenses import get_grouped_expenses
 
 
-mock_category1 = ExpenseCategory(id=1, name="Category 1")
-mock_category2 = ExpenseCategory(id=2, name="Category 2")
-MOCK_EXPENSES = [
-    Expense(
-        id=1,
-        ledgerId="test-ledger",
-        description="E1",
-        amount=100.0,
-        payer="payer1",
-        categoryId=1,
-        category=mock_category1,
-        createdAt=datetime(2025, 1, 10, tzinfo=timezone.utc),
-        updatedAt=datetime(2025, 1, 10, tzinfo=timezone.utc),
-    ),
-    Expense(
-        id=2,
-        ledgerId="test-ledger",
-        description="E2",
-        amount=200.0,
-        payer="payer2",
-        categoryId=2,
-        category=mock_category2,
-        createdAt=datetime(2025, 1, 11, tzinfo=timezone.utc),
-        updatedAt=datetime(2025, 1, 11, tzinfo=timezone.utc),
-    ),
-    Expense(
-        id=3,
-        ledgerId="test-ledger",
-        description="E3",
-        amount=50.0,
-        payer="payer1",
-        categoryId=2,
-        category=mock_category2,
-        createdAt=datetime(2025, 1, 12, tzinfo=timezone.utc),
-        updatedAt=datetime(2025, 1, 12, tzinfo=timezone.utc),
-    ),
+MOCK_ROWS = [
+    ("payer1", "Category 1", 100.0, 1),
+    ("payer1", "Category 2", 50.0, 1),
+    ("payer2", "Category 2", 200.0, 1),
 ]
 
 
 @pytest.fixture
 def mock_db_session():
     """Fixture to mock the database session."""
-    with patch("expense_log_mcp.tools.get_grouped_expenses.get_db") as mock_get_db:
+    with patch("expense_log_mcp.tools.get_grouped_expenses.session_scope") as mock_session_scope:
         mock_db = MagicMock()
-        mock_query = MagicMock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_get_db.return_value = iter([mock_db])
+        # Without a ledger version the result cache is bypassed.
+        mock_db.scalar.return_value = None
+        mock_session_scope.return_value.__enter__.return_value = mock_db
         yield mock_db
 
 
+@pytest.fixture
+def result_cache(monkeypatch):
+    """Fixture to start each test with an empty result cache."""
+    module = importlib.import_module(get_grouped_expenses.__module__)
+    monkeypatch.setattr(module, "_cache", None)
+    return module.get_grouped_expenses_cache
+
+
 def test_get_grouped_expenses_success(mock_db_session):
     """
     Tests that get_grouped_expenses returns grouped expenses successfully.
     """
-    mock_db_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = (  # noqa: E501
-        MOCK_EXPENSES
-    )
+    mock_db_session.execute.return_value.all.return_value = MOCK_ROWS
 
     result = get_grouped_expenses(ledger_id="test-ledger")
     result_json = json.loads(result)
@@ -84,8 +56,8 @@ def test_get_grouped_expenses_error():
     """
     Tests that get_grouped_expenses returns an ERROR on exception.
     """
-    with patch("expense_log_mcp.tools.get_grouped_expenses.get_db") as mock_get_db:
-        mock_get_db.side_effect = Exception("DB error")
+    with patch("expense_log_mcp.tools.get_grouped_expenses.session_scope") as mock_session_scope:
+        mock_session_scope.side_effect = Exception("DB error")
 
         result = get_grouped_expenses(ledger_id="test-ledger")
         result_json = json.loads(result)
@@ -96,11 +68,11 @@ def test_get_grouped_expenses_error():
 
 
 @pytest.mark.parametrize(
-    "filter_kwargs, mock_return_expenses, expected_data",
+    "filter_kwargs, mock_return_rows, expected_data",
     [
         (
             {"category_ids": ["1"]},
-            [MOCK_EXPENSES[0]],
+            [MOCK_ROWS[0]],
             {
                 "payer1": {
                     "expense_categories": {"Category 1": 100.0},
@@ -110,7 +82,7 @@ def test_get_grouped_expenses_error():
         ),
         (
             {"payer_name": "payer1"},
-            [MOCK_EXPENSES[0], MOCK_EXPENSES[2]],
+            [MOCK_ROWS[0], MOCK_ROWS[1]],
             {
                 "payer1": {
                     "expense_categories": {"Category 1": 100.0, "Category 2": 50.0},
@@ -120,7 +92,7 @@ def test_get_grouped_expenses_error():
         ),
         (
             {"start_date": "2025-01-11"},
-            [MOCK_EXPENSES[1], MOCK_EXPENSES[2]],
+            [MOCK_ROWS[1], MOCK_ROWS[2]],
             {
                 "payer1": {
                     "expense_categories": {"Category 2": 50.0},
@@ -134,7 +106,7 @@ def test_get_grouped_expenses_error():
         ),
         (
             {"end_date": "2025-01-11"},
-            [MOCK_EXPENSES[0], MOCK_EXPENSES[1]],
+            [MOCK_ROWS[0], MOCK_ROWS[2]],
             {
                 "payer1": {
                     "expense_categories": {"Category 1": 100.0},
@@ -149,17 +121,175 @@ def test_get_grouped_expenses_error():
     ],
 )
 def test_get_grouped_expenses_with_filters(
-    mock_db_session, filter_kwargs, mock_return_expenses, expected_data
+    mock_db_session, filter_kwargs, mock_return_rows, expected_data
 ):
     """
     Tests that get_grouped_expenses filters correctly based on provided arguments.
     """
-    mock_db_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = (  # noqa: E501
-        mock_return_expenses
-    )
+    mock_db_session.execute.return_value.all.return_value = mock_return_rows
 
     result = get_grouped_expenses(ledger_id="test-ledger", **filter_kwargs)
     result_json = json.loads(result)
 
     assert result_json["success"] is True
     assert result_json["data"] == expected_data
+
+
+def test_get_grouped_expenses_aggregates_in_sql(mock_db_session):
+    """
+    Tests that get_grouped_expenses groups in a single statement instead of loading expenses.
+    """
+    mock_db_session.execute.return_value.all.return_value = MOCK_ROWS
+
+    get_grouped_expenses(ledger_id="test-ledger")
+
+    mock_db_session.execute.assert_called_once()
+    mock_db_session.query.assert_not_called()
+
+
+def test_get_grouped_expenses_skips_emptied_groups(mock_db_session):
+    """
+    Tests that categories whose rolled-up expenses were all deleted are left out.
+    """
+    mock_db_session.execute.return_value.all.return_value = [
+        ("payer1", "Category 1", 100.0, 1),
+        ("payer1", "Category 2", 0.0, 0),
+    ]
+
+    result_json = json.loads(get_grouped_expenses(ledger_id="test-ledger"))
+
+    assert result_json["data"] == {
+        "payer1": {"expense_categories": {"Category 1": 100.0}, "total_amount": 100.0}
+    }
+
+
+def test_get_grouped_expenses_reuses_cached_statement(mock_db_session):
+    """
+    Tests that calls with the same filter shape run the same statement with new parameters.
+    """
+    mock_db_session.execute.return_value.all.return_value = []
+
+    get_grouped_expenses(ledger_id="ledger-1", category_ids=["1"], start_date="2025-01-01")
+    get_grouped_expenses(ledger_id="ledger-2", category_ids=["1", "2"], start_date="2025-02-01")
+
+    first, second = mock_db_session.execute.call_args_list
+    assert first.args[0] is second.args[0]
+    assert second.args[1]["ledger_id"] == "ledger-2"
+    assert second.args[1]["category_ids"] == ["1", "2"]
+
+
+def test_get_grouped_expenses_bucketed_series(mock_db_session):
+    """
+    Tests that bucketed rows are returned as a series of groups, one entry per bucket.
+    """
+    mock_db_session.execute.return_value.all.return_value = [
+        (date(2025, 1, 1), "payer1", "Category 1", 100.0, 1),
+        (date(2025, 1, 1), "payer2", "Category 2", 200.0, 2),
+        (date(2025, 2, 1), "payer1", "Category 2", 50.0, 1),
+    ]
+
+    result_json = json.loads(get_grouped_expenses(ledger_id="test-ledger", bucket="month"))
+
+    assert result_json["data"] == {
+        "bucket": "month",
+        "series": [
+            {
+                "start": "2025-01-01",
+                "groups": {
+                    "payer1": {"expense_categories": {"Category 1": 100.0}, "total_amount": 100.0},
+                    "payer2": {"expense_categories": {"Category 2": 200.0}, "total_amount": 200.0},
+                },
+            },
+            {
+                "start": "2025-02-01",
+                "groups": {
+                    "payer1": {"expense_categories": {"Category 2": 50.0}, "total_amount": 50.0}
+                },
+            },
+        ],
+    }
+
+
+def test_get_grouped_expenses_rejects_unknown_bucket(mock_db_session):
+    """
+    Tests that an unknown bucket is rejected without querying the database.
+    """
+    result_json = json.loads(get_grouped_expenses(ledger_id="test-ledger", bucket="year"))
+
+    assert result_json["code"] == "INVALID_ARGUMENT"
+    mock_db_session.execute.assert_not_called()
+
+
+def test_get_grouped_expenses_caches_by_ledger_version(mock_db_session, result_cache):
+    """
+    Tests that a repeated call at the same ledger version is answered from the cache,
+    and that a new version runs the aggregation again.
+    """
+    mock_db_session.scalar.return_value = 1
+    mock_db_session.execute.return_value.all.return_value = MOCK_ROWS
+
+    first = get_grouped_expenses(ledger_id="test-ledger", category_ids=["1", "2"])
+    second = get_grouped_expenses(ledger_id="test-ledger", category_ids=["2", "1", "2"])
+    assert second == first
+    mock_db_session.execute.assert_called_once()
+
+    mock_db_session.scalar.return_value = 2
+    get_grouped_expenses(ledger_id="test-ledger", category_ids=["1", "2"])
+    assert mock_db_session.execute.call_count == 2
+    assert result_cache().stats() == {"size": 2, "hits": 1, "misses": 2, "evictions": 0}
+
+
+def test_get_grouped_expenses_cache_key_normalizes_dates(mock_db_session, result_cache):
+    """
+    Tests that the same UTC range given in another timezone hits the cached result,
+    unless the groups are bucketed by the caller's local days.
+    """
+    mock_db_session.scalar.return_value = 1
+    mock_db_session.execute.return_value.all.return_value = []
+
+    get_grouped_expenses(ledger_id="test-ledger", start_date="2025-01-01T08:00:00")
+    get_grouped_expenses(
+        ledger_id="test-ledger", start_date="2025-01-01T00:00:00", timezone_offset_hours=0
+    )
+    mock_db_session.execute.assert_called_once()
+
+    get_grouped_expenses(ledger_id="test-ledger", start_date="2025-01-01T08:00:00", bucket="day")
+    get_grouped_expenses(
+        ledger_id="test-ledger",
+        start_date="2025-01-01T00:00:00",
+        timezone_offset_hours=0,
+        bucket="day",
+    )
+    assert mock_db_session.execute.call_count == 3
+
+
+def test_get_grouped_expenses_cache_evicts_least_recently_used(
+    monkeypatch, mock_db_session, result_cache
+):
+    """
+    Tests that the cache is bounded by `GROUPED_EXPENSES_CACHE_SIZE` and counts evictions.
+    """
+    monkeypatch.setenv("GROUPED_EXPENSES_CACHE_SIZE", "2")
+    mock_db_session.scalar.return_value = 1
+    mock_db_session.execute.return_value.all.return_value = []
+
+    for payer_name in ("payer1", "payer2", "payer3", "payer1"):
+        get_grouped_expenses(ledger_id="test-ledger", payer_name=payer_name)
+
+    assert mock_db_session.execute.call_count == 4
+    assert result_cache().stats() == {"size": 2, "hits": 0, "misses": 4, "evictions": 2}
+
+
+def test_get_grouped_expenses_cache_disabled(monkeypatch, mock_db_session, result_cache):
+    """
+    Tests that a cache size of 0 skips the version lookup and the cache entirely.
+    """
+    monkeypatch.setenv("GROUPED_EXPENSES_CACHE_SIZE", "0")
+    mock_db_session.execute.return_value.all.return_value = []
+
+    get_grouped_expenses(ledger_id="test-ledger")
+    get_grouped_expenses(ledger_id="test-ledger")
+
+    mock_db_session.scalar.assert_not_called()
+    assert mock_db_session.execute.call_count == 2
+    assert result_cache() is None
@@ -0,0 +1,170 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from expense_log_mcp.models import Expense
+from expense_log_mcp.tools.list_expenses import decode_cursor, encode_cursor, list_expenses
+
+
+def make_row(i):
+    return SimpleNamespace(
+        id=f"expense-{i}",
+        messageId=f"message-{i}",
+        categoryId="category-1",
+        name="Food",
+        description="Lunch",
+        amount=10.5,
+        payer="payer1",
+        createdAt=datetime(2025, 1, 1) + timedelta(hours=i),
+    )
+
+
+@pytest.fixture
+def mock_db_session():
+    """Fixture to mock the database session."""
+    with patch("expense_log_mcp.tools.list_expenses.session_scope") as mock_session_scope:
+        mock_db = MagicMock()
+        mock_session_scope.return_value.__enter__.return_value = mock_db
+        yield mock_db
+
+
+@pytest.fixture
+def sqlite_db(sqlite_db):
+    """Fixture to add expenses sharing some timestamps to a SQLite database."""
+    with Session(sqlite_db) as session, session.begin():
+        session.execute(
+            insert(Expense),
+            [
+                {
+                    "id": f"expense-{i:02d}",
+                    "ledgerId": "test-ledger",
+                    "categoryId": "category-1",
+                    "messageId": f"message-{i}",
+                    "description": "Lunch",
+                    "amount": 10.5,
+                    "payer": f"payer{i % 2}",
+                    "createdAt": datetime(2025, 1, 1) + timedelta(hours=i // 3),
+                }
+                for i in range(25)
+            ],
+        )
+    return sqlite_db
+
+
+def test_list_expenses_last_page(mock_db_session):
+    """
+    Tests that list_expenses returns the rows of the last page without a next cursor.
+    """
+    mock_db_session.execute.return_value = [make_row(0), make_row(1)]
+
+    result_json = json.loads(list_expenses(ledger_id="test-ledger", page_size=2))
+
+    assert result_json["success"] is True
+    assert result_json["code"] == "OK"
+    assert result_json["data"]["nextCursor"] is None
+    assert result_json["data"]["expenses"][0] == {
+        "id": "expense-0",
+        "messageId": "message-0",
+        "categoryId": "category-1",
+        "categoryName": "Food",
+        "description": "Lunch",
+        "amount": 10.5,
+        "payer": "payer1",
+        "createdAt": "2025-01-01T00:00:00",
+    }
+
+
+def test_list_expenses_next_cursor(mock_db_session):
+    """
+    Tests that list_expenses returns a cursor for the last row of a full page.
+    """
+    mock_db_session.execute.return_value = [make_row(0), make_row(1), make_row(2)]
+
+    result_json = json.loads(list_expenses(ledger_id="test-ledger", page_size=2))
+
+    assert [e["id"] for e in result_json["data"]["expenses"]] == ["expense-0", "expense-1"]
+    assert decode_cursor(result_json["data"]["nextCursor"]) == (
+        datetime(2025, 1, 1, 1),
+        "expense-1",
+    )
+
+
+@pytest.mark.parametrize("page_size", [0, 501])
+def test_list_expenses_page_size_out_of_range(mock_db_session, page_size):
+    """
+    Tests that list_expenses rejects page sizes outside of the allowed range.
+    """
+    result_json = json.loads(list_expenses(ledger_id="test-ledger", page_size=page_size))
+
+    assert result_json["success"] is False
+    assert result_json["code"] == "INVALID_ARGUMENT"
+    mock_db_session.execute.assert_not_called()
+
+
+def test_list_expenses_invalid_cursor(mock_db_session):
+    """
+    Tests that list_expenses rejects a malformed cursor.
+    """
+    result_json = json.loads(list_expenses(ledger_id="test-ledger", cursor="not-a-cursor"))
+
+    assert result_json["success"] is False
+    assert result_json["code"] == "INVALID_ARGUMENT"
+    assert result_json["message"] == "Invalid cursor."
+
+
+def test_list_expenses_error():
+    """
+    Tests that list_expenses returns an ERROR on exception.
+    """
+    with patch("expense_log_mcp.tools.list_expenses.session_scope") as mock_session_scope:
+        mock_session_scope.side_effect = Exception("DB error")
+
+        result_json = json.loads(list_expenses(ledger_id="test-ledger"))
+
+        assert result_json["success"] is False
+        assert result_json["code"] == "ERROR"
+        assert "DB error" in result_json["message"]
+
+
+@pytest.mark.parametrize(
+    "filter_kwargs, expected_count",
+    [
+        ({}, 25),
+        ({"payer_name": "payer0"}, 13),
+        ({"start_date": "2025-01-01T10:00:00", "timezone_offset_hours": 8}, 19),
+    ],
+)
+def test_list_expenses_pages_through_ledger(sqlite_db, filter_kwargs, expected_count):
+    """
+    Tests that following the cursors visits every matching expense once, in order,
+    including expenses sharing a timestamp across a page boundary.
+    """
+    seen, cursor = [], None
+    while True:
+        result_json = json.loads(
+            list_expenses(ledger_id="test-ledger", page_size=4, cursor=cursor, **filter_kwargs)
+        )
+        assert result_json["success"] is True, result_json
+        seen += result_json["data"]["expenses"]
+        cursor = result_json["data"]["nextCursor"]
+        if cursor is None:
+            break
+
+    keys = [(e["createdAt"], e["id"]) for e in seen]
+    assert len(keys) == expected_count
+    assert keys == sorted(set(keys))
+    if "payer_name" in filter_kwargs:
+        assert {e["payer"] for e in seen} == {"payer0"}
+
+
+def test_encode_cursor_round_trip():
+    """
+    Tests that a cursor decodes to the key it was encoded from.
+    """
+    key = (datetime(2025, 1, 1, 12, 30), "expense-1")
+
+    assert decode_cursor(encode_cursor(*key)) == key